@@ -1,5 +1,6 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
+from pydantic import BaseModel
 from typing import List, Dict
 import asyncio
 
@@ -34,15 +35,13 @@ async def websocket_endpoint(websocket: WebSocket):
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
-# Simulate real-time risk updates
-@app.on_event("startup")
-async def simulate_risk_updates():
-    while True:
-        # Simulated risk update message
-        risk_update = {
-            "area_id": "A1",
-            "risk_level": "High",
-            "timestamp": "2024-11-24T12:00:00Z"
-        }
-        await manager.broadcast(risk_update)
-        await asyncio.sleep(15)  # Frequency of updates
+class RiskUpdate(BaseModel):
+    area_id: str
+    risk_level: str
+    timestamp: str
+
+# Risk updates are pushed by the producer as they happen and broadcast at once
+@app.post("/risk-updates", status_code=202)
+async def publish_risk_update(update: RiskUpdate):
+    await manager.broadcast(update.model_dump())
+    return {"status": "accepted", "clients": len(manager.active_connections)}
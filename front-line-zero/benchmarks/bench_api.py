@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+import asyncio
+import time
+import numpy as np
+from src.core.config import FLZConfig
+from src.core.risk_analyzer import RiskAssessment
+from .bench_risk import synthetic_areas
+from .harness import Metric, latency_metrics
+
+API_HEADERS = {"X-API-Key": "YOUR_API_KEY"}
+
+def seed_state(components, areas: int, missions: int):
+    """Fill the API's components with enough areas, drones and missions to page through"""
+    risk_analyzer = components.risk_analyzer
+    risk_analyzer.area_manager.add_areas(synthetic_areas(areas))
+    risk_analyzer.analyze_areas()
+    table = risk_analyzer.get_risk_table(risk_analyzer.area_manager.keys[:missions])
+    for key, latitude, longitude in zip(table["area"], table["latitude"], table["longitude"]):
+        components.eagle_nests.create_mission(RiskAssessment(
+            area_name=key, total_risk_level=0.9, risk_factors=[], timestamp=datetime.now(),
+            alert_level="CRITICAL", requires_drone_inspection=True,
+            coordinates=(latitude, longitude)
+        ), assign_drone=False)
+
+async def generate_load(app, requests: List[Tuple[str, str, Dict[str, str]]],
+                        concurrency: int) -> Tuple[Dict[str, List[float]], float]:
+    """
+    Issue (name, path, headers) requests from `concurrency` concurrent clients
+    against the ASGI app in-process. Returns latencies by name and wall time.
+    """
+    import httpx  # FastAPI's test client dependency
+
+    latencies: Dict[str, List[float]] = {}
+    pending = iter(requests)
+    transport = httpx.ASGITransport(app=app)
+
+    async def client():
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for name, path, headers in pending:
+                started = time.perf_counter()
+                response = await http.get(path, headers={**API_HEADERS, **headers})
+                latencies.setdefault(name, []).append(time.perf_counter() - started)
+                if response.status_code not in (200, 304):
+                    raise RuntimeError(f"{path} returned {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+def run(quick: bool = False) -> List[Metric]:
+    """REST endpoint latency and throughput under concurrent in-process load"""
+    # Benchmarks must not touch the on-disk store
+    FLZConfig.PERSISTENCE_ENABLED = False
+    from src.api import routes
+
+    areas = 200 if quick else 2000
+    # The ASGI transport does not run startup events, so warm up here
+    routes.components.warm_up()
+    seed_state(routes.components, areas=areas, missions=50 if quick else 500)
+    keys = routes.components.risk_analyzer.area_manager.keys
+    rng = np.random.default_rng(0)
+
+    drones_etag = routes.response_cache.etag(routes.components.eagle_nests.state_version)
+    mix = [
+        ("areas", "/areas", {}),
+        ("bulk_risk", "/areas/risk?limit=500&format=columnar", {}),
+        ("missions", "/missions/active?limit=100", {}),
+        ("drones", "/drones?status=idle", {}),
+        ("drones_not_modified", "/drones?status=idle", {"If-None-Match": drones_etag})
+    ]
+    total = 500 if quick else 3000
+    requests = []
+    for index in range(total):
+        if index % 2:
+            requests.append(("area_risk", f"/areas/{keys[rng.integers(len(keys))]}/risk", {}))
+        else:
+            requests.append(mix[(index // 2) % len(mix)])
+
+    latencies, wall_seconds = asyncio.run(generate_load(routes.app, requests, concurrency=16))
+    metrics = [Metric(f"api.{areas}.throughput", total / wall_seconds, "req/s", higher_is_better=True)]
+    for name in sorted(latencies):
+        metrics += latency_metrics(f"api.{areas}.{name}", latencies[name])
+    routes.components.close()
+    return metrics
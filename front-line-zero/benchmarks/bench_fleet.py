@@ -0,0 +1,33 @@
+from typing import Dict, List
+from src.flz_drones.simulator import FleetSimulator, SimulationConfig
+from .harness import Metric
+
+def run(quick: bool = False, repeat: int = 3) -> List[Metric]:
+    """
+    Dispatch, telemetry and fleet status through the discrete-event simulator.
+    The simulation is deterministic, so the best of `repeat` runs is reported
+    to filter out interference from other processes.
+    """
+    config = SimulationConfig(
+        nests=20 if quick else 100,
+        drones_per_nest=10 if quick else 50,
+        areas=200 if quick else 2000,
+        duration=1800 if quick else 3600,
+        telemetry_interval=10 if quick else 30
+    )
+    best: Dict[str, Metric] = {}
+    for _ in range(repeat):
+        report = FleetSimulator(config).run()
+        prefix = f"fleet.{report.drones}"
+        metrics = [Metric(f"{prefix}.events_per_second", report.events_per_second, "events/s",
+                          higher_is_better=True)]
+        for name in ("dispatch", "planning", "telemetry", "fleet_status"):
+            stats = getattr(report, name)
+            if stats.count:
+                metrics.append(Metric(f"{prefix}.{name}.p50", stats.p50_ms, "ms"))
+                metrics.append(Metric(f"{prefix}.{name}.p95", stats.p95_ms, "ms", gated=False))
+        for metric in metrics:
+            previous = best.get(metric.name)
+            if previous is None or (metric.value > previous.value) == metric.higher_is_better:
+                best[metric.name] = metric
+    return list(best.values())
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import asyncio
+import time
+import numpy as np
+from src.core.config import FLZConfig
+from src.core.risk_pipeline import RiskPipeline
+from .bench_risk import analyzer_with_areas
+from .harness import Metric, latency_metrics
+
+async def input_stream(pipeline: RiskPipeline, keys: List[str], inputs: int,
+                       rate: float, burst: int, seed: int = 0) -> Dict[str, List[float]]:
+    """
+    Submit `inputs` products at about `rate` per second, in bursts of up to
+    `burst` products for the same few areas, like a tile landing. Returns
+    arrival times per area, in submission order.
+    """
+    rng = np.random.default_rng(seed)
+    arrivals: Dict[str, List[float]] = {}
+    submitted = 0
+    while submitted < inputs:
+        size = int(min(rng.integers(1, burst + 1), inputs - submitted))
+        for area_key in rng.choice(keys, size=size).tolist():
+            arrived = time.time()
+            pipeline.submit(area_key, {
+                "surface_temp_max": float(rng.uniform(25, 50)),
+                "surface_temp_mean": float(rng.uniform(20, 40)),
+                "ndvi_mean": float(rng.uniform(0.05, 0.8))
+            }, arrived=arrived)
+            arrivals.setdefault(area_key, []).append(arrived)
+        submitted += size
+        await asyncio.sleep(float(rng.exponential(size / rate)))
+    return arrivals
+
+async def measure(areas: int, inputs: int, rate: float, burst: int):
+    analyzer = analyzer_with_areas(areas)
+    executor = ThreadPoolExecutor(max_workers=1)
+    published: List[tuple] = []
+
+    async def publish(batch):
+        published.append((time.time(), list(batch.area_keys)))
+
+    pipeline = RiskPipeline(lambda: analyzer, executor, publish)
+    runner = asyncio.create_task(pipeline.run())
+    arrivals = await input_stream(pipeline, analyzer.area_manager.keys, inputs, rate, burst)
+    # Let the last batch come due and publish
+    await asyncio.sleep(pipeline.queue.max_delay + 0.5)
+    runner.cancel()
+    executor.shutdown()
+    analyzer.close()
+
+    # Each input's latency is until the first publication of its area after it arrived
+    published_at: Dict[str, List[float]] = {}
+    for at, area_keys in published:
+        for area_key in area_keys:
+            published_at.setdefault(area_key, []).append(at)
+    latencies = []
+    for area_key, area_arrivals in arrivals.items():
+        times = published_at.get(area_key, [])
+        for arrived in area_arrivals:
+            later = [at for at in times if at >= arrived]
+            latencies.append(later[0] - arrived if later else float("inf"))
+    rescored = sum(len(area_keys) for _, area_keys in published)
+    return latencies, rescored, len(published)
+
+def run(quick: bool = False) -> List[Metric]:
+    """Input-to-publication latency of the push-based risk pipeline under bursty input"""
+    areas = 200 if quick else 2000
+    inputs = 400 if quick else 3000
+    latencies, rescored, batches = asyncio.run(measure(areas, inputs, rate=400, burst=20))
+    # Bounded: batches start at most RISK_MAX_DELAY_SECONDS after their oldest input
+    budget = (FLZConfig.RISK_MAX_DELAY_SECONDS + 0.5) * 1000
+    metrics = latency_metrics(f"pipeline.latency.{areas}", latencies)
+    for metric in metrics:
+        metric.cpu_bound = False  # Mostly the debounce and max-delay timers
+    metrics[-1].budget = budget
+    metrics.append(Metric(f"pipeline.rescored_per_input.{areas}", rescored / inputs, "ratio", gated=False))
+    metrics.append(Metric(f"pipeline.batches.{areas}", batches, "batches", gated=False))
+    return metrics
@@ -0,0 +1,57 @@
+from typing import Dict, List
+import numpy as np
+from src.core.config import AreaConfig, FLZConfig
+from src.core.risk_analyzer import RiskAnalyzer
+from .harness import Metric, latency_metrics, time_calls
+
+def synthetic_areas(count: int, seed: int = 0) -> Dict[str, AreaConfig]:
+    """Monitored areas scattered over the Beira Baixa region"""
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(39.8, 40.4, count)
+    longitudes = rng.uniform(-7.9, -7.1, count)
+    return {
+        f"bench_area_{index:05d}": AreaConfig(
+            name=f"Bench Area {index}",
+            latitude=float(latitudes[index]),
+            longitude=float(longitudes[index]),
+            radius_km=FLZConfig.DEFAULT_AREA_RADIUS_KM,
+            risk_threshold=FLZConfig.DEFAULT_AREA_RISK_THRESHOLD
+        )
+        for index in range(count)
+    }
+
+def analyzer_with_areas(count: int) -> RiskAnalyzer:
+    analyzer = RiskAnalyzer(workers=1)
+    analyzer.area_manager.add_areas(synthetic_areas(count))
+    # Load the mock rasters up front so runs measure scoring, not data generation
+    analyzer.analyze_areas()
+    return analyzer
+
+def run(quick: bool = False) -> List[Metric]:
+    """analyze_area, analyze_areas and get_high_risk_areas at increasing area counts"""
+    metrics = []
+    for count in (10, 100) if quick else (10, 100, 1000):
+        analyzer = analyzer_with_areas(count)
+        keys = analyzer.area_manager.keys
+        rng = np.random.default_rng(count)
+
+        picks = iter(rng.choice(keys, size=200).tolist())
+        samples = time_calls(lambda: analyzer.analyze_area(next(picks)), repeat=100, warmup=10)
+        metrics += latency_metrics(f"risk.analyze_area.{count}", samples)
+
+        samples = time_calls(analyzer.analyze_areas, repeat=5 if count >= 1000 else 20)
+        metrics += latency_metrics(f"risk.analyze_areas.{count}", samples)
+
+        # Nothing changed: served from cached assessments
+        samples = time_calls(analyzer.get_high_risk_areas, repeat=50)
+        metrics += latency_metrics(f"risk.high_risk_clean.{count}", samples)
+
+        # Every area has new inputs: the whole registry is re-scored
+        samples = []
+        for _ in range(5 if count >= 1000 else 20):
+            for key in keys:
+                analyzer.update_inputs(key)
+            samples += time_calls(analyzer.get_high_risk_areas, repeat=1, warmup=0)
+        metrics += latency_metrics(f"risk.high_risk_dirty.{count}", samples)
+        analyzer.close()
+    return metrics
@@ -0,0 +1,55 @@
+from pathlib import Path
+from typing import Dict, List
+import json
+import subprocess
+import sys
+import numpy as np
+from src.core.config import FLZConfig
+from .harness import Metric
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Runs in a fresh interpreter; prints phase durations as JSON
+COLD_START = """
+import json, sys, tempfile, time
+started = time.perf_counter()
+from src.core.config import FLZConfig
+config_imported = time.perf_counter()
+FLZConfig.STORE_DIR = __import__("pathlib").Path(tempfile.mkdtemp(prefix="flz-startup-"))
+from src.api import routes
+routes_imported = time.perf_counter()
+if any(routes.components.status()["components"].values()):
+    sys.exit("importing routes built components")
+if "src.core.store" in sys.modules or "src.core.risk_pool" in sys.modules:
+    sys.exit("importing routes loaded the store or the worker pool")
+routes.components.warm_up()
+ready = time.perf_counter()
+routes.components.close()
+print(json.dumps({
+    "import_config": config_imported - started,
+    "import_routes": routes_imported - config_imported,
+    "warmup": ready - routes_imported,
+    "cold_start": ready - started
+}))
+"""
+
+def cold_start() -> Dict[str, float]:
+    """Seconds per startup phase of one fresh API process, with persistence on a scratch store"""
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START], cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Cold start failed: {result.stderr.strip()}")
+    return json.loads(result.stdout)
+
+def run(quick: bool = False) -> List[Metric]:
+    """Import and warm-up time of a fresh API worker, checked against the cold-start budget"""
+    runs = [cold_start() for _ in range(3 if quick else 7)]
+    phases = {name: float(np.median([timings[name] for timings in runs])) * 1000 for name in runs[0]}
+    return [
+        Metric("startup.import_config", phases["import_config"], "ms", gated=False),
+        Metric("startup.import_routes", phases["import_routes"], "ms"),
+        Metric("startup.warmup", phases["warmup"], "ms"),
+        Metric("startup.cold_start", phases["cold_start"], "ms",
+               budget=FLZConfig.COLD_START_BUDGET_SECONDS * 1000)
+    ]
@@ -0,0 +1,81 @@
+from typing import List
+import asyncio
+import json
+import time
+from src.api.state_stream import StateStream
+from src.api.websocket import ConnectionManager, SlowConsumerPolicy
+from .harness import Metric, latency_metrics
+
+class SimulatedClient:
+    """
+    Stand-in for a FastAPI WebSocket that records when each delta arrives.
+    Slow clients take send_delay seconds per message, like a poor link.
+    """
+
+    def __init__(self, send_delay: float = 0.0):
+        self.send_delay = send_delay
+        self.received = 0
+        self.snapshots = 0
+        self.closed = False
+        self.latencies: List[float] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        else:
+            await asyncio.sleep(0)  # Yield like a real socket write
+        message = json.loads(text)
+        self.received += 1
+        if message["type"] == "snapshot":
+            self.snapshots += 1
+        else:
+            self.latencies.append(time.perf_counter() - message["changes"]["drones"]["bench"]["sent"])
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+async def broadcast_rounds(clients: int, slow_fraction: float, rounds: int,
+                           interval: float, slow_delay: float):
+    manager = ConnectionManager(max_queue_size=8, policy=SlowConsumerPolicy.DROP_OLDEST, send_timeout=5.0)
+    stream = StateStream(manager)
+    slow_count = int(clients * slow_fraction)
+    sockets = [SimulatedClient(slow_delay if index < slow_count else 0.0) for index in range(clients)]
+    for websocket in sockets:
+        await manager.connect(websocket)
+        await stream.subscribe(websocket)
+
+    publish_times = []
+    for round_number in range(rounds):
+        stream.update_topic("drones", {"bench": {"round": round_number, "sent": time.perf_counter()}})
+        started = time.perf_counter()
+        await stream.publish()
+        publish_times.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    # Let fast clients drain the last round
+    await asyncio.sleep(interval * 2)
+
+    fast = sockets[slow_count:]
+    slow = sockets[:slow_count]
+    for websocket in sockets:
+        await manager.disconnect(websocket)
+    return publish_times, fast, slow
+
+def run(quick: bool = False) -> List[Metric]:
+    """StateStream delta fan-out latency with N clients, a tenth of them slow"""
+    clients = 100 if quick else 1000
+    rounds = 20 if quick else 50
+    publish_times, fast, _ = asyncio.run(broadcast_rounds(
+        clients, slow_fraction=0.1, rounds=rounds, interval=0.02, slow_delay=0.05
+    ))
+    delivery = [latency for websocket in fast for latency in websocket.latencies]
+    metrics = latency_metrics(f"websocket.publish.{clients}", publish_times)
+    metrics += latency_metrics(f"websocket.delivery.{clients}", delivery)
+    # Slow clients must be dropped or resynced, not hold back everyone else
+    metrics.append(Metric(
+        f"websocket.fast_delivery_ratio.{clients}",
+        len(delivery) / (rounds * len(fast)), "ratio", higher_is_better=True, cpu_bound=False
+    ))
+    return metrics
@@ -0,0 +1,114 @@
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import platform
+import time
+import numpy as np
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.5  # allowed relative slowdown; shared CI machines vary by 30% between runs
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    gated: bool = True  # False for metrics too noisy to fail a check, e.g. tail latencies
+    budget: Optional[float] = None  # absolute limit checked regardless of the baseline
+    cpu_bound: bool = True  # False if machine speed does not affect it, e.g. ratios or timer-bound latencies
+
+def latency_metrics(prefix: str, samples: List[float]) -> List[Metric]:
+    """p50/p95/p99 of latency samples in seconds, as millisecond metrics; only p50 is gated"""
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+    return [
+        Metric(f"{prefix}.p50", float(p50), "ms"),
+        Metric(f"{prefix}.p95", float(p95), "ms", gated=False),
+        Metric(f"{prefix}.p99", float(p99), "ms", gated=False)
+    ]
+
+def time_calls(fn: Callable[[], object], repeat: int, warmup: int = 1) -> List[float]:
+    """Wall-clock seconds of each of `repeat` calls, after `warmup` untimed calls"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def calibrate() -> float:
+    """
+    Seconds for a fixed mix of interpreter and NumPy work. Checks scale the
+    baseline by how much slower or faster this machine is right now.
+    """
+    def workload():
+        values = np.random.default_rng(0).random(200_000)
+        np.sort(values)
+        total = 0
+        for index in range(100_000):
+            total += index % 7
+        return total
+    return float(np.median(time_calls(workload, repeat=7)))
+
+def environment() -> Dict[str, str]:
+    """Where the numbers were taken; baselines only compare on similar machines"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count())
+    }
+
+def load_baseline(path: Path = BASELINE_PATH) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(metrics: List[Metric], calibration: float, path: Path = BASELINE_PATH):
+    """Record metrics as the baseline, keeping recorded metrics that were not re-run"""
+    previous = load_baseline(path) or {"metrics": {}}
+    baseline = {
+        "environment": environment(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "calibration_seconds": calibration,
+        "metrics": {**previous["metrics"], **{metric.name: asdict(metric) for metric in metrics}}
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def find_regressions(metrics: List[Metric], baseline: Dict, calibration: float,
+                     threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Descriptions of metrics over their budget, and of gated metrics worse than
+    the baseline by more than threshold
+    """
+    # Above 1 when this machine is currently slower than when the baseline was recorded
+    speed = calibration / baseline["calibration_seconds"]
+    regressions = []
+    for metric in metrics:
+        if metric.budget is not None and (
+                metric.value < metric.budget if metric.higher_is_better else metric.value > metric.budget):
+            regressions.append(f"{metric.name}: {metric.value:.4g} {metric.unit} exceeds budget "
+                               f"{metric.budget:.4g} {metric.unit}")
+        if not metric.gated:
+            continue
+        reference = baseline["metrics"].get(metric.name)
+        if reference is None or reference["value"] <= 0:
+            continue
+        ratio = metric.value / reference["value"]
+        if metric.higher_is_better:
+            ratio = 1 / ratio if ratio > 0 else float("inf")
+        if metric.cpu_bound:
+            ratio /= speed
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{metric.name}: {metric.value:.4g} {metric.unit} vs baseline "
+                f"{reference['value']:.4g} {metric.unit} ({(ratio - 1) * 100:+.0f}% worse)"
+            )
+    return regressions
@@ -0,0 +1,81 @@
+"""
+Benchmark suite for the risk scoring, REST, WebSocket and fleet hot paths,
+plus the risk update pipeline and API cold start.
+Everything runs locally; nothing listens on a port.
+
+    python -m benchmarks.run                     # run and print
+    python -m benchmarks.run --update-baseline   # record benchmarks/baseline.json
+    python -m benchmarks.run --check             # exit 1 on regressions against the baseline
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import argparse
+import multiprocessing
+import sys
+from . import bench_api, bench_fleet, bench_pipeline, bench_risk, bench_startup, bench_websocket
+from .harness import (
+    BASELINE_PATH, DEFAULT_THRESHOLD, Metric, calibrate, environment,
+    find_regressions, load_baseline, save_baseline
+)
+
+SUITES = {
+    "risk": bench_risk.run,
+    "api": bench_api.run,
+    "websocket": bench_websocket.run,
+    "fleet": bench_fleet.run,
+    "pipeline": bench_pipeline.run,
+    "startup": bench_startup.run
+}
+
+def print_metrics(metrics: List[Metric], baseline=None):
+    reference = baseline["metrics"] if baseline else {}
+    for metric in metrics:
+        line = f"{metric.name:<48} {metric.value:>12.4g} {metric.unit}"
+        if metric.name in reference:
+            line += f"   (baseline {reference[metric.name]['value']:.4g})"
+        print(line)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", action="append", choices=list(SUITES),
+                        help="suite to run (repeatable, default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast smoke run")
+    parser.add_argument("--check", action="store_true", help="fail if a metric regressed past the threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative regression (default %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true", help=f"write results to {BASELINE_PATH.name}")
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    metrics: List[Metric] = []
+    for name in args.suite or list(SUITES):
+        print(f"# {name}", file=sys.stderr)
+        # A fresh interpreter per suite, so no suite pays for another's heap or threads
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            metrics += pool.submit(SUITES[name], quick=args.quick).result()
+
+    # Re-measured afterwards too, so load changes during the run are averaged out
+    calibration = (calibration + calibrate()) / 2
+    baseline = load_baseline()
+    print_metrics(metrics, baseline)
+
+    if args.update_baseline:
+        save_baseline(metrics, calibration)
+        print(f"Baseline written to {BASELINE_PATH}")
+    if args.check:
+        if baseline is None:
+            print("No baseline recorded; run with --update-baseline first")
+            return 1
+        if baseline["environment"] != environment():
+            print(f"Warning: baseline was recorded on {baseline['environment']}", file=sys.stderr)
+        print(f"Machine speed vs baseline: {baseline['calibration_seconds'] / calibration:.2f}x", file=sys.stderr)
+        regressions = find_regressions(metrics, baseline, calibration, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+import threading
+import time
+from ..core.config import FLZConfig
+from ..core.risk_analyzer import RiskAnalyzer
+from ..flz_drones.eagle_nests_network import EagleNestsNetwork
+from ..flz_drones.telemetry import TelemetryIngestor
+
+if TYPE_CHECKING:
+    from ..core.store import StateStore
+
+class Components:
+    """
+    The API's long-lived services, built on first use instead of at import,
+    so importing the app is cheap and free of side effects. The app's startup
+    warms them in the background while the process already answers liveness
+    probes; readiness reports when warm-up has finished.
+    """
+
+    NAMES = ("store", "risk_analyzer", "eagle_nests", "telemetry")
+
+    def __init__(self):
+        self._built: Dict[str, Any] = {}
+        self._lock = threading.RLock()  # Building one component may build another
+        self.warmup_started: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.warmup_error: Optional[str] = None
+
+    @property
+    def store(self) -> Optional["StateStore"]:
+        return self._get("store", self._build_store)
+
+    @property
+    def risk_analyzer(self) -> RiskAnalyzer:
+        return self._get("risk_analyzer", lambda: RiskAnalyzer(store=self.store))
+
+    @property
+    def eagle_nests(self) -> EagleNestsNetwork:
+        return self._get("eagle_nests", lambda: EagleNestsNetwork(store=self.store))
+
+    @property
+    def telemetry(self) -> TelemetryIngestor:
+        return self._get("telemetry", lambda: TelemetryIngestor(self.eagle_nests))
+
+    @property
+    def ready(self) -> bool:
+        return self.warmup_seconds is not None
+
+    def peek(self, name: str) -> Optional[Any]:
+        """A component if it has been built, without building it"""
+        return self._built.get(name)
+
+    def warm_up(self):
+        """Build every component; blocking, so run it off the event loop"""
+        self.warmup_started = time.time()
+        started = time.perf_counter()
+        try:
+            for name in self.NAMES:
+                getattr(self, name)
+        except Exception as e:
+            self.warmup_error = f"{type(e).__name__}: {e}"
+            raise
+        self.warmup_seconds = time.perf_counter() - started
+
+    def status(self) -> Dict:
+        return {
+            "status": "ready" if self.ready else "failed" if self.warmup_error else "warming",
+            "components": {name: name in self._built for name in self.NAMES},
+            "warmup_started": self.warmup_started,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.warmup_error
+        }
+
+    def close(self, snapshot: bool = True):
+        """
+        Stop and flush whatever was built; untouched components stay unbuilt.
+        snapshot=False skips the risk history snapshot, for workers whose
+        history is not the one to keep.
+        """
+        risk_analyzer = self.peek("risk_analyzer")
+        store = self.peek("store")
+        if risk_analyzer is not None:
+            risk_analyzer.close()
+            if store is not None and snapshot:
+                risk_analyzer.snapshot()
+        if store is not None:
+            store.close()
+
+    def _get(self, name: str, build: Callable[[], Any]) -> Any:
+        if name in self._built:
+            return self._built[name]
+        with self._lock:
+            if name not in self._built:
+                self._built[name] = build()
+            return self._built[name]
+
+    @staticmethod
+    def _build_store() -> Optional["StateStore"]:
+        if not FLZConfig.PERSISTENCE_ENABLED:
+            return None
+        # sqlite and the writer thread are only loaded when persistence is on
+        from ..core.store import StateStore
+        return StateStore()
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, Tuple
+import asyncio
+import time
+
+class SingleFlight:
+    """
+    Runs blocking computations in an executor, off the event loop. Concurrent
+    calls with the same key share one in-flight computation, and a finished
+    result is reused for `freshness` seconds before the key is computed again.
+    Expired results are dropped, and at most max_entries are kept.
+    """
+
+    def __init__(self, executor: Executor, freshness: float, max_entries: int):
+        self.executor = executor
+        self.freshness = freshness
+        self.max_entries = max_entries
+        self.computations = 0  # Calls that actually ran fn
+        self.coalesced = 0     # Calls served by an in-flight or fresh result
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # Oldest completion first, so expired results are at the front
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    async def run(self, key: Hashable, fn: Callable, *args) -> Any:
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] <= self.freshness:
+            self.coalesced += 1
+            return cached[1]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            future.add_done_callback(lambda done: self._finish(key, done))
+            self._inflight[key] = future
+            self.computations += 1
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the computation other callers share
+        return await asyncio.shield(future)
+
+    def invalidate(self, key: Hashable):
+        """Drop a cached result so the next call recomputes it"""
+        self._results.pop(key, None)
+
+    def _finish(self, key: Hashable, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        self._results.pop(key, None)
+        now = time.monotonic()
+        # Errors are shared with the waiting callers but never cached
+        if not future.cancelled() and future.exception() is None:
+            self._results[key] = (now, future.result())
+        while self._results:
+            finished, _ = next(iter(self._results.values()))
+            if now - finished <= self.freshness and len(self._results) <= self.max_entries:
+                break
+            self._results.popitem(last=False)
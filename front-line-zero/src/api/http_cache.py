@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+import json
+import secrets
+import numpy as np
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library encoder is used without it
+    orjson = None
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot encode {type(value).__name__} as JSON")
+
+def encode_json(content: Any) -> bytes:
+    """Compact JSON encoding of plain data, NumPy arrays and Pydantic models"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_encode_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        content, separators=(",", ":"), ensure_ascii=False, default=_encode_default
+    ).encode()
+
+@dataclass
+class Payload:
+    """Response content plus headers that belong to it, e.g. a pagination cursor"""
+    content: Any
+    headers: Dict[str, str] = field(default_factory=dict)
+
+class ResponseCache:
+    """
+    Serialized JSON response bodies keyed by (resource, state version), with
+    ETags derived from the version. Versions restart with the process, so
+    ETags also carry a per-process token to stay unique across restarts.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._instance = secrets.token_hex(4)
+        self._bodies: "OrderedDict[Tuple[Hashable, Hashable], Tuple[bytes, Dict[str, str]]]" = OrderedDict()
+
+    def etag(self, version: Hashable) -> str:
+        token = "-".join(str(part) for part in version) if isinstance(version, tuple) else str(version)
+        return f'"{self._instance}-{token}"'
+
+    def respond(self, request: Request, resource: Hashable, version: Hashable,
+                build: Callable[[], Union[Payload, Any]]) -> Response:
+        """
+        304 if the client already has this version of the resource, otherwise
+        the cached body for it, calling build() only on a cache miss. The
+        resource must identify everything that shapes the body, including
+        query parameters.
+        """
+        etag = self.etag(version)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        client_etags = self._client_etags(request)
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers=headers)
+
+        key = (resource, version)
+        cached = self._bodies.get(key)
+        if cached is None:
+            self.misses += 1
+            payload = build()
+            if not isinstance(payload, Payload):
+                payload = Payload(payload)
+            cached = (encode_json(payload.content), payload.headers)
+            self._bodies[key] = cached
+            if len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        else:
+            self.hits += 1
+            self._bodies.move_to_end(key)
+
+        body, payload_headers = cached
+        return Response(content=body, media_type="application/json",
+                        headers={**payload_headers, **headers})
+
+    @staticmethod
+    def _client_etags(request: Request) -> set:
+        header = request.headers.get("if-none-match", "")
+        # Weak validators match too: a GET only needs semantic equality
+        return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
@@ -0,0 +1,37 @@
+from time import perf_counter
+from ..core.metrics import Histogram
+
+class RequestMetricsMiddleware:
+    """
+    Records request latency by method, route template and status code.
+    Plain ASGI rather than @app.middleware("http"), which wraps every
+    request in extra tasks and stream copies.
+    """
+
+    def __init__(self, app, histogram: Histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500  # Reported if the app fails before responding
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; its template keeps
+            # label cardinality bounded (/areas/{area_name}/risk, not each area)
+            route = scope.get("route")
+            self.histogram.labels(
+                scope["method"], route.path if route is not None else "unmatched", str(status)
+            ).observe(perf_counter() - started)
@@ -0,0 +1,42 @@
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+RESPONSE_FORMATS = ("json", "columnar")
+
+def parse_list(value: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated query parameter as a list, None if absent"""
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def after_cursor(sorted_keys: Sequence[str], cursor: Optional[str]) -> Sequence[str]:
+    """
+    Keys strictly after the cursor. Cursors are the last key of the previous
+    page, so pages stay stable while items are added or removed.
+    """
+    if cursor is None:
+        return sorted_keys
+    return sorted_keys[bisect_right(sorted_keys, cursor):]
+
+def take_page(keys: Sequence[str], limit: Optional[int]) -> Tuple[Sequence[str], Optional[str]]:
+    """First `limit` keys and the cursor of the following page"""
+    if limit is None or len(keys) <= limit:
+        return keys, None
+    page = keys[:limit]
+    return page, page[-1]
+
+def page_headers(next_cursor: Optional[str]) -> Dict[str, str]:
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else {}
+
+def to_rows(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Columnar data (one list or array per field) as a list of row objects"""
+    names = list(columns)
+    values = [column.tolist() if hasattr(column, "tolist") else column for column in columns.values()]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+def to_columns(rows: List[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """Rows as columnar data; much smaller on the wire for thousands of items"""
+    return {name: [row[name] for row in rows] for name in fields}
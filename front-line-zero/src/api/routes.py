@@ -1,14 +1,34 @@
-from fastapi import FastAPI, HTTPException, WebSocket, Depends, Security
+from fastapi import FastAPI, HTTPException, WebSocket, Depends, Security, Request, Response, Query
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, List, Optional
+from fastapi.responses import JSONResponse
+from collections import deque
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 from datetime import datetime
+from time import perf_counter
 import asyncio
+import base64
 import json
+import math
+import time
+import numpy as np
 from pydantic import BaseModel, Field
-from .core.config import FLZConfig
-from .core.risk_analyzer import RiskAnalyzer
-from .flz_drones.eagle_nests_network import EagleNestsNetwork, DroneStatus
+from ..core.config import FLZConfig
+from ..core.event_bus import LeaderElection, create_event_bus
+from ..core.metrics import REGISTRY
+from ..core.profiler import SamplingProfiler
+from ..core.risk_pipeline import CoalescingQueue, Pending, RiskPipeline
+from ..core.risk_analyzer import BatchRiskAssessment, ALERT_LEVELS
+from ..flz_drones.eagle_nests_network import DroneStatus, MissionPriority
+from .components import Components
+from .compute import SingleFlight
+from .http_cache import Payload, ResponseCache
+from .instrumentation import RequestMetricsMiddleware
+from .pagination import RESPONSE_FORMATS, after_cursor, page_headers, parse_list, take_page, to_columns, to_rows
+from .websocket import ConnectionManager
+from .state_stream import TOPICS, StateStream, Subscription
 
 # API models
 class AreaRisk(BaseModel):
@@ -35,11 +55,42 @@ class MissionInfo(BaseModel):
     drone_id: Optional[str]
     target_coords: tuple[float, float]
 
+class SatelliteInputs(BaseModel):
+    surface_temp_max: float
+    surface_temp_mean: float
+    ndvi_mean: float
+    product_id: Optional[str] = None  # products delivered again under the same id are ignored
+
+class AreaRiskQuery(BaseModel):
+    areas: Optional[List[str]] = None  # area keys
+    bbox: Optional[tuple[float, float, float, float]] = None  # south, west, north, east
+    alert_levels: Optional[List[str]] = None
+    cursor: Optional[str] = None
+    limit: int = Field(FLZConfig.API_MAX_PAGE_SIZE, ge=1, le=FLZConfig.API_MAX_PAGE_SIZE)
+    format: str = Field("json", pattern=f"^({'|'.join(RESPONSE_FORMATS)})$")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # An unreachable broker fails startup rather than leave this worker's clients without updates
+    await event_bus.start()
+    # Startup returns at once so the server listens (and answers liveness) while warming
+    background_tasks.append(asyncio.create_task(warm_up()))
+    yield
+    # Only the leader scores areas; a follower's snapshot would replace its history
+    was_leader = election.is_leader
+    for task in background_tasks:
+        task.cancel()
+    await election.resign()
+    await event_bus.close()
+    analysis_executor.shutdown(wait=True, cancel_futures=True)
+    components.close(snapshot=was_leader)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Front Line Zero API",
     description="API for Front Line Zero early warning and monitoring system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS setup
@@ -62,62 +113,465 @@ async def get_api_key(api_key_header: str = Security(API_KEY_HEADER)):
         )
     return api_key_header
 
-# Initialize components
-risk_analyzer = RiskAnalyzer()
-eagle_nests = EagleNestsNetwork()
+# Worker settings, e.g. the event bus, come from the environment
+FLZConfig.load_env_variables()
 
-# Active WebSocket connections
-active_connections: List[WebSocket] = []
+# Stateful components are built lazily; startup warms them in the background
+components = Components()
 
-# WebSocket Manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+manager = ConnectionManager()
+state_stream = StateStream(manager)
 
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
+# Workers share state over the event bus: the elected leader computes updates
+# and every worker, the leader included, relays them to its own clients
+event_bus = create_event_bus()
+election = LeaderElection(event_bus)
+STATE_CHANNEL = "state"             # leader -> workers: topic updates
+SYNC_CHANNEL = "state.sync"         # worker -> leader: request for the full state
+COMMAND_CHANNEL = "fleet.commands"  # worker -> leader: drone commands
+INPUT_CHANNEL = "risk.inputs"       # worker -> leader: new satellite products
+TELEMETRY_CHANNEL = "fleet.telemetry"  # worker -> leader: drone telemetry frames
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+# A leader that fails keeps its lease for up to LEADER_LEASE_SECONDS, and its
+# successor takes over at its next renewal. Followers keep the inputs of that
+# window, and the new leader replays them so none are lost in the gap.
+REPLAY_WINDOW = 2 * FLZConfig.LEADER_LEASE_SECONDS
+replay_messages: Deque[Tuple[Callable[[Dict], Awaitable[None]], Dict]] = deque()
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                await self.disconnect(connection)
+# Risk analysis runs in a bounded executor so it never blocks the event loop
+analysis_executor = ThreadPoolExecutor(
+    max_workers=FLZConfig.ANALYSIS_WORKERS, thread_name_prefix="flz-analysis"
+)
+area_risk_flights = SingleFlight(
+    analysis_executor, FLZConfig.RISK_RESULT_FRESHNESS, FLZConfig.RISK_RESULT_CACHE_SIZE
+)
 
-manager = ConnectionManager()
+# Page size and encoding parameters shared by the list endpoints
+LIMIT_QUERY = Query(None, ge=1, le=FLZConfig.API_MAX_PAGE_SIZE)
+FORMAT_QUERY = Query("json", alias="format", pattern=f"^({'|'.join(RESPONSE_FORMATS)})$")
+
+# Responses carry ETags from component state versions; polls of unchanged state get 304
+response_cache = ResponseCache(FLZConfig.RESPONSE_CACHE_SIZE)
+
+def active_mission_counts() -> Dict[tuple, int]:
+    # Scrapes must not build the network before warm-up does
+    eagle_nests = components.peek("eagle_nests")
+    if eagle_nests is None:
+        return {}
+    return {(status,): count for status, count in eagle_nests.missions.status_counts().items()}
+
+# Metrics served at /metrics; callbacks are only evaluated when scraped
+REQUEST_SECONDS = REGISTRY.histogram(
+    "flz_http_request_seconds", "HTTP request latency by route", ["method", "route", "status"]
+)
+REGISTRY.gauge("flz_ws_connections", "Connected WebSocket clients",
+               function=lambda: len(manager.active_connections))
+# Aggregated across clients: a series per connection would grow without bound
+REGISTRY.gauge("flz_ws_queued_messages", "Messages queued for all WebSocket clients",
+               function=lambda: sum(manager.queue_depths()))
+REGISTRY.gauge("flz_ws_client_queue_depth_max", "Most messages queued for any one WebSocket client",
+               function=lambda: max(manager.queue_depths(), default=0))
+REGISTRY.gauge("flz_active_missions", "Active missions by status", ["status"],
+               function=active_mission_counts)
+REGISTRY.gauge("flz_leader", "1 while this worker is the elected leader",
+               function=lambda: float(election.is_leader))
+LEADER_REPLAYS = REGISTRY.counter(
+    "flz_leader_replay_messages_total",
+    "Inputs kept by a follower: replayed by a new leader, or evicted while possibly unapplied",
+    ["outcome"]
+)
+_REPLAYED = LEADER_REPLAYS.labels("replayed")
+_EVICTED = LEADER_REPLAYS.labels("evicted")
+REGISTRY.counter("flz_response_cache_lookups_total", "Response cache lookups", ["result"],
+                 function=lambda: {("hit",): response_cache.hits, ("miss",): response_cache.misses})
+
+# Sampling profiler, switched on and off through /debug/profiler
+profiler = SamplingProfiler(interval=FLZConfig.PROFILER_INTERVAL)
+app.add_middleware(RequestMetricsMiddleware, histogram=REQUEST_SECONDS)
+
+def area_states(batch: BatchRiskAssessment) -> Dict[str, dict]:
+    """Stream entries for a batch of risk assessments, keyed by area"""
+    timestamp = batch.timestamp.isoformat()
+    return {
+        area_key: {
+            "name": name,
+            "risk_level": risk_level,
+            "alert_level": alert_level,
+            "requires_inspection": requires_inspection,
+            "coordinates": coordinates,
+            "timestamp": timestamp
+        }
+        for area_key, name, risk_level, alert_level, requires_inspection, coordinates in zip(
+            batch.area_keys, batch.area_names, batch.total_risk.tolist(),
+            batch.alert_levels, batch.requires_inspection.tolist(), batch.coordinates
+        )
+    }
+
+def recall(drone_id: str):
+    """Send a drone home; KeyError if there is no such drone"""
+    eagle_nests = components.eagle_nests
+    drone = eagle_nests.drones[drone_id]
+    eagle_nests.update_drone_status(
+        drone_id,
+        DroneStatus.RETURNING,
+        drone.battery_level,
+        drone.current_coords
+    )
+
+async def publish_areas(batch: BatchRiskAssessment):
+    """Publish re-assessed areas as soon as they are scored, alert level changes included"""
+    await event_bus.publish(STATE_CHANNEL, {"areas": {"entries": area_states(batch), "replace": False}})
+
+async def publish_fleet(pending: Pending):
+    """Apply queued telemetry and publish drones and missions if the fleet changed"""
+    global published_fleet_version
+    eagle_nests = components.eagle_nests
+    # Drones reporting from a mission bring new observations of its area
+    arrived = min(arrived for arrived, _ in pending.values())
+    for drone_id in components.telemetry.flush():
+        mission = eagle_nests.missions.active.get(eagle_nests.drones[drone_id].current_mission_id)
+        if mission is not None:
+            risk_pipeline.submit(mission.area_key, arrived=arrived)
+    if eagle_nests.state_version == published_fleet_version:
+        return
+    published_fleet_version = eagle_nests.state_version
+    fleet_status = eagle_nests.get_fleet_status()
+    await event_bus.publish(STATE_CHANNEL, {
+        "drones": {"entries": fleet_status["drones"], "replace": True},
+        "missions": {"entries": fleet_status["active_missions"], "replace": True}
+    })
 
-# Background task for status updates
-async def periodic_status_update():
+# Updates are pushed as inputs arrive: each queue coalesces a burst of events
+# into one batch that runs within a bounded delay, and is idle otherwise
+risk_pipeline = RiskPipeline(lambda: components.risk_analyzer, analysis_executor, publish_areas)
+fleet_updates = CoalescingQueue("fleet", publish_fleet, max_delay=FLZConfig.TELEMETRY_APPLY_INTERVAL)
+published_fleet_version = -1
+
+async def take_over():
+    """
+    A new leader re-assesses every area, applies the inputs a failed leader
+    may have missed, and publishes the whole fleet
+    """
+    global published_fleet_version
+    published_fleet_version = -1
+    for area_key in list(components.risk_analyzer.area_manager.areas):
+        risk_pipeline.submit(area_key)
+    messages = list(replay_messages)
+    replay_messages.clear()
+    for handler, message in messages:
+        if message["received_at"] >= time.time() - REPLAY_WINDOW:
+            _REPLAYED.inc()
+            await handler(message)
+    fleet_updates.put("leader")
+
+def keep_for_replay(handler: Callable[[Dict], Awaitable[None]], message: Dict):
+    """A follower keeps a leader-bound input for as long as a failed leader could have missed it"""
+    replay_messages.append((handler, message))
+    cutoff = time.time() - REPLAY_WINDOW
+    while replay_messages and replay_messages[0][1]["received_at"] < cutoff:
+        replay_messages.popleft()
+    if len(replay_messages) > FLZConfig.LEADER_REPLAY_MESSAGES:
+        replay_messages.popleft()
+        _EVICTED.inc()
+
+def require_leader():
+    """Inputs are refused while this worker knows of no leader to apply them"""
+    if not election.has_leader:
+        raise HTTPException(
+            status_code=503, detail="No leader elected yet",
+            headers={"Retry-After": str(math.ceil(FLZConfig.LEADER_LEASE_SECONDS))}
+        )
+
+async def periodic_snapshot():
+    """
+    Snapshot risk history so startup replays at most one interval of
+    assessments, and prune stored records older than its retention
+    """
     while True:
-        status_update = {
-            "timestamp": datetime.now().isoformat(),
-            "fleet_status": eagle_nests.get_fleet_status(),
-            "high_risk_areas": risk_analyzer.get_high_risk_areas()
+        await asyncio.sleep(FLZConfig.STORE_SNAPSHOT_INTERVAL)
+        if election.is_leader:
+            await asyncio.get_running_loop().run_in_executor(analysis_executor, components.risk_analyzer.snapshot)
+
+async def relay_state(update: Dict):
+    """Apply a state update from the leader and push the deltas to this worker's clients"""
+    for topic, change in update.items():
+        state_stream.update_topic(topic, change["entries"], replace=change["replace"])
+    await state_stream.publish()
+
+async def send_full_state(request: Dict):
+    """The leader answers a worker's sync request with every topic in full"""
+    if election.is_leader:
+        await event_bus.publish(STATE_CHANNEL, {
+            topic: {"entries": state_stream.entries(topic), "replace": True} for topic in TOPICS
+        })
+
+async def request_full_state():
+    """A worker that (re)connects may have missed updates"""
+    await event_bus.publish(SYNC_CHANNEL, {"holder": election.holder})
+
+async def apply_command(command: Dict):
+    """Commands accepted by any worker take effect on the leader, whose fleet state is published"""
+    if not election.is_leader:
+        return
+    if command["action"] == "recall":
+        try:
+            recall(command["drone_id"])
+        except KeyError:
+            return
+        fleet_updates.put(("recall", command["drone_id"]), arrived=command["received_at"])
+
+async def apply_inputs(message: Dict):
+    """The leader queues new satellite products of an area for re-assessment"""
+    if not election.is_leader:
+        keep_for_replay(apply_inputs, message)
+        return
+    risk_pipeline.submit(message["area"], message["satellite_data"],
+                         message["product_id"], arrived=message["received_at"])
+
+async def apply_telemetry(message: Dict):
+    """The leader buffers telemetry frames; the fleet queue applies and publishes them"""
+    if not election.is_leader:
+        keep_for_replay(apply_telemetry, message)
+        return
+    if message["format"] == "binary":
+        accepted = components.telemetry.ingest_binary(base64.b64decode(message["data"]))
+    else:
+        accepted = components.telemetry.ingest_json(message["data"])
+    if accepted:
+        fleet_updates.put("telemetry", arrived=message["received_at"])
+
+event_bus.subscribe(STATE_CHANNEL, relay_state)
+event_bus.subscribe(SYNC_CHANNEL, send_full_state)
+event_bus.subscribe(COMMAND_CHANNEL, apply_command)
+event_bus.subscribe(INPUT_CHANNEL, apply_inputs)
+event_bus.subscribe(TELEMETRY_CHANNEL, apply_telemetry)
+event_bus.on_connect(request_full_state)
+election.on_elected(take_over)
+
+background_tasks: List[asyncio.Task] = []
+
+async def warm_up():
+    """Build components off the event loop, then start the background loops that use them"""
+    try:
+        await asyncio.get_running_loop().run_in_executor(analysis_executor, components.warm_up)
+    except Exception:
+        return  # Recorded in components.status(); readiness keeps failing
+    background_tasks.append(asyncio.create_task(risk_pipeline.run()))
+    background_tasks.append(asyncio.create_task(fleet_updates.run()))
+    background_tasks.append(asyncio.create_task(election.run()))
+    if components.store is not None:
+        background_tasks.append(asyncio.create_task(periodic_snapshot()))
+
+@app.get("/health/live")
+async def liveness():
+    """The process is up and serving the event loop"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness() -> Response:
+    """503 until components have been built, so no traffic is routed to a warming worker"""
+    return JSONResponse({**components.status(), "leader": election.is_leader},
+                        status_code=200 if components.ready else 503)
+
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    """Prometheus text exposition of process metrics"""
+    return Response(content=REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
+
+@app.get("/debug/profiler")
+async def get_profiler(api_key: str = Depends(get_api_key)):
+    """Profiler state and, while running, the stacks sampled so far"""
+    return {**profiler.status(), "stacks": profiler.collapsed() if profiler.samples else ""}
+
+@app.post("/debug/profiler/start")
+async def start_profiler(interval: Optional[float] = Query(None, ge=0.001, le=1.0),
+                         api_key: str = Depends(get_api_key)):
+    """Start sampling every thread's stack; stop it to collect the results"""
+    try:
+        profiler.start(interval)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profiler.status()
+
+@app.post("/debug/profiler/stop")
+async def stop_profiler(api_key: str = Depends(get_api_key)) -> Response:
+    """Stop the profiler and return sampled stacks in collapsed (flame graph) format"""
+    try:
+        stacks = profiler.stop()
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(content=stacks, media_type="text/plain")
+
+# Only the leader applies inputs and telemetry, so a follower's own components
+# go stale. Followers answer risk and fleet reads from the state the leader
+# publishes instead, which every worker holds in its state stream.
+
+def serve_published() -> bool:
+    return event_bus.shared and not election.is_leader
+
+def published_version(topic: str) -> tuple:
+    return ("published", state_stream.versions[topic])
+
+def published_risk_table(area_keys: List[str]) -> Dict:
+    """Columns like RiskAnalyzer.get_risk_table from published assessments; unassessed areas are left out"""
+    rows = [(key, state_stream.entry("areas", key)) for key in area_keys]
+    rows = [(key, entry) for key, entry in rows if entry is not None]
+    return {
+        "area": [key for key, _ in rows],
+        "name": [entry["name"] for _, entry in rows],
+        "risk_level": np.array([entry["risk_level"] for _, entry in rows], dtype=float),
+        "alert_level": [entry["alert_level"] for _, entry in rows],
+        "requires_inspection": np.array([entry["requires_inspection"] for _, entry in rows], dtype=bool),
+        "latitude": np.array([entry["coordinates"][0] for _, entry in rows], dtype=float),
+        "longitude": np.array([entry["coordinates"][1] for _, entry in rows], dtype=float),
+        "timestamp": [entry["timestamp"] for _, entry in rows]
+    }
+
+def published_drones(statuses: Optional[List[str]], nests: Optional[List[str]]) -> Dict[str, Dict]:
+    """DroneInfo rows by drone ID from the published fleet state"""
+    return {
+        drone_id: {
+            "id": drone_id,
+            "name": drone["name"],
+            "status": drone["status"],
+            "battery_level": drone["battery"],
+            "current_coords": drone["coords"],
+            "current_mission": drone["mission"]
         }
-        await manager.broadcast(status_update)
-        await asyncio.sleep(FLZConfig.ALERT_REFRESH_RATE)
+        for drone_id, drone in state_stream.entries("drones").items()
+        if (statuses is None or drone["status"] in statuses) and (nests is None or drone["nest"] in nests)
+    }
 
-@app.on_event("startup")
-async def startup_event():
-    asyncio.create_task(periodic_status_update())
+def published_missions(statuses: Optional[List[str]], priorities: Optional[List[str]],
+                       areas: Optional[List[str]]) -> Dict[str, Dict]:
+    """MissionInfo rows by mission ID from the published fleet state"""
+    rows = {}
+    for mission_id, mission in state_stream.entries("missions").items():
+        priority = MissionPriority(mission["priority"]).name
+        if ((statuses is None or mission["status"] in statuses) and
+                (priorities is None or priority in priorities) and
+                (areas is None or mission["area"] in areas)):
+            rows[mission_id] = {
+                "id": mission_id,
+                "area": mission["area"],
+                "priority": priority,
+                "status": mission["status"],
+                "drone_id": mission["drone"],
+                "target_coords": mission["target_coords"]
+            }
+    return rows
 
 # REST Endpoints
 
 @app.get("/areas", response_model=List[str])
-async def get_monitored_areas(api_key: str = Depends(get_api_key)):
+async def get_monitored_areas(request: Request, api_key: str = Depends(get_api_key)) -> Response:
     """Get list of all monitored areas"""
-    return list(FLZConfig.MONITORED_AREAS.keys())
+    area_manager = components.risk_analyzer.area_manager
+    return response_cache.respond(
+        request, "areas", area_manager.version, lambda: list(area_manager.areas)
+    )
+
+@app.get("/areas/risk")
+async def get_areas_risk(request: Request, areas: Optional[str] = None,
+                         bbox: Optional[str] = None, alert_level: Optional[str] = None,
+                         cursor: Optional[str] = None,
+                         limit: int = Query(FLZConfig.API_MAX_PAGE_SIZE, ge=1, le=FLZConfig.API_MAX_PAGE_SIZE),
+                         response_format: str = FORMAT_QUERY,
+                         api_key: str = Depends(get_api_key)) -> Response:
+    """
+    Current risk for many areas, selected by comma-separated keys or a
+    bbox of south,west,north,east (default: all), optionally filtered by
+    alert level. Pages follow the X-Next-Cursor response header.
+    """
+    try:
+        bounds = tuple(float(value) for value in parse_list(bbox)) if bbox is not None else None
+    except ValueError:
+        bounds = ()
+    if bounds is not None and len(bounds) != 4:
+        raise HTTPException(status_code=400, detail="bbox must be four numbers")
+    query = AreaRiskQuery(
+        areas=parse_list(areas), bbox=bounds, alert_levels=parse_list(alert_level),
+        cursor=cursor, limit=limit, format=response_format
+    )
+    return await area_risk_response(request, query)
+
+@app.post("/areas/risk")
+async def query_areas_risk(query: AreaRiskQuery, request: Request,
+                           api_key: str = Depends(get_api_key)) -> Response:
+    """Bulk risk like GET /areas/risk, for area lists too long for a query string"""
+    return await area_risk_response(request, query)
+
+async def area_risk_response(request: Request, query: AreaRiskQuery) -> Response:
+    risk_analyzer = components.risk_analyzer
+    area_manager = risk_analyzer.area_manager
+    if query.areas is not None and query.bbox is not None:
+        raise HTTPException(status_code=400, detail="Select areas by list or bbox, not both")
+    if query.areas is not None:
+        area_keys = sorted({area.lower() for area in query.areas})
+        unknown = [key for key in area_keys if key not in area_manager.areas]
+        if unknown:
+            raise HTTPException(status_code=404, detail=f"Area {unknown[0]} not found")
+    elif query.bbox is not None:
+        area_keys = sorted(area_manager.areas_in_bounds(*query.bbox))
+    else:
+        area_keys = sorted(area_manager.areas)
+
+    levels = [level.upper() for level in query.alert_levels] if query.alert_levels is not None else None
+    if levels is not None and not set(levels) <= set(ALERT_LEVELS):
+        raise HTTPException(status_code=400, detail=f"alert_level must be in {ALERT_LEVELS}")
+    area_keys = list(after_cursor(area_keys, query.cursor))
+    published = serve_published()
+    risk_table = published_risk_table if published else risk_analyzer.get_risk_table
+
+    def risk_page():
+        if levels is None:
+            page, next_cursor = take_page(area_keys, query.limit)
+            table = risk_table(page)
+        else:
+            # Filtering needs the risk of every candidate before paging
+            table = risk_table(area_keys)
+            rows = np.flatnonzero(np.isin(table["alert_level"], levels))
+            next_cursor = None
+            if len(rows) > query.limit:
+                rows = rows[:query.limit]
+                next_cursor = table["area"][rows[-1]]
+            table = {
+                name: column[rows] if isinstance(column, np.ndarray) else [column[i] for i in rows]
+                for name, column in table.items()
+            }
+        if published:
+            return (*published_version("areas"), area_manager.version), table, next_cursor
+        return (risk_analyzer.state_version, area_manager.version), table, next_cursor
+
+    # Identical concurrent queries (e.g. many map clients) share one computation
+    resource = ("areas/risk", published, query.model_dump_json())
+    version, table, next_cursor = await area_risk_flights.run(resource, risk_page)
+    return response_cache.respond(
+        request, resource, version,
+        lambda: Payload(
+            table if query.format == "columnar" else to_rows(table),
+            page_headers(next_cursor)
+        )
+    )
 
 @app.get("/areas/{area_name}/risk", response_model=AreaRisk)
-async def get_area_risk(area_name: str, api_key: str = Depends(get_api_key)):
+async def get_area_risk(area_name: str, request: Request,
+                        api_key: str = Depends(get_api_key)) -> Response:
     """Get current risk assessment for specific area"""
+    area_key = area_name.lower()
+    if serve_published():
+        return published_area_risk(request, area_key)
     try:
-        assessment = risk_analyzer.analyze_area(area_name)
-        return AreaRisk(
+        # Concurrent requests for an area share one assessment
+        version, assessment = await area_risk_flights.run(
+            area_key, components.risk_analyzer.get_versioned_assessment, area_key
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return response_cache.respond(
+        request, ("risk", area_key), version,
+        lambda: AreaRisk(
             area_name=assessment.area_name,
             risk_level=assessment.total_risk_level,
             alert_level=assessment.alert_level,
@@ -125,65 +579,200 @@ async def get_area_risk(area_name: str, api_key: str = Depends(get_api_key)):
             requires_inspection=assessment.requires_drone_inspection,
             coordinates=assessment.coordinates
         )
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    )
 
-@app.get("/drones", response_model=List[DroneInfo])
-async def get_drone_fleet(api_key: str = Depends(get_api_key)):
-    """Get status of all drones"""
-    fleet_status = eagle_nests.get_fleet_status()
-    return [
-        DroneInfo(
-            id=drone_id,
-            name=info["name"],
-            status=info["status"],
-            battery_level=info["battery"],
-            current_coords=info["coords"],
-            current_mission=info["mission"]
+def published_area_risk(request: Request, area_key: str) -> Response:
+    if area_key not in components.risk_analyzer.area_manager.areas:
+        raise HTTPException(status_code=404, detail=f"Area {area_key} not found")
+    entry = state_stream.entry("areas", area_key)
+    if entry is None:
+        raise HTTPException(status_code=503, detail=f"Area {area_key} has not been assessed yet")
+    return response_cache.respond(
+        request, ("risk", area_key), published_version("areas"),
+        lambda: AreaRisk(
+            area_name=entry["name"],
+            risk_level=entry["risk_level"],
+            alert_level=entry["alert_level"],
+            timestamp=entry["timestamp"],
+            requires_inspection=entry["requires_inspection"],
+            coordinates=tuple(entry["coordinates"])
         )
-        for drone_id, info in fleet_status["drones"].items()
-    ]
+    )
+
+@app.post("/areas/{area_name}/inputs", status_code=202)
+async def submit_area_inputs(area_name: str, inputs: SatelliteInputs,
+                             api_key: str = Depends(get_api_key)):
+    """
+    New satellite statistics for an area. The leader re-assesses the area
+    within RISK_MAX_DELAY_SECONDS and publishes the result to subscribers.
+    """
+    received_at = time.time()
+    area_key = area_name.lower()
+    if area_key not in components.risk_analyzer.area_manager.areas:
+        raise HTTPException(status_code=404, detail=f"Area {area_name} not found")
+    require_leader()
+    await event_bus.publish(INPUT_CHANNEL, {
+        "area": area_key,
+        "satellite_data": inputs.model_dump(exclude={"product_id"}),
+        "product_id": inputs.product_id,
+        "received_at": received_at
+    })
+    return {"status": "accepted"}
+
+@app.post("/telemetry", status_code=202)
+async def submit_telemetry(request: Request, api_key: str = Depends(get_api_key)):
+    """
+    Drone telemetry as binary frames (application/octet-stream) or JSON
+    frames. Applied and published within TELEMETRY_APPLY_INTERVAL.
+    """
+    received_at = time.time()
+    require_leader()
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith("application/octet-stream"):
+        message = {"format": "binary", "data": base64.b64encode(body).decode("ascii")}
+    else:
+        message = {"format": "json", "data": body.decode("utf-8", errors="replace")}
+    await event_bus.publish(TELEMETRY_CHANNEL, {**message, "received_at": received_at})
+    return {"status": "accepted"}
+
+@app.get("/drones", response_model=List[DroneInfo])
+async def get_drone_fleet(request: Request, status: Optional[str] = None,
+                          nest: Optional[str] = None, cursor: Optional[str] = None,
+                          limit: Optional[int] = LIMIT_QUERY,
+                          response_format: str = FORMAT_QUERY,
+                          api_key: str = Depends(get_api_key)) -> Response:
+    """Get status of drones, optionally filtered by comma-separated statuses and home nests"""
+    statuses = parse_list(status)
+    nests = parse_list(nest)
+    if statuses is not None and not set(statuses) <= {s.value for s in DroneStatus}:
+        raise HTTPException(status_code=400, detail="Unknown drone status")
+    eagle_nests = components.eagle_nests
+    published = serve_published()
+
+    def build() -> Payload:
+        if published:
+            rows_by_id = published_drones(statuses, nests)
+            page, next_cursor = take_page(after_cursor(sorted(rows_by_id), cursor), limit)
+            rows = [rows_by_id[drone_id] for drone_id in page]
+            content = to_columns(rows, list(DroneInfo.model_fields)) if response_format == "columnar" else rows
+            return Payload(content, page_headers(next_cursor))
+        drones = eagle_nests.drones
+        mask = np.ones(len(drones), dtype=bool)
+        if statuses is not None:
+            mask &= drones.status_mask([DroneStatus(value) for value in statuses])
+        if nests is not None:
+            mask &= drones.nest_mask(nests)
+        drone_ids = sorted(drones.select_ids(mask))
+        page, next_cursor = take_page(after_cursor(drone_ids, cursor), limit)
+        rows = [
+            {
+                "id": drone.id,
+                "name": drone.name,
+                "status": drone.status.value,
+                "battery_level": drone.battery_level,
+                "current_coords": drone.current_coords,
+                "current_mission": drone.current_mission_id
+            }
+            for drone in (drones[drone_id] for drone_id in page)
+        ]
+        content = to_columns(rows, list(DroneInfo.model_fields)) if response_format == "columnar" else rows
+        return Payload(content, page_headers(next_cursor))
+
+    resource = ("drones", status, nest, cursor, limit, response_format)
+    version = published_version("drones") if published else eagle_nests.state_version
+    return response_cache.respond(request, resource, version, build)
 
 @app.get("/missions/active", response_model=List[MissionInfo])
-async def get_active_missions(api_key: str = Depends(get_api_key)):
-    """Get all active missions"""
-    fleet_status = eagle_nests.get_fleet_status()
-    return [
-        MissionInfo(
-            id=mission_id,
-            area=info["area"],
-            priority=info["priority"],
-            status=info["status"],
-            drone_id=info["drone"],
-            target_coords=risk_analyzer.area_manager.areas[info["area"]].center_coords
-        )
-        for mission_id, info in fleet_status["active_missions"].items()
-    ]
+async def get_active_missions(request: Request, status: Optional[str] = None,
+                              priority: Optional[str] = None, area: Optional[str] = None,
+                              cursor: Optional[str] = None,
+                              limit: Optional[int] = LIMIT_QUERY,
+                              response_format: str = FORMAT_QUERY,
+                              api_key: str = Depends(get_api_key)) -> Response:
+    """Get active missions, optionally filtered by comma-separated statuses, priorities and areas"""
+    statuses = parse_list(status)
+    areas = parse_list(area)
+    priorities = parse_list(priority)
+    if priorities is not None:
+        priorities = [value.upper() for value in priorities]
+        if not set(priorities) <= set(MissionPriority.__members__):
+            raise HTTPException(status_code=400, detail="Unknown mission priority")
+    eagle_nests = components.eagle_nests
+    published = serve_published()
+
+    def build() -> Payload:
+        if published:
+            rows_by_id = published_missions(statuses, priorities, areas)
+            page, next_cursor = take_page(after_cursor(sorted(rows_by_id), cursor), limit)
+            rows = [rows_by_id[mission_id] for mission_id in page]
+            content = to_columns(rows, list(MissionInfo.model_fields)) if response_format == "columnar" else rows
+            return Payload(content, page_headers(next_cursor))
+        missions = eagle_nests.missions
+        mission_ids = sorted(mission.id for mission in missions.query(
+            statuses=statuses,
+            priorities=[MissionPriority[name] for name in priorities] if priorities is not None else None,
+            areas=areas
+        ))
+        page, next_cursor = take_page(after_cursor(mission_ids, cursor), limit)
+        rows = [
+            {
+                "id": mission.id,
+                "area": mission.target_area,
+                "priority": mission.priority.name,
+                "status": mission.status,
+                "drone_id": mission.drone_id,
+                "target_coords": mission.target_coords
+            }
+            for mission in (missions[mission_id] for mission_id in page)
+        ]
+        content = to_columns(rows, list(MissionInfo.model_fields)) if response_format == "columnar" else rows
+        return Payload(content, page_headers(next_cursor))
+
+    resource = ("missions", status, priority, area, cursor, limit, response_format)
+    version = published_version("missions") if published else eagle_nests.state_version
+    return response_cache.respond(request, resource, version, build)
 
 @app.post("/drones/{drone_id}/recall")
 async def recall_drone(drone_id: str, api_key: str = Depends(get_api_key)):
     """Emergency recall of a specific drone"""
+    received_at = time.time()
     try:
-        drone = eagle_nests.drones[drone_id]
-        eagle_nests.update_drone_status(
-            drone_id,
-            DroneStatus.RETURNING,
-            drone.battery_level,
-            drone.current_coords
-        )
-        return {"status": "success", "message": f"Drone {drone_id} recalled"}
+        recall(drone_id)
     except KeyError:
         raise HTTPException(status_code=404, detail="Drone not found")
+    # Applied here, and on the leader, whose published fleet state followers serve
+    await event_bus.publish(COMMAND_CHANNEL, {
+        "action": "recall", "drone_id": drone_id, "received_at": received_at
+    })
+    return {"status": "success", "message": f"Drone {drone_id} recalled"}
 
 # WebSocket endpoint
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
+    # Clients start subscribed to everything until they send a subscription
+    await state_stream.subscribe(websocket)
     try:
         while True:
             data = await websocket.receive_text()
-            # Handle any incoming WebSocket messages
-            # Currently just echo for testing
-            await websocket.send_json({"message": "received", "data": data})
+            try:
+                message = json.loads(data)
+            except ValueError:
+                message = None
+            action = message.get("action") if isinstance(message, dict) else None
+
+            if action == "subscribe":
+                try:
+                    subscription = Subscription.from_message(message)
+                except ValueError as e:
+                    await manager.send(websocket, {"error": str(e)})
+                    continue
+                await state_stream.subscribe(websocket, subscription)
+            elif action == "resync":
+                await state_stream.resync(websocket)
+            else:
+                # Echo anything else for testing
+                await manager.send(websocket, {"message": "received", "data": data})
     except:
-        manager.disconnect(websocket)
\ No newline at end of file
+        state_stream.unsubscribe(websocket)
+        await manager.disconnect(websocket)
@@ -0,0 +1,208 @@
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from fastapi import WebSocket
+from ..core.metrics import REGISTRY
+from .websocket import ConnectionManager, serialize_message
+
+TOPICS = ("areas", "drones", "missions")
+
+PUBLISH_SECONDS = REGISTRY.histogram(
+    "flz_ws_publish_seconds", "Time to filter, serialize and queue one round of deltas for all clients"
+)
+
+@dataclass(frozen=True)
+class Subscription:
+    """Topics and entity filters a client receives. None means no filter."""
+    topics: FrozenSet[str] = frozenset(TOPICS)
+    areas: Optional[FrozenSet[str]] = None
+    drones: Optional[FrozenSet[str]] = None
+    alert_levels: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def from_message(cls, message: Dict) -> "Subscription":
+        """
+        Build a subscription from a client message such as
+        {"action": "subscribe", "topics": ["areas"], "alert_levels": ["HIGH", "CRITICAL"]}
+
+        A single string counts as a one-item list; other values raise ValueError.
+        """
+        def as_filter(name: str) -> Optional[FrozenSet[str]]:
+            values = message.get(name)
+            if values is None:
+                return None
+            if isinstance(values, str):
+                values = [values]
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"'{name}' must be a string or a list of strings")
+            return frozenset(values)
+
+        topics = as_filter("topics") or TOPICS
+        return cls(
+            topics=frozenset(topic for topic in topics if topic in TOPICS),
+            areas=as_filter("areas"),
+            drones=as_filter("drones"),
+            alert_levels=as_filter("alert_levels")
+        )
+
+    def matches(self, topic: str, key: str, value: Dict) -> bool:
+        if topic not in self.topics:
+            return False
+        if topic == "areas":
+            return (
+                (self.areas is None or key in self.areas) and
+                (self.alert_levels is None or value["alert_level"] in self.alert_levels)
+            )
+        if topic == "drones":
+            return self.drones is None or key in self.drones
+        return True
+
+class _SubscriptionGroup:
+    """Clients sharing a subscription. Deltas are numbered and serialized once per group."""
+
+    def __init__(self, subscription: Subscription):
+        self.subscription = subscription
+        self.seq = 0
+        self.clients: Set[WebSocket] = set()
+
+class StateStream:
+    """
+    Versioned state stream over WebSockets. Subscribers get one snapshot and
+    then only sequence-numbered deltas for the entities they subscribed to.
+    A client that sees a gap in `seq` sends {"action": "resync"} to get a
+    fresh snapshot; clients whose queue dropped messages are resynced automatically.
+    """
+
+    def __init__(self, manager: ConnectionManager):
+        self.manager = manager
+        self._state: Dict[str, Dict[str, Dict]] = {topic: {} for topic in TOPICS}
+        self.versions: Dict[str, int] = {topic: 0 for topic in TOPICS}  # Bumped by every staged change
+        # Changes since the last publish: topic -> key -> (old value, new value)
+        self._pending: Dict[str, Dict[str, Tuple[Optional[Dict], Optional[Dict]]]] = {
+            topic: {} for topic in TOPICS
+        }
+        self._groups: Dict[Subscription, _SubscriptionGroup] = {}
+        self._client_groups: Dict[WebSocket, _SubscriptionGroup] = {}
+        self._client_drops: Dict[WebSocket, int] = {}
+
+    async def subscribe(self, websocket: WebSocket, subscription: Subscription = Subscription()):
+        """Move a client to a subscription and send it a snapshot"""
+        self.unsubscribe(websocket)
+        group = self._groups.get(subscription)
+        if group is None:
+            group = _SubscriptionGroup(subscription)
+            self._groups[subscription] = group
+        group.clients.add(websocket)
+        self._client_groups[websocket] = group
+        await self.resync(websocket)
+
+    def unsubscribe(self, websocket: WebSocket):
+        group = self._client_groups.pop(websocket, None)
+        self._client_drops.pop(websocket, None)
+        if group:
+            group.clients.discard(websocket)
+            if not group.clients:
+                del self._groups[group.subscription]
+
+    async def resync(self, websocket: WebSocket):
+        """Send the client a snapshot at its group's current sequence number"""
+        group = self._client_groups.get(websocket)
+        if group is None:
+            return
+        self._client_drops[websocket] = self.manager.dropped_messages(websocket)
+        await self.manager.send(websocket, {
+            "type": "snapshot",
+            "seq": group.seq,
+            "timestamp": datetime.now().isoformat(),
+            "state": self._snapshot(group.subscription)
+        })
+
+    def entries(self, topic: str) -> Dict[str, Dict]:
+        """Current value of every entity of a topic, including staged changes"""
+        return dict(self._state[topic])
+
+    def entry(self, topic: str, key: str) -> Optional[Dict]:
+        """Current value of one entity, or None if there is none"""
+        return self._state[topic].get(key)
+
+    def update_topic(self, topic: str, entries: Dict[str, Dict], replace: bool = False):
+        """
+        Stage new values for entities of a topic. With replace=True, entries is
+        the complete set and entities missing from it are removed.
+        """
+        current = self._state[topic]
+        pending = self._pending[topic]
+
+        def stage(key: str, new_value: Optional[Dict]):
+            old_value = pending[key][0] if key in pending else current.get(key)
+            if new_value is None:
+                current.pop(key, None)
+            else:
+                current[key] = new_value
+            if old_value == new_value:
+                pending.pop(key, None)
+            else:
+                pending[key] = (old_value, new_value)
+            self.versions[topic] += 1
+
+        if replace:
+            for key in [key for key in current if key not in entries]:
+                stage(key, None)
+        for key, value in entries.items():
+            if current.get(key) != value:
+                stage(key, value)
+
+    async def publish(self) -> int:
+        """Send staged changes as one delta per subscription group. Returns the number of changes."""
+        change_count = sum(len(changes) for changes in self._pending.values())
+        if not change_count:
+            return 0
+
+        started = perf_counter()
+        timestamp = datetime.now().isoformat()
+        for group in list(self._groups.values()):
+            changes, removed = self._filter_changes(group.subscription)
+            if not changes and not removed:
+                continue
+            group.seq += 1
+            text = serialize_message({
+                "type": "delta",
+                "seq": group.seq,
+                "timestamp": timestamp,
+                "changes": changes,
+                "removed": removed
+            })
+            for websocket in list(group.clients):
+                if self.manager.dropped_messages(websocket) != self._client_drops.get(websocket, 0):
+                    # The client missed messages; a snapshot replaces the delta
+                    await self.resync(websocket)
+                else:
+                    await self.manager.send_text(websocket, text)
+
+        self._pending = {topic: {} for topic in TOPICS}
+        PUBLISH_SECONDS.observe(perf_counter() - started)
+        return change_count
+
+    def _snapshot(self, subscription: Subscription) -> Dict[str, Dict[str, Dict]]:
+        return {
+            topic: {
+                key: value for key, value in self._state[topic].items()
+                if subscription.matches(topic, key, value)
+            }
+            for topic in TOPICS if topic in subscription.topics
+        }
+
+    def _filter_changes(self, subscription: Subscription) -> Tuple[Dict[str, Dict], Dict[str, List[str]]]:
+        changes: Dict[str, Dict[str, Any]] = {}
+        removed: Dict[str, List[str]] = {}
+        for topic, pending in self._pending.items():
+            if topic not in subscription.topics:
+                continue
+            for key, (old_value, new_value) in pending.items():
+                if new_value is not None and subscription.matches(topic, key, new_value):
+                    changes.setdefault(topic, {})[key] = new_value
+                elif old_value is not None and subscription.matches(topic, key, old_value):
+                    # Removed, or no longer matches the filter (e.g. alert level dropped)
+                    removed.setdefault(topic, []).append(key)
+        return changes, removed
@@ -0,0 +1,174 @@
+from enum import Enum
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+import asyncio
+import json
+from fastapi import WebSocket
+from ..core.config import FLZConfig
+
+class SlowConsumerPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"          # Discard the oldest queued message
+    COALESCE_LATEST = "coalesce_latest"  # Discard everything queued, keep the newest
+    DISCONNECT = "disconnect"            # Drop the client
+
+def serialize_message(message: dict) -> str:
+    """Serialize a message the same way WebSocket.send_json does"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+class ClientChannel:
+    """
+    Bounded outbound queue for one WebSocket, drained by its own writer task
+    so a slow client never holds up sends to the others.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue_size: int,
+                 policy: SlowConsumerPolicy, send_timeout: float,
+                 on_closed: Callable[[WebSocket], None]):
+        self.websocket = websocket
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.dropped_messages = 0
+        self._on_closed = on_closed
+        self._queue: Deque[str] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._closing: Optional[asyncio.Task] = None
+        self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def offer(self, text: str) -> bool:
+        """
+        Queue a serialized message without waiting. Returns False if the
+        client is closed or must be disconnected under its policy.
+        """
+        if self._closed:
+            return False
+
+        if len(self._queue) >= self.max_queue_size:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                return False
+            if self.policy == SlowConsumerPolicy.COALESCE_LATEST:
+                self.dropped_messages += len(self._queue)
+                self._queue.clear()
+            else:
+                self._queue.popleft()
+                self.dropped_messages += 1
+
+        self._queue.append(text)
+        self._ready.set()
+        return True
+
+    def close(self):
+        """Stop the writer task and close the socket in the background; see wait_closed"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.clear()
+        if self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._closing = asyncio.create_task(self._close_socket())
+
+    async def wait_closed(self):
+        """Wait until the writer has stopped and the socket is closed"""
+        tasks = [
+            task for task in (self._writer, self._closing)
+            if task is not None and task is not asyncio.current_task()
+        ]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass  # Socket already gone
+
+    async def _write_loop(self):
+        try:
+            while True:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                text = self._queue.popleft()
+                await asyncio.wait_for(self.websocket.send_text(text), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed or timed out - treat the socket as dead
+            self._on_closed(self.websocket)
+
+class ConnectionManager:
+    """Fans messages out to all connected WebSockets through per-client channels"""
+
+    def __init__(self, max_queue_size: int = FLZConfig.WS_CLIENT_QUEUE_SIZE,
+                 policy: SlowConsumerPolicy = SlowConsumerPolicy(FLZConfig.WS_SLOW_CONSUMER_POLICY),
+                 send_timeout: float = FLZConfig.WS_SEND_TIMEOUT):
+        self.max_queue_size = max_queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._channels: Dict[WebSocket, ClientChannel] = {}
+        self._closing: Dict[WebSocket, ClientChannel] = {}  # Dropped, socket still closing
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self._channels)
+
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+        self._channels[websocket] = ClientChannel(
+            websocket,
+            self.max_queue_size,
+            self.policy,
+            self.send_timeout,
+            on_closed=self._drop
+        )
+
+    async def disconnect(self, websocket: WebSocket):
+        """Drop a client and wait until its writer has stopped and its socket is closed"""
+        self._drop(websocket)
+        channel = self._closing.get(websocket)
+        if channel:
+            await channel.wait_closed()
+
+    def _drop(self, websocket: WebSocket):
+        """Drop a client without waiting, so one slow close never holds up a broadcast"""
+        channel = self._channels.pop(websocket, None)
+        if channel:
+            channel.close()
+            self._closing[websocket] = channel
+            channel._closing.add_done_callback(lambda _: self._closing.pop(websocket, None))
+
+    async def send(self, websocket: WebSocket, message: dict):
+        """Queue a message for a single client"""
+        await self.send_text(websocket, serialize_message(message))
+
+    async def send_text(self, websocket: WebSocket, text: str):
+        channel = self._channels.get(websocket)
+        if channel and not channel.offer(text):
+            self._drop(websocket)
+
+    async def broadcast(self, message: dict):
+        """Serialize once and queue the message for every client"""
+        await self.broadcast_text(serialize_message(message))
+
+    async def broadcast_text(self, text: str):
+        for websocket, channel in list(self._channels.items()):
+            if not channel.offer(text):
+                self._drop(websocket)
+
+    def dropped_messages(self, websocket: WebSocket) -> int:
+        """Messages dropped so far for a client by its slow-consumer policy"""
+        channel = self._channels.get(websocket)
+        return channel.dropped_messages if channel else 0
+
+    def queue_depths(self) -> List[int]:
+        """Outbound queue depth of every client"""
+        return [channel.queue_depth for channel in self._channels.values()]
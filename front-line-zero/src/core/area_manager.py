@@ -0,0 +1,388 @@
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import csv
+import json
+import math
+import unicodedata
+import numpy as np
+from .config import FLZConfig, AreaConfig
+from .geo import KM_PER_DEGREE_LAT, haversine_km
+
+MOCK_RASTER_SIZE = 100  # pixels per side of mock satellite rasters
+
+@dataclass
+class MonitoredArea:
+    key: str
+    name: str
+    center_coords: Tuple[float, float]  # (lat, lon)
+    radius_km: float
+    risk_threshold: float
+
+    @property
+    def config(self) -> AreaConfig:
+        return AreaConfig(
+            name=self.name,
+            latitude=self.center_coords[0],
+            longitude=self.center_coords[1],
+            radius_km=self.radius_km,
+            risk_threshold=self.risk_threshold
+        )
+
+def area_key(name: str) -> str:
+    """Registry key for an area name, e.g. "Castelo Novo" -> "castelo_novo" """
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return "_".join(ascii_name.lower().split())
+
+class AreaBoundsIndex:
+    """
+    Uniform grid over latitude/longitude. Each area is registered in every cell
+    its bounding box touches, stored as cell-sorted arrays so a query reads a
+    few contiguous slices and filters the candidates' boxes in one pass.
+    """
+
+    def __init__(self, cell_size_deg: float):
+        self.cell_size_deg = cell_size_deg
+        self._columns = int(math.ceil(360 / cell_size_deg)) + 1
+        self._cell_ids = np.zeros(0, dtype=np.int64)
+        self._area_index = np.zeros(0, dtype=np.int64)
+
+    def build(self, south: np.ndarray, west: np.ndarray, north: np.ndarray, east: np.ndarray):
+        row0, col0 = self._cell(south, west)
+        row1, col1 = self._cell(north, east)
+        heights = row1 - row0 + 1
+        widths = col1 - col0 + 1
+        counts = heights * widths
+
+        # One (cell, area) pair per covered cell, enumerated without a Python loop
+        area_index = np.repeat(np.arange(len(south)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = row0[area_index] + offsets // widths[area_index]
+        cols = col0[area_index] + offsets % widths[area_index]
+        cell_ids = rows * self._columns + cols
+
+        order = np.argsort(cell_ids, kind="stable")
+        self._cell_ids = cell_ids[order]
+        self._area_index = area_index[order]
+
+    def candidates(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """Indices of areas registered in any cell overlapping the box (a superset of the hits)"""
+        (row0, col0), (row1, col1) = self._cell(south, west), self._cell(north, east)
+        if (row1 - row0 + 1) * (col1 - col0 + 1) > len(self._cell_ids):
+            # Query covers more cells than are indexed; every area is a candidate
+            return np.unique(self._area_index)
+
+        rows = np.arange(row0, row1 + 1)
+        starts = (rows * self._columns + col0)
+        first = np.searchsorted(self._cell_ids, starts, side="left")
+        last = np.searchsorted(self._cell_ids, starts + (col1 - col0), side="right")
+        if not len(first):
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([
+            self._area_index[begin:end] for begin, end in zip(first, last)
+        ]))
+
+    def _cell(self, lat, lon):
+        row = np.floor((np.asarray(lat) + 90) / self.cell_size_deg).astype(np.int64)
+        col = np.floor((np.clip(lon, -180, 180) + 180) / self.cell_size_deg).astype(np.int64)
+        return row, col
+
+class AreaView(Mapping):
+    """Read-only mapping of area key -> MonitoredArea, building detail objects on access"""
+
+    def __init__(self, manager: "AreaManager"):
+        self._manager = manager
+
+    def __getitem__(self, area_key: str) -> MonitoredArea:
+        return self._manager._detail(area_key)
+
+    def __contains__(self, area_key) -> bool:
+        return area_key in self._manager._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._manager._positions)
+
+    def __len__(self) -> int:
+        return len(self._manager._positions)
+
+class AreaManager:
+    """
+    Registry of monitored areas. Area fields are stored column-wise in arrays,
+    bounding-box queries go through a grid index that is rebuilt lazily after
+    changes, and MonitoredArea objects are only created when looked up.
+    """
+
+    def __init__(self, areas: Optional[Dict[str, AreaConfig]] = None,
+                 cell_size_deg: float = FLZConfig.AREA_INDEX_CELL_DEG):
+        self.keys: List[str] = []
+        self.names: List[str] = []
+        self._latitude = np.zeros(0)
+        self._longitude = np.zeros(0)
+        self._radius_km = np.zeros(0)
+        self._risk_threshold = np.zeros(0)
+        self._positions: Dict[str, int] = {}
+        self._details: Dict[str, MonitoredArea] = {}
+        self._index = AreaBoundsIndex(cell_size_deg)
+        self._index_stale = False
+        self.version = 0  # Bumped whenever areas are added, changed or removed
+        self.areas = AreaView(self)
+
+        if areas is None:
+            areas = FLZConfig.get_area_configs()
+        self.add_areas(areas)
+
+    # Column views over the registered areas, in registry order
+
+    @property
+    def latitudes(self) -> np.ndarray:
+        return self._latitude[:len(self.keys)]
+
+    @property
+    def longitudes(self) -> np.ndarray:
+        return self._longitude[:len(self.keys)]
+
+    @property
+    def radii_km(self) -> np.ndarray:
+        return self._radius_km[:len(self.keys)]
+
+    @property
+    def risk_thresholds(self) -> np.ndarray:
+        return self._risk_threshold[:len(self.keys)]
+
+    def add_areas(self, areas: Dict[str, AreaConfig]) -> int:
+        """Add or replace areas by key. Returns the number of areas written."""
+        return self._add_columns(
+            list(areas.keys()),
+            [area.name for area in areas.values()],
+            [area.latitude for area in areas.values()],
+            [area.longitude for area in areas.values()],
+            [area.radius_km for area in areas.values()],
+            [area.risk_threshold for area in areas.values()]
+        )
+
+    def remove_area(self, area_key: str):
+        position = self._position(area_key)
+        last = len(self.keys) - 1
+        # Move the last area into the freed slot to keep columns dense
+        if position != last:
+            moved_key = self.keys[last]
+            self.keys[position] = moved_key
+            self.names[position] = self.names[last]
+            for column in (self._latitude, self._longitude, self._radius_km, self._risk_threshold):
+                column[position] = column[last]
+            self._positions[moved_key] = position
+        self.keys.pop()
+        self.names.pop()
+        del self._positions[area_key]
+        self._details.pop(area_key, None)
+        self._changed()
+
+    def load_csv(self, path: Union[str, Path]) -> int:
+        """
+        Load areas from a CSV file with columns name, latitude, longitude and
+        optionally key, radius_km and risk_threshold. Keys are normalized like
+        area_key() and must be unique. Returns areas loaded.
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        try:
+            return self._add_columns(
+                [row.get("key") or area_key(row["name"]) for row in rows],
+                [row["name"] for row in rows],
+                [float(row["latitude"]) for row in rows],
+                [float(row["longitude"]) for row in rows],
+                [float(row.get("radius_km") or FLZConfig.DEFAULT_AREA_RADIUS_KM) for row in rows],
+                [float(row.get("risk_threshold") or FLZConfig.DEFAULT_AREA_RISK_THRESHOLD) for row in rows]
+            )
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Invalid area CSV {path}: {e}")
+
+    def load_geojson(self, path: Union[str, Path]) -> int:
+        """
+        Load areas from a GeoJSON FeatureCollection. Point features use the
+        radius_km property; polygons are approximated by the circle around
+        their vertex centroid that encloses all vertices. Returns areas loaded.
+        """
+        with open(path, encoding="utf-8") as f:
+            features = json.load(f).get("features", [])
+
+        columns = ([], [], [], [], [], [])
+        for feature in features:
+            properties = feature.get("properties") or {}
+            geometry = feature.get("geometry") or {}
+            name = properties.get("name")
+            if not name:
+                raise ValueError(f"Invalid area GeoJSON {path}: feature without a name")
+
+            if geometry.get("type") == "Point":
+                lon, lat = geometry["coordinates"][:2]
+                radius_km = properties.get("radius_km", FLZConfig.DEFAULT_AREA_RADIUS_KM)
+            elif geometry.get("type") in ("Polygon", "MultiPolygon"):
+                lat, lon, radius_km = self._enclosing_circle(geometry)
+            else:
+                raise ValueError(f"Invalid area GeoJSON {path}: unsupported geometry for {name}")
+
+            key = properties.get("key") or feature.get("id") or area_key(name)
+            for column, value in zip(columns, (
+                str(key), name, float(lat), float(lon), float(radius_km),
+                float(properties.get("risk_threshold", FLZConfig.DEFAULT_AREA_RISK_THRESHOLD))
+            )):
+                column.append(value)
+        return self._add_columns(*columns)
+
+    def get_area(self, area_key: str) -> MonitoredArea:
+        if area_key not in self._positions:
+            raise ValueError(f"Area {area_key} not found")
+        return self._detail(area_key)
+
+    def indices(self, area_keys: Iterable[str]) -> np.ndarray:
+        """Column positions of the given areas"""
+        try:
+            return np.array([self._positions[key] for key in area_keys], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Area {e.args[0]} not found")
+
+    def area_configs(self, area_keys: Optional[Iterable[str]] = None) -> Dict[str, AreaConfig]:
+        """AreaConfig per key, e.g. as input for the raster processor"""
+        if area_keys is None:
+            area_keys = self.keys
+        return {key: self._detail(key).config for key in area_keys}
+
+    def areas_in_bounds(self, south: float, west: float, north: float, east: float) -> List[str]:
+        """Keys of areas whose bounding box intersects the given box, e.g. a raster tile"""
+        hits = self._intersecting(south, west, north, east)
+        return [self.keys[i] for i in hits]
+
+    def areas_near(self, coords: Tuple[float, float], distance_km: float) -> List[str]:
+        """Keys of areas whose circle comes within distance_km of a point, nearest first"""
+        lat, lon = coords
+        radius_lat = distance_km / KM_PER_DEGREE_LAT
+        radius_lon = distance_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        candidates = self._intersecting(lat - radius_lat, lon - radius_lon,
+                                        lat + radius_lat, lon + radius_lon)
+
+        gaps = haversine_km(lat, lon, self._latitude[candidates],
+                                  self._longitude[candidates]) - self._radius_km[candidates]
+        close = gaps <= distance_km
+        order = np.argsort(gaps[close], kind="stable")
+        return [self.keys[i] for i in candidates[close][order]]
+
+    def get_mock_satellite_data(self, area_key: str) -> Dict:
+        """Random surface temperature (°C) and NDVI rasters standing in for Sentinel data"""
+        if area_key not in self._positions:
+            raise ValueError(f"Area {area_key} not found")
+        shape = (MOCK_RASTER_SIZE, MOCK_RASTER_SIZE)
+        return {
+            "surface_temp": np.random.uniform(15, 45, shape),
+            "ndvi": np.random.uniform(0.1, 0.8, shape)
+        }
+
+    def _add_columns(self, keys: List[str], names: List[str], latitudes, longitudes,
+                     radii_km, risk_thresholds) -> int:
+        count = len(keys)
+        if not count:
+            return 0
+        # Keys are looked up case-insensitively elsewhere, so store them normalized
+        keys = [area_key(str(key)) for key in keys]
+        if not all(keys):
+            raise ValueError("Area key must not be empty")
+        if len(set(keys)) < count:
+            duplicates = sorted(key for key, seen in Counter(keys).items() if seen > 1)
+            raise ValueError(f"Duplicate area keys: {', '.join(duplicates)}")
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        radii_km = np.asarray(radii_km, dtype=float)
+        if (np.abs(latitudes) > 90).any() or (np.abs(longitudes) > 180).any() or (radii_km <= 0).any():
+            raise ValueError("Area coordinates out of range or non-positive radius")
+
+        # Existing keys are updated in place, new keys appended
+        positions = np.empty(count, dtype=np.int64)
+        for i, key in enumerate(keys):
+            position = self._positions.get(key)
+            if position is None:
+                position = len(self.keys)
+                self._positions[key] = position
+                self.keys.append(key)
+                self.names.append(names[i])
+            else:
+                self.names[position] = names[i]
+                self._details.pop(key, None)
+            positions[i] = position
+
+        self._reserve(len(self.keys))
+        self._latitude[positions] = latitudes
+        self._longitude[positions] = longitudes
+        self._radius_km[positions] = radii_km
+        self._risk_threshold[positions] = risk_thresholds
+        self._changed()
+        return count
+
+    def _reserve(self, size: int):
+        """Grow the columns geometrically so bulk and one-by-one adds stay amortized O(1)"""
+        capacity = len(self._latitude)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 16)
+        for name in ("_latitude", "_longitude", "_radius_km", "_risk_threshold"):
+            column = np.zeros(capacity)
+            old = getattr(self, name)
+            column[:len(old)] = old
+            setattr(self, name, column)
+
+    def _changed(self):
+        self._index_stale = True
+        self.version += 1
+
+    def _position(self, area_key: str) -> int:
+        position = self._positions.get(area_key)
+        if position is None:
+            raise ValueError(f"Area {area_key} not found")
+        return position
+
+    def _detail(self, area_key: str) -> MonitoredArea:
+        area = self._details.get(area_key)
+        if area is None:
+            position = self._positions[area_key]
+            area = MonitoredArea(
+                key=area_key,
+                name=self.names[position],
+                center_coords=(float(self._latitude[position]), float(self._longitude[position])),
+                radius_km=float(self._radius_km[position]),
+                risk_threshold=float(self._risk_threshold[position])
+            )
+            self._details[area_key] = area
+        return area
+
+    def _bounding_boxes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(south, west, north, east) of every area's circle"""
+        radius_lat = self.radii_km / KM_PER_DEGREE_LAT
+        radius_lon = self.radii_km / (KM_PER_DEGREE_LAT * np.maximum(np.cos(np.radians(self.latitudes)), 1e-6))
+        return (self.latitudes - radius_lat, self.longitudes - radius_lon,
+                self.latitudes + radius_lat, self.longitudes + radius_lon)
+
+    def _intersecting(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        if not self.keys:
+            return np.zeros(0, dtype=np.int64)
+        boxes = self._bounding_boxes()
+        if self._index_stale:
+            self._index.build(*boxes)
+            self._index_stale = False
+
+        candidates = self._index.candidates(south, west, north, east)
+        area_south, area_west, area_north, area_east = (box[candidates] for box in boxes)
+        hits = (area_south <= north) & (area_north >= south) & (area_west <= east) & (area_east >= west)
+        return candidates[hits]
+
+    @staticmethod
+    def _enclosing_circle(geometry: Dict) -> Tuple[float, float, float]:
+        polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        # Exterior rings only, without the closing vertex; holes do not extend the area
+        vertices = np.array([
+            point[:2] for polygon in polygons
+            for point in (polygon[0][:-1] if polygon[0][0] == polygon[0][-1] else polygon[0])
+        ], dtype=float)
+        lon, lat = vertices.mean(axis=0)
+        radius_km = haversine_km(lat, lon, vertices[:, 1], vertices[:, 0]).max()
+        return float(lat), float(lon), float(max(radius_km, 1e-3))
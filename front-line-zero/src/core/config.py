@@ -17,6 +17,8 @@ class FLZConfig:
     DATA_DIR = PROJECT_ROOT / "data"
     MOCK_DATA_DIR = DATA_DIR / "mock"
     PROCESSED_DATA_DIR = DATA_DIR / "processed"
+    TILE_CACHE_DIR = PROCESSED_DATA_DIR / "tile_cache"
+    STORE_DIR = DATA_DIR / "store"
 
     # System Configuration
     VERSION = "0.1.0"
@@ -26,6 +28,27 @@ class FLZConfig:
     API_VERSION = "v1"
     DEFAULT_API_PORT = 8000
     WEBSOCKET_PORT = 8001
+    WS_CLIENT_QUEUE_SIZE = 32  # messages queued per client before the policy applies
+    WS_SLOW_CONSUMER_POLICY = "drop_oldest"  # drop_oldest, coalesce_latest or disconnect
+    WS_SEND_TIMEOUT = 10  # seconds before a stalled client is dropped
+    ANALYSIS_WORKERS = 1  # threads running risk analysis off the event loop; RiskAnalyzer is not thread-safe
+    RISK_RESULT_FRESHNESS = 2.0  # seconds an area assessment is reused by concurrent requests
+    RISK_RESULT_CACHE_SIZE = 256  # fresh results kept for reuse, across areas and queries
+    RESPONSE_CACHE_SIZE = 256  # serialized response bodies kept per state version
+    API_MAX_PAGE_SIZE = 1000  # items per page of paginated endpoints
+    PROFILER_INTERVAL = 0.01  # seconds between stack samples while the profiler runs
+    COLD_START_BUDGET_SECONDS = 2.0  # import plus warm-up of a fresh API worker; autoscaling relies on it
+
+    # Event bus between API workers
+    EVENT_BUS = "memory"  # memory for a single worker, socket to share a broker between workers
+    EVENT_BUS_HOST = "127.0.0.1"
+    EVENT_BUS_PORT = 8765
+    EVENT_BUS_RECONNECT_DELAY = 1.0  # seconds between attempts to reach the broker
+    EVENT_BUS_REQUEST_TIMEOUT = 5.0  # seconds to wait for a lease reply
+    EVENT_BUS_MAX_FRAME_BYTES = 64 * 1024 * 1024  # largest message, e.g. a full state sync
+    EVENT_BUS_MAX_BUFFER_BYTES = 256 * 1024 * 1024  # unsent bytes before the broker drops a worker
+    LEADER_LEASE_SECONDS = 5.0  # a leader that stops renewing is replaced after this long
+    LEADER_REPLAY_MESSAGES = 1024  # recent inputs a follower keeps for a new leader to replay
     
     # Monitoring Areas
     MONITORED_AREAS = {
@@ -44,16 +67,30 @@ class FLZConfig:
             risk_threshold=0.7
         )
     }
+    DEFAULT_AREA_RADIUS_KM = 5.0  # used when an area file gives no radius
+    DEFAULT_AREA_RISK_THRESHOLD = 0.7
+    AREA_INDEX_CELL_DEG = 0.1  # grid cell size of the area bounding-box index
     
     # Sentinel Data Configuration
     SENTINEL_BANDS = ['B02', 'B03', 'B04', 'B08']  # RGB + NIR
     SENTINEL_RESOLUTION = 10  # meters
+    SURFACE_TEMP_BAND = "LST"  # land surface temperature raster (°C) stored with each tile
+    RASTER_WINDOW_SIZE = 1024  # pixels per side of a processing window
+    TILE_CACHE_MAX_BYTES = 20 * 1024 ** 3  # on-disk tile cache limit
     
     # Drone Configuration
     DRONE_MAX_FLIGHT_TIME_MINUTES = 30
     DRONE_SPEED_MS = 15  # meters per second
     DRONE_MIN_ALTITUDE = 30  # meters
     DRONE_MAX_ALTITUDE = 120  # meters
+    DRONE_INDEX_CELL_KM = 2.0  # grid cell size of the drone spatial index
+    DRONE_MAINTENANCE_INTERVAL_DAYS = 7  # drones are unavailable once maintenance is this old
+    MISSION_PLANNER_TIME_BUDGET = 0.05  # seconds per batch assignment
+    MISSION_ARCHIVE_SIZE = 10000  # completed missions kept in memory and restored on startup
+
+    # Telemetry Configuration
+    TELEMETRY_BUFFER_CAPACITY = 65536  # frames buffered between fleet updates
+    TELEMETRY_APPLY_INTERVAL = 1.0  # most seconds a frame waits before it is applied and published
     
     # Risk Assessment
     RISK_LEVELS = {
@@ -64,8 +101,18 @@ class FLZConfig:
     }
     
     # Alert Configuration
-    ALERT_REFRESH_RATE = 30  # seconds
+    EVENT_DEBOUNCE_SECONDS = 0.2  # quiet period before a burst of inputs is processed together
+    RISK_MAX_DELAY_SECONDS = 1.0  # most seconds from a new input to its re-assessment starting
     ALERT_HISTORY_DAYS = 7
+    RISK_HISTORY_CAPACITY = 2048  # max samples kept per area
+    RISK_HISTORY_WINDOW = 5  # samples averaged for the historical factor
+    RISK_WORKERS = 1  # processes for risk evaluation; 1 evaluates in-process, 0 uses all cores
+    RISK_PARALLEL_MIN_AREAS = 64  # smaller batches are always evaluated in-process
+
+    # Persistence
+    PERSISTENCE_ENABLED = True
+    STORE_FLUSH_INTERVAL = 1.0  # seconds between batched store writes
+    STORE_SNAPSHOT_INTERVAL = 3600  # seconds between risk history snapshots
     
     @classmethod
     def get_area_configs(cls) -> Dict[str, AreaConfig]:
@@ -90,7 +137,9 @@ class FLZConfig:
         """Load environment variables or use defaults"""
         cls.API_PORT = int(os.getenv('FLZ_API_PORT', cls.DEFAULT_API_PORT))
         cls.DEBUG_MODE = os.getenv('FLZ_DEBUG', 'False').lower() == 'true'
+        cls.RISK_WORKERS = int(os.getenv('FLZ_RISK_WORKERS', cls.RISK_WORKERS))
+        cls.PERSISTENCE_ENABLED = os.getenv('FLZ_PERSISTENCE', str(cls.PERSISTENCE_ENABLED)).lower() == 'true'
+        cls.EVENT_BUS = os.getenv('FLZ_EVENT_BUS', cls.EVENT_BUS)
+        cls.EVENT_BUS_HOST = os.getenv('FLZ_EVENT_BUS_HOST', cls.EVENT_BUS_HOST)
+        cls.EVENT_BUS_PORT = int(os.getenv('FLZ_EVENT_BUS_PORT', cls.EVENT_BUS_PORT))
         # Add more environment variables as needed
-
-# Initialize required directories when config is imported
-FLZConfig.create_required_directories()
\ No newline at end of file
@@ -0,0 +1,398 @@
+"""
+Publish/subscribe between API workers. One elected leader computes risk and
+fleet updates and publishes them; every worker, the leader included,
+receives them and relays them to its own WebSocket clients.
+
+InProcessEventBus serves a single worker. SocketEventBus connects workers
+through a broker process, a stand-in for Redis or NATS in deployments:
+
+    python -m src.core.event_bus --host 127.0.0.1 --port 8765
+"""
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from .config import FLZConfig
+from .metrics import REGISTRY
+
+Handler = Callable[[Dict], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+BUS_MESSAGES = REGISTRY.counter(
+    "flz_event_bus_messages_total", "Event bus messages by direction or outcome (published, received, dropped, failed)", ["direction"]
+)
+_PUBLISHED = BUS_MESSAGES.labels("published")
+_RECEIVED = BUS_MESSAGES.labels("received")
+_DROPPED = BUS_MESSAGES.labels("dropped")
+_FAILED = BUS_MESSAGES.labels("failed")
+
+def _encode(message: Dict) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+def _check_name(name: str):
+    if not name or any(char.isspace() for char in name):
+        raise ValueError(f"Invalid channel or lease name {name!r}")
+
+class _Leases:
+    """Named leases held by one holder until they expire or are released"""
+
+    def __init__(self):
+        self._leases: Dict[str, Tuple[str, float]] = {}  # name -> (holder, monotonic expiry)
+
+    def acquire(self, name: str, holder: str, ttl: float) -> bool:
+        """Take or renew a lease; fails while another holder's lease is unexpired"""
+        now = time.monotonic()
+        current = self._leases.get(name)
+        if current is not None and current[0] != holder and current[1] > now:
+            return False
+        self._leases[name] = (holder, now + ttl)
+        return True
+
+    def release(self, name: str, holder: str):
+        current = self._leases.get(name)
+        if current is not None and current[0] == holder:
+            del self._leases[name]
+
+class EventBus(ABC):
+    """Channels of JSON-serializable messages plus leases for leader election"""
+
+    shared = False  # Whether messages reach other processes, i.e. there may be another leader
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._connect_callbacks: List[Callable[[], Awaitable[None]]] = []
+
+    def subscribe(self, channel: str, handler: Handler):
+        _check_name(channel)
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_connect(self, callback: Callable[[], Awaitable[None]]):
+        """Run callback after every (re)connection, e.g. to request a state sync"""
+        self._connect_callbacks.append(callback)
+
+    @abstractmethod
+    async def start(self):
+        """Connect to the transport and run the on_connect callbacks"""
+
+    @abstractmethod
+    async def close(self):
+        """Disconnect; later publishes are dropped"""
+
+    @abstractmethod
+    async def publish(self, channel: str, message: Dict):
+        """Deliver message to every subscriber of channel, in every process on the bus"""
+
+    @abstractmethod
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        """Take or renew a named lease for ttl seconds; False while another holder has it"""
+
+    @abstractmethod
+    async def release_lease(self, name: str, holder: str):
+        """Give up a lease early, if holder has it"""
+
+    async def _deliver(self, channel: str, message: Dict):
+        _RECEIVED.inc()
+        for handler in self._handlers.get(channel, ()):
+            # One failing handler must not stop delivery to the others or of later messages
+            try:
+                await handler(message)
+            except Exception:
+                _FAILED.inc()
+                logger.exception("Event bus handler for %s failed", channel)
+
+    async def _connected(self):
+        for callback in self._connect_callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("Event bus connect callback failed")
+
+class InProcessEventBus(EventBus):
+    """Delivers messages to handlers in the same process; for a single worker"""
+
+    def __init__(self):
+        super().__init__()
+        self._leases = _Leases()
+
+    async def start(self):
+        await self._connected()
+
+    async def close(self):
+        pass
+
+    async def publish(self, channel: str, message: Dict):
+        _check_name(channel)
+        _PUBLISHED.inc()
+        await self._deliver(channel, message)
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        return self._leases.acquire(name, holder, ttl)
+
+    async def release_lease(self, name: str, holder: str):
+        self._leases.release(name, holder)
+
+# Frames are single lines "<op> <channel or lease name> <json>". The broker
+# forwards PUB lines verbatim, so it never decodes message payloads.
+_SUB, _PUB, _LEASE, _RELEASE, _REPLY = "SUB", "PUB", "LEASE", "RELEASE", "REPLY"
+
+class SocketEventBus(EventBus):
+    """
+    Client of a BusBroker over TCP. Reconnects with a fixed delay after the
+    broker goes away; messages published while disconnected are dropped, and
+    on_connect callbacks run again once the connection is back.
+    """
+
+    shared = True
+
+    def __init__(self, host: str = FLZConfig.EVENT_BUS_HOST, port: int = FLZConfig.EVENT_BUS_PORT,
+                 reconnect_delay: float = FLZConfig.EVENT_BUS_RECONNECT_DELAY):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    async def start(self):
+        """Connect, failing if the broker is unreachable, then keep the connection up"""
+        reader = await self._connect()
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+        await self._connected()
+
+    async def close(self):
+        self._closed = True
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        self._disconnected()
+
+    async def publish(self, channel: str, message: Dict):
+        _check_name(channel)
+        if self._writer is None:
+            _DROPPED.inc()
+            return
+        self._writer.write(f"{_PUB} {channel} {_encode(message)}\n".encode())
+        _PUBLISHED.inc()
+
+    async def acquire_lease(self, name: str, holder: str, ttl: float) -> bool:
+        return await self._request(_LEASE, name, {"holder": holder, "ttl": ttl})
+
+    async def release_lease(self, name: str, holder: str):
+        await self._request(_RELEASE, name, {"holder": holder})
+
+    async def _request(self, op: str, name: str, payload: Dict):
+        _check_name(name)
+        if self._writer is None:
+            raise ConnectionError("Event bus is not connected")
+        request_id = next(self._request_ids)
+        reply = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = reply
+        self._writer.write(f"{op} {name} {_encode({**payload, 'id': request_id})}\n".encode())
+        try:
+            return await asyncio.wait_for(reply, FLZConfig.EVENT_BUS_REQUEST_TIMEOUT)
+        finally:
+            self._replies.pop(request_id, None)
+
+    async def _connect(self) -> asyncio.StreamReader:
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, limit=FLZConfig.EVENT_BUS_MAX_FRAME_BYTES
+        )
+        for channel in self._handlers:
+            writer.write(f"{_SUB} {channel} {{}}\n".encode())
+        self._writer = writer
+        return reader
+
+    def _disconnected(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for reply in self._replies.values():
+            if not reply.done():
+                reply.set_exception(ConnectionError("Event bus connection lost"))
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                while True:
+                    # ValueError here is a frame over the size limit; resync on a new connection
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        op, name, payload = line.decode().split(" ", 2)
+                        message = json.loads(payload)
+                    except ValueError:
+                        _DROPPED.inc()
+                        logger.warning("Dropped malformed event bus frame")
+                        continue
+                    if op == _PUB:
+                        await self._deliver(name, message)
+                    elif op == _REPLY:
+                        future = self._replies.get(message.get("id"))
+                        if future is not None and not future.done():
+                            future.set_result(message.get("result"))
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                pass
+            self._disconnected()
+            # Reconnect until the broker is back
+            while not self._closed:
+                await asyncio.sleep(self.reconnect_delay)
+                try:
+                    reader = await self._connect()
+                except OSError:
+                    continue
+                await self._connected()
+                break
+
+class BusBroker:
+    """
+    Relays PUB frames to every connection subscribed to their channel and
+    grants leases. Connections whose unsent data exceeds max_buffer_bytes
+    are dropped rather than let one stalled worker grow the broker's memory.
+    """
+
+    def __init__(self, host: str = FLZConfig.EVENT_BUS_HOST, port: int = FLZConfig.EVENT_BUS_PORT,
+                 max_buffer_bytes: int = FLZConfig.EVENT_BUS_MAX_BUFFER_BYTES):
+        self.host = host
+        self.port = port
+        self.max_buffer_bytes = max_buffer_bytes
+        self.leases = _Leases()
+        self._subscribers: Dict[str, Set[asyncio.StreamWriter]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._serve, self.host, self.port, limit=FLZConfig.EVENT_BUS_MAX_FRAME_BYTES
+        )
+        # Port 0 picks a free port; report the one actually bound
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        channels: Set[str] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                op, name, payload = line.split(b" ", 2)
+                op, name = op.decode(), name.decode()
+                if op == _PUB:
+                    self._forward(name, line)
+                elif op == _SUB:
+                    channels.add(name)
+                    self._subscribers.setdefault(name, set()).add(writer)
+                elif op in (_LEASE, _RELEASE):
+                    request = json.loads(payload)
+                    if op == _LEASE:
+                        result = self.leases.acquire(name, request["holder"], request["ttl"])
+                    else:
+                        result = self.leases.release(name, request["holder"])
+                    writer.write(f"{_REPLY} {name} {_encode({'id': request['id'], 'result': result})}\n".encode())
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            for channel in channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(writer)
+                    if not subscribers:
+                        del self._subscribers[channel]
+            writer.close()
+
+    def _forward(self, channel: str, line: bytes):
+        for writer in list(self._subscribers.get(channel, ())):
+            if writer.transport.get_write_buffer_size() > self.max_buffer_bytes:
+                writer.transport.abort()  # The worker resyncs when it reconnects
+                continue
+            writer.write(line)
+
+class LeaderElection:
+    """
+    Keeps a lease on the bus for as long as this process holds it. Whichever
+    worker holds the lease is the leader; a leader that stops renewing is
+    replaced once its lease expires.
+    """
+
+    def __init__(self, bus: EventBus, name: str = "flz-leader",
+                 ttl: float = FLZConfig.LEADER_LEASE_SECONDS):
+        self.bus = bus
+        self.name = name
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.has_leader = False  # The last attempt found a lease held, by this worker or another
+        self._elected_callbacks: List[Callable[[], Awaitable[None]]] = []
+
+    def on_elected(self, callback: Callable[[], Awaitable[None]]):
+        """Run callback each time this process becomes the leader, e.g. to publish full state"""
+        self._elected_callbacks.append(callback)
+
+    async def run(self):
+        """Acquire or renew the lease every third of its lifetime until cancelled"""
+        try:
+            while True:
+                try:
+                    leader = await self.bus.acquire_lease(self.name, self.holder, self.ttl)
+                    self.has_leader = True
+                except (ConnectionError, asyncio.TimeoutError):
+                    leader = self.has_leader = False
+                elected = leader and not self.is_leader
+                self.is_leader = leader
+                if elected:
+                    for callback in self._elected_callbacks:
+                        await callback()
+                await asyncio.sleep(self.ttl / 3)
+        finally:
+            self.is_leader = self.has_leader = False
+
+    async def resign(self):
+        """Give up the lease so another worker takes over without waiting for expiry"""
+        self.is_leader = self.has_leader = False
+        try:
+            await self.bus.release_lease(self.name, self.holder)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+
+def create_event_bus(kind: Optional[str] = None) -> EventBus:
+    """The bus selected by FLZConfig.EVENT_BUS ("memory" or "socket")"""
+    kind = kind or FLZConfig.EVENT_BUS
+    if kind == "memory":
+        return InProcessEventBus()
+    if kind == "socket":
+        return SocketEventBus(FLZConfig.EVENT_BUS_HOST, FLZConfig.EVENT_BUS_PORT)
+    raise ValueError(f"Unknown event bus {kind!r}")
+
+async def serve_broker(host: str, port: int):
+    broker = BusBroker(host, port)
+    await broker.start()
+    print(f"Event bus broker listening on {broker.host}:{broker.port}")
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Event bus broker for multi-worker API deployments")
+    parser.add_argument("--host", default=FLZConfig.EVENT_BUS_HOST)
+    parser.add_argument("--port", type=int, default=FLZConfig.EVENT_BUS_PORT)
+    args = parser.parse_args()
+    asyncio.run(serve_broker(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
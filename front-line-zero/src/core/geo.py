@@ -0,0 +1,169 @@
+import math
+import numpy as np
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometers. Accepts scalars or broadcastable arrays."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2 +
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def haversine_matrix(coords_a: np.ndarray, coords_b: np.ndarray) -> np.ndarray:
+    """Distance matrix in kilometers between (N, 2) and (M, 2) arrays of (lat, lon)"""
+    coords_a = np.asarray(coords_a, dtype=float).reshape(-1, 2)
+    coords_b = np.asarray(coords_b, dtype=float).reshape(-1, 2)
+    return haversine_km(
+        coords_a[:, 0:1], coords_a[:, 1:2],
+        coords_b[None, :, 0], coords_b[None, :, 1]
+    )
+
+class GridIndex:
+    """
+    Uniform lat/lon grid over moving points for nearest-neighbour queries.
+    Points are re-bucketed only when they cross a cell boundary, and queries
+    search rings of cells outwards until no closer point can exist.
+    """
+
+    def __init__(self, cell_size_km: float = 2.0):
+        self.cell_size_km = cell_size_km
+        self.cell_deg = cell_size_km / KM_PER_DEGREE_LAT
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._points: Dict[Hashable, Tuple[float, float, Tuple[int, int]]] = {}
+        # Bounding box of cells ever occupied, used to stop ring searches
+        self._row_bounds = (0, -1)
+        self._col_bounds = (0, -1)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def insert(self, key: Hashable, coords: Tuple[float, float]):
+        """Add a point, or move it if it is already indexed"""
+        lat, lon = coords
+        cell = self._cell(lat, lon)
+        previous = self._points.get(key)
+        if previous is not None and previous[2] != cell:
+            self._remove_from_cell(key, previous[2])
+        if previous is None or previous[2] != cell:
+            self._cells.setdefault(cell, set()).add(key)
+            self._extend_bounds(cell)
+        self._points[key] = (lat, lon, cell)
+
+    move = insert
+
+    def remove(self, key: Hashable):
+        previous = self._points.pop(key, None)
+        if previous is not None:
+            self._remove_from_cell(key, previous[2])
+
+    def nearest(self, coords: Tuple[float, float],
+                max_distance_km: Optional[float] = None,
+                predicate: Optional[Callable[[Hashable, float], bool]] = None
+                ) -> Optional[Tuple[Hashable, float]]:
+        """
+        Closest point to coords as (key, distance_km), optionally within
+        max_distance_km and accepted by predicate(key, distance_km).
+        """
+        if not self._points:
+            return None
+
+        lat, lon = coords
+        center_row, center_col = self._cell(lat, lon)
+        max_ring = self._max_ring(center_row, center_col)
+        best: Optional[Tuple[Hashable, float]] = None
+
+        for ring in range(max_ring + 1):
+            # Points in this ring are at least this far from coords
+            if max_distance_km is not None and self._clearance_km(lat, ring - 1) > max_distance_km:
+                break
+
+            keys = self._ring_keys(center_row, center_col, ring)
+            if keys:
+                points = np.array([self._points[key][:2] for key in keys])
+                distances = haversine_km(lat, lon, points[:, 0], points[:, 1])
+                for index in np.argsort(distances, kind="stable"):
+                    distance = float(distances[index])
+                    if best is not None and distance >= best[1]:
+                        break
+                    if max_distance_km is not None and distance > max_distance_km:
+                        break
+                    if predicate is None or predicate(keys[index], distance):
+                        best = (keys[index], distance)
+                        break
+
+            # Nothing outside the searched rings can beat the best match
+            if best is not None and best[1] <= self._clearance_km(lat, ring):
+                break
+
+        return best
+
+    def within(self, coords: Tuple[float, float], radius_km: float) -> List[Tuple[Hashable, float]]:
+        """All points within radius_km of coords as (key, distance_km), closest first"""
+        lat, lon = coords
+        center_row, center_col = self._cell(lat, lon)
+        keys: List[Hashable] = []
+        for ring in range(self._max_ring(center_row, center_col) + 1):
+            if self._clearance_km(lat, ring - 1) > radius_km:
+                break
+            keys.extend(self._ring_keys(center_row, center_col, ring))
+        if not keys:
+            return []
+        points = np.array([self._points[key][:2] for key in keys])
+        distances = haversine_km(lat, lon, points[:, 0], points[:, 1])
+        order = np.argsort(distances, kind="stable")
+        return [(keys[i], float(distances[i])) for i in order if distances[i] <= radius_km]
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def _remove_from_cell(self, key: Hashable, cell: Tuple[int, int]):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self._cells[cell]
+
+    def _extend_bounds(self, cell: Tuple[int, int]):
+        row, col = cell
+        if self._row_bounds[0] > self._row_bounds[1]:
+            self._row_bounds = (row, row)
+            self._col_bounds = (col, col)
+            return
+        self._row_bounds = (min(self._row_bounds[0], row), max(self._row_bounds[1], row))
+        self._col_bounds = (min(self._col_bounds[0], col), max(self._col_bounds[1], col))
+
+    def _max_ring(self, row: int, col: int) -> int:
+        """Ring count that covers every occupied cell from (row, col)"""
+        return max(
+            abs(self._row_bounds[0] - row), abs(self._row_bounds[1] - row),
+            abs(self._col_bounds[0] - col), abs(self._col_bounds[1] - col)
+        )
+
+    def _clearance_km(self, lat: float, ring: int) -> float:
+        """Lower bound on the distance from a point to anything outside `ring` rings of its cell"""
+        if ring <= 0:
+            return 0.0
+        # Longitude cells are narrowest at the far edge of the searched rings
+        edge_lat = min(abs(lat) + (ring + 1) * self.cell_deg, 89.9)
+        return ring * self.cell_size_km * math.cos(math.radians(edge_lat))
+
+    def _ring_keys(self, row: int, col: int, ring: int) -> List[Hashable]:
+        """Keys in the square ring of cells at Chebyshev distance `ring`"""
+        if ring == 0:
+            return list(self._cells.get((row, col), ()))
+        keys: List[Hashable] = []
+        for d in range(-ring, ring + 1):
+            for cell in ((row - ring, col + d), (row + ring, col + d)):
+                keys.extend(self._cells.get(cell, ()))
+        for d in range(-ring + 1, ring):
+            for cell in ((row + d, col - ring), (row + d, col + ring)):
+                keys.extend(self._cells.get(cell, ()))
+        return keys
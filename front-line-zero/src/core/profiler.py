@@ -0,0 +1,80 @@
+from collections import Counter
+from typing import Dict, Optional
+import sys
+import threading
+import time
+
+class SamplingProfiler:
+    """
+    Statistical profiler that can be switched on and off in a running
+    process. A background thread samples the stack of every other thread at
+    a fixed interval and counts identical stacks; nothing is traced between
+    samples, so the cost is bounded by the sampling rate. Results are in the
+    collapsed-stack format read by flame graph tools.
+    """
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval: Optional[float] = None):
+        """Clear previous samples and start sampling"""
+        with self._lock:
+            if self._thread is not None:
+                raise ValueError("Profiler is already running")
+            if interval is not None:
+                self.interval = interval
+            self._stacks = Counter()
+            self.samples = 0
+            self.started_at = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="flz-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the collected stacks"""
+        with self._lock:
+            if self._thread is None:
+                raise ValueError("Profiler is not running")
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        """One "frame;frame;frame count" line per distinct stack, root first"""
+        stacks = dict(self._stacks)
+        return "".join(f"{stack} {count}\n" for stack, count in
+                       sorted(stacks.items(), key=lambda item: item[1], reverse=True))
+
+    def status(self) -> Dict:
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "samples": self.samples,
+            "started_at": self.started_at
+        }
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None and len(frames) < self.max_depth:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self._stacks[";".join(reversed(frames))] += 1
+            self.samples += 1
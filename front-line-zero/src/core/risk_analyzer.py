@@ -1,9 +1,41 @@
 from datetime import datetime, timedelta
+from time import perf_counter
 import numpy as np
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Set, Tuple, Optional
 from .config import FLZConfig
-from .area_manager import AreaManager, MonitoredArea
+from .area_manager import AreaManager
+from .metrics import REGISTRY
+from .risk_history import RiskHistory
+
+if TYPE_CHECKING:
+    from .store import StateStore
+
+# Factor weights used when combining risk factors into the total risk
+FACTOR_WEIGHTS = {
+    "temperature": 0.4,
+    "vegetation": 0.3,
+    "historical": 0.3
+}
+
+FACTOR_SOURCES = {
+    "temperature": "satellite",
+    "vegetation": "satellite",
+    "historical": "historical"
+}
+
+# Alert levels in ascending order of severity
+ALERT_LEVELS = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+ANALYSIS_STAGE_SECONDS = REGISTRY.histogram(
+    "flz_risk_analysis_stage_seconds", "Time spent in each stage of a risk analysis batch", ["stage"]
+)
+ANALYSIS_AREAS = REGISTRY.counter("flz_risk_areas_analyzed_total", "Area assessments computed")
+_STAGE_FETCH = ANALYSIS_STAGE_SECONDS.labels("satellite_fetch")
+_STAGE_STATISTICS = ANALYSIS_STAGE_SECONDS.labels("satellite_statistics")
+_STAGE_FACTORS = ANALYSIS_STAGE_SECONDS.labels("risk_factors")
+_STAGE_HISTORY = ANALYSIS_STAGE_SECONDS.labels("history_update")
+_STAGE_PERSIST = ANALYSIS_STAGE_SECONDS.labels("persist")
 
 @dataclass
 class RiskFactor:
@@ -22,146 +54,427 @@ class RiskAssessment:
     alert_level: str
     requires_drone_inspection: bool
     coordinates: Tuple[float, float]
+    area_key: Optional[str] = None  # Registry key; area_name is the display name
+
+@dataclass
+class BatchRiskAssessment:
+    """
+    Risk scores for many areas held as arrays. Per-area RiskAssessment
+    objects are only built when accessed.
+    """
+    area_keys: List[str]
+    area_names: List[str]
+    coordinates: List[Tuple[float, float]]
+    temperature_risk: np.ndarray
+    vegetation_risk: np.ndarray
+    historical_risk: np.ndarray
+    total_risk: np.ndarray
+    alert_index: np.ndarray
+    requires_inspection: np.ndarray
+    timestamp: datetime
+    _assessments: Dict[int, RiskAssessment] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def empty(cls) -> "BatchRiskAssessment":
+        return cls(
+            area_keys=[], area_names=[], coordinates=[],
+            temperature_risk=np.zeros(0), vegetation_risk=np.zeros(0), historical_risk=np.zeros(0),
+            total_risk=np.zeros(0), alert_index=np.zeros(0, dtype=int),
+            requires_inspection=np.zeros(0, dtype=bool), timestamp=datetime.now()
+        )
+
+    def __len__(self) -> int:
+        return len(self.area_keys)
+
+    def __iter__(self) -> Iterator[RiskAssessment]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> RiskAssessment:
+        if index < 0:
+            index += len(self)
+        assessment = self._assessments.get(index)
+        if assessment is None:
+            assessment = self._build_assessment(index)
+            self._assessments[index] = assessment
+        return assessment
+
+    def get(self, area_name: str) -> Optional[RiskAssessment]:
+        """Get the assessment for an area by its key, if it is part of the batch"""
+        try:
+            return self[self.area_keys.index(area_name.lower())]
+        except ValueError:
+            return None
+
+    @property
+    def alert_levels(self) -> List[str]:
+        return [ALERT_LEVELS[level] for level in self.alert_index]
+
+    def areas_above(self, threshold: float) -> List[Tuple[str, float]]:
+        """Get (area key, total risk) pairs at or above threshold, highest first"""
+        selected = np.flatnonzero(self.total_risk >= threshold)
+        ordered = selected[np.argsort(-self.total_risk[selected], kind="stable")]
+        return [(self.area_keys[i], float(self.total_risk[i])) for i in ordered]
+
+    def _build_assessment(self, index: int) -> RiskAssessment:
+        values = {
+            "temperature": self.temperature_risk[index],
+            "vegetation": self.vegetation_risk[index],
+            "historical": self.historical_risk[index]
+        }
+        risk_factors = [
+            RiskFactor(
+                name=name,
+                value=float(values[name]),
+                weight=weight,
+                timestamp=self.timestamp,
+                source=FACTOR_SOURCES[name]
+            )
+            for name, weight in FACTOR_WEIGHTS.items()
+        ]
+        return RiskAssessment(
+            area_name=self.area_names[index],
+            total_risk_level=float(self.total_risk[index]),
+            risk_factors=risk_factors,
+            timestamp=self.timestamp,
+            alert_level=ALERT_LEVELS[self.alert_index[index]],
+            requires_drone_inspection=bool(self.requires_inspection[index]),
+            coordinates=self.coordinates[index],
+            area_key=self.area_keys[index]
+        )
 
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None,
+                 store: Optional["StateStore"] = None):
+        # Read at construction, after the environment has been loaded, not at import
+        if workers is None:
+            workers = FLZConfig.RISK_WORKERS
         self.area_manager = AreaManager()
-        self.risk_history: Dict[str, List[RiskAssessment]] = {}
+        self.risk_history = RiskHistory()
+        # Assessments are persisted asynchronously; history survives restarts
+        self.store = store
+        if store is not None:
+            store.restore_history(self.risk_history)
         self.risk_thresholds = FLZConfig.RISK_LEVELS
-        
+        # Large batches of raw rasters are reduced in a process pool when enabled
+        self.worker_pool = None
+        if workers != 1:
+            # multiprocessing and shared memory are only imported when used
+            from .risk_pool import RiskWorkerPool
+            self.worker_pool = RiskWorkerPool(workers)
+
+        # Latest inputs per area and their versions. An area stays dirty from an
+        # input change until its next assessment.
+        self._satellite_inputs: Dict[str, Dict] = {}
+        self._input_versions: Dict[str, int] = {}
+        self._input_fingerprints: Dict[str, Any] = {}
+        self._latest: Dict[str, Tuple[BatchRiskAssessment, int]] = {}
+        self._high_risk: Dict[str, float] = {}
+        self._dirty: Set[str] = set(self.area_manager.areas.keys())
+        self._areas_version = self.area_manager.version
+
+        # Increases whenever assessments change; each area remembers the
+        # version of its latest assessment
+        self.state_version = 0
+        self._area_versions: Dict[str, int] = {}
+
+    def update_inputs(self, area_name: str, satellite_data: Optional[Dict] = None,
+                      fingerprint: Any = None) -> bool:
+        """
+        Register new input data for an area and mark it for re-assessment.
+        Called without satellite data when other inputs (e.g. drone imagery)
+        changed. Returns False if the fingerprint matches the current inputs.
+        """
+        area_key = area_name.lower()
+        if area_key not in self.area_manager.areas:
+            raise ValueError(f"Area {area_name} not found")
+        if fingerprint is not None and self._input_fingerprints.get(area_key) == fingerprint:
+            return False
+
+        if satellite_data is not None:
+            self._satellite_inputs[area_key] = satellite_data
+        self._input_fingerprints[area_key] = fingerprint
+        self._input_versions[area_key] = self._input_versions.get(area_key, 0) + 1
+        self._dirty.add(area_key)
+        return True
+
+    def get_input_version(self, area_name: str) -> int:
+        return self._input_versions.get(area_name.lower(), 0)
+
+    def get_dirty_areas(self) -> Set[str]:
+        """Areas whose inputs changed since they were last assessed"""
+        self._sync_areas()
+        return set(self._dirty)
+
+    def refresh(self, area_names: Optional[Iterable[str]] = None) -> BatchRiskAssessment:
+        """
+        Re-assess only the dirty areas (optionally limited to area_names).
+        Clean areas keep their cached assessment and get no new history entry.
+        """
+        self._sync_areas()
+        if area_names is None:
+            dirty = self._dirty
+        else:
+            dirty = {area_name.lower() for area_name in area_names} & self._dirty
+        return self.analyze_areas(sorted(dirty))
+
+    def get_assessment(self, area_name: str) -> RiskAssessment:
+        """Get the current assessment for an area, re-assessing only if it is dirty"""
+        area_key = area_name.lower()
+        if area_key in self._dirty or area_key not in self._latest:
+            return self.analyze_area(area_key)
+        batch, index = self._latest[area_key]
+        return batch[index]
+
+    def get_risk_table(self, area_names: Iterable[str]) -> Dict[str, Any]:
+        """
+        Current risk of many areas as columns (one list or array per field),
+        re-assessing only areas that are dirty or were never assessed
+        """
+        area_keys = [area_name.lower() for area_name in area_names]
+        indices = self.area_manager.indices(area_keys)
+        self._sync_areas()
+        stale = sorted({key for key in area_keys if key in self._dirty or key not in self._latest})
+        if stale:
+            self.analyze_areas(stale)
+
+        count = len(area_keys)
+        total_risk = np.empty(count)
+        alert_index = np.empty(count, dtype=int)
+        requires_inspection = np.empty(count, dtype=bool)
+        timestamps: List[str] = [""] * count
+
+        # Gather from each cached batch with one fancy index per batch
+        groups: Dict[int, Tuple[BatchRiskAssessment, List[int], List[int]]] = {}
+        for position, area_key in enumerate(area_keys):
+            batch, row = self._latest[area_key]
+            group = groups.setdefault(id(batch), (batch, [], []))
+            group[1].append(position)
+            group[2].append(row)
+        for batch, positions, rows in groups.values():
+            total_risk[positions] = batch.total_risk[rows]
+            alert_index[positions] = batch.alert_index[rows]
+            requires_inspection[positions] = batch.requires_inspection[rows]
+            timestamp = batch.timestamp.isoformat()
+            for position in positions:
+                timestamps[position] = timestamp
+
+        return {
+            "area": area_keys,
+            "name": [self.area_manager.names[i] for i in indices],
+            "risk_level": total_risk,
+            "alert_level": [ALERT_LEVELS[i] for i in alert_index],
+            "requires_inspection": requires_inspection,
+            "latitude": self.area_manager.latitudes[indices],
+            "longitude": self.area_manager.longitudes[indices],
+            "timestamp": timestamps
+        }
+
+    def get_versioned_assessment(self, area_name: str) -> Tuple[int, RiskAssessment]:
+        """Current assessment for an area together with its state version"""
+        assessment = self.get_assessment(area_name)
+        return self._area_versions[area_name.lower()], assessment
+
+    def get_state_version(self, area_name: Optional[str] = None) -> int:
+        """State version of all assessments, or of one area's latest assessment (0 if never assessed)"""
+        if area_name is None:
+            return self.state_version
+        return self._area_versions.get(area_name.lower(), 0)
+
     def analyze_area(self, area_name: str) -> RiskAssessment:
         """
         Analyze risk for a specific area using satellite and drone data
         """
-        area = self.area_manager.areas.get(area_name.lower())
-        if not area:
-            raise ValueError(f"Area {area_name} not found")
-            
+        return self.analyze_areas([area_name])[0]
+
+    def analyze_areas(self, area_names: Optional[Iterable[str]] = None) -> BatchRiskAssessment:
+        """
+        Analyze risk for many areas at once. Satellite arrays of all areas are
+        stacked so every factor is computed in a few array operations.
+        Defaults to all monitored areas.
+        """
+        if area_names is None:
+            area_names = self.area_manager.areas.keys()
+        area_keys = [area_name.lower() for area_name in area_names]
+        if not area_keys:
+            # Nothing changed: no new state version, history entries or store writes
+            return BatchRiskAssessment.empty()
+
+        indices = self.area_manager.indices(area_keys)
+
         # Get latest satellite data
-        satellite_data = self.area_manager.get_mock_satellite_data(area_name)
-        
+        started = perf_counter()
+        satellite_data = [self._get_satellite_data(area_key) for area_key in area_keys]
+        fetched = perf_counter()
+        _STAGE_FETCH.observe(fetched - started)
+        max_temp, avg_temp, avg_ndvi = self._satellite_statistics(satellite_data)
+        reduced = perf_counter()
+        _STAGE_STATISTICS.observe(reduced - fetched)
+
         # Calculate risk factors
-        risk_factors = [
-            self._calculate_temperature_risk(satellite_data),
-            self._calculate_vegetation_risk(satellite_data),
-            self._calculate_historical_risk(area_name)
-        ]
-        
-        # Calculate total risk
-        total_risk = self._calculate_total_risk(risk_factors)
-        
-        # Determine alert level
-        alert_level = self._determine_alert_level(total_risk)
-        
-        # Create risk assessment
-        assessment = RiskAssessment(
-            area_name=area.name,
-            total_risk_level=total_risk,
-            risk_factors=risk_factors,
-            timestamp=datetime.now(),
-            alert_level=alert_level,
-            requires_drone_inspection=total_risk > FLZConfig.MONITORED_AREAS[area_name.lower()].risk_threshold,
-            coordinates=area.center_coords
+        temperature_risk = self._calculate_temperature_risk(max_temp, avg_temp)
+        vegetation_risk = self._calculate_vegetation_risk(avg_ndvi)
+        historical_risk = self._calculate_historical_risk(area_keys)
+
+        # Calculate total risk and alert levels
+        total_risk = np.minimum(
+            temperature_risk * FACTOR_WEIGHTS["temperature"]
+            + vegetation_risk * FACTOR_WEIGHTS["vegetation"]
+            + historical_risk * FACTOR_WEIGHTS["historical"],
+            1.0
         )
-        
-        # Update history
-        self._update_risk_history(area_name, assessment)
-        
-        return assessment
-    
-    def _calculate_temperature_risk(self, satellite_data: Dict) -> RiskFactor:
+        inspection_thresholds = self.area_manager.risk_thresholds[indices]
+
+        batch = BatchRiskAssessment(
+            area_keys=area_keys,
+            area_names=[self.area_manager.names[i] for i in indices],
+            coordinates=list(zip(self.area_manager.latitudes[indices].tolist(),
+                                 self.area_manager.longitudes[indices].tolist())),
+            temperature_risk=temperature_risk,
+            vegetation_risk=vegetation_risk,
+            historical_risk=historical_risk,
+            total_risk=total_risk,
+            alert_index=self._determine_alert_levels(total_risk),
+            requires_inspection=total_risk > inspection_thresholds,
+            timestamp=datetime.now()
+        )
+        scored = perf_counter()
+        _STAGE_FACTORS.observe(scored - reduced)
+
+        # Update history and cached assessments
+        self.risk_history.append_many(area_keys, batch.timestamp, total_risk)
+        self._record_batch(batch)
+        recorded = perf_counter()
+        _STAGE_HISTORY.observe(recorded - scored)
+        if self.store is not None:
+            self.store.record_batch(batch)
+            _STAGE_PERSIST.observe(perf_counter() - recorded)
+        ANALYSIS_AREAS.inc(len(area_keys))
+
+        return batch
+
+    def _sync_areas(self):
+        """Mark areas added to the registry since the last sync dirty and forget removed ones"""
+        if self._areas_version == self.area_manager.version:
+            return
+        areas = self.area_manager.areas
+        for area_key in [key for key in self._latest if key not in areas]:
+            del self._latest[area_key]
+            del self._area_versions[area_key]
+            self._high_risk.pop(area_key, None)
+            self.state_version += 1
+        self._dirty = {key for key in self._dirty if key in areas}
+        self._dirty.update(key for key in areas if key not in self._latest)
+        self._areas_version = self.area_manager.version
+
+    def _get_satellite_data(self, area_key: str) -> Dict:
+        """Latest satellite inputs for an area, fetched on first use"""
+        satellite_data = self._satellite_inputs.get(area_key)
+        if satellite_data is None:
+            satellite_data = self.area_manager.get_mock_satellite_data(area_key)
+            self._satellite_inputs[area_key] = satellite_data
+            self._input_versions.setdefault(area_key, 1)
+        return satellite_data
+
+    def _record_batch(self, batch: BatchRiskAssessment):
+        """Cache a batch as the latest assessment of its areas and clear them from the dirty set"""
+        high_risk_threshold = self.risk_thresholds["HIGH"]
+        self.state_version += 1
+        for index, (area_key, total_risk) in enumerate(zip(batch.area_keys, batch.total_risk.tolist())):
+            self._latest[area_key] = (batch, index)
+            self._area_versions[area_key] = self.state_version
+            self._dirty.discard(area_key)
+            if total_risk >= high_risk_threshold:
+                self._high_risk[area_key] = total_risk
+            else:
+                self._high_risk.pop(area_key, None)
+
+    def _satellite_statistics(self, satellite_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Max/mean surface temperature and mean NDVI per area. Inputs are either
+        raw 'surface_temp'/'ndvi' arrays or statistics precomputed by the
+        raster processor ('surface_temp_max', 'surface_temp_mean', 'ndvi_mean').
+        """
+        max_temp = np.empty(len(satellite_data))
+        avg_temp = np.empty(len(satellite_data))
+        avg_ndvi = np.empty(len(satellite_data))
+
+        raw, precomputed = [], []
+        for index, data in enumerate(satellite_data):
+            (precomputed if 'surface_temp_max' in data else raw).append(index)
+
+        if precomputed:
+            max_temp[precomputed] = [satellite_data[i]['surface_temp_max'] for i in precomputed]
+            avg_temp[precomputed] = [satellite_data[i]['surface_temp_mean'] for i in precomputed]
+            avg_ndvi[precomputed] = [satellite_data[i]['ndvi_mean'] for i in precomputed]
+        if raw:
+            temperatures = [satellite_data[i]['surface_temp'] for i in raw]
+            ndvis = [satellite_data[i]['ndvi'] for i in raw]
+            if self.worker_pool is not None and len(raw) >= FLZConfig.RISK_PARALLEL_MIN_AREAS:
+                max_temp[raw], avg_temp[raw], avg_ndvi[raw] = \
+                    self.worker_pool.satellite_statistics(temperatures, ndvis)
+            else:
+                max_temp[raw], avg_temp[raw] = self._reduce_stacked(temperatures)
+                _, avg_ndvi[raw] = self._reduce_stacked(ndvis, with_max=False)
+
+        return max_temp, avg_temp, avg_ndvi
+
+    def _reduce_stacked(self, arrays: List[np.ndarray],
+                        with_max: bool = True) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """Per-array max and mean, stacking arrays of equal shape into one pass"""
+        maxima = np.empty(len(arrays)) if with_max else None
+        means = np.empty(len(arrays))
+
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for index, array in enumerate(arrays):
+            groups.setdefault(np.shape(array), []).append(index)
+
+        for indices in groups.values():
+            stacked = np.stack([arrays[i] for i in indices]).reshape(len(indices), -1)
+            means[indices] = stacked.mean(axis=1)
+            if with_max:
+                maxima[indices] = stacked.max(axis=1)
+
+        return maxima, means
+
+    def _calculate_temperature_risk(self, max_temp: np.ndarray,
+                                    avg_temp: np.ndarray) -> np.ndarray:
         """Calculate risk based on surface temperature"""
-        temp_data = satellite_data['surface_temp']
-        max_temp = np.max(temp_data)
-        avg_temp = np.mean(temp_data)
-        
         # Higher weight for maximum temperature
         max_temp_risk = (max_temp - 15) / (50 - 15)  # Normalize between 15°C and 50°C
         avg_temp_risk = (avg_temp - 15) / (50 - 15)
-        
-        temp_risk = (max_temp_risk * 0.7 + avg_temp_risk * 0.3)
-        
-        return RiskFactor(
-            name="temperature",
-            value=float(temp_risk),
-            weight=0.4,
-            timestamp=datetime.now(),
-            source="satellite"
-        )
-    
-    def _calculate_vegetation_risk(self, satellite_data: Dict) -> RiskFactor:
+
+        return max_temp_risk * 0.7 + avg_temp_risk * 0.3
+
+    def _calculate_vegetation_risk(self, avg_ndvi: np.ndarray) -> np.ndarray:
         """Calculate risk based on vegetation health (NDVI)"""
-        ndvi_data = satellite_data['ndvi']
-        avg_ndvi = np.mean(ndvi_data)
-        
         # Lower NDVI means higher risk (drier vegetation)
-        vegetation_risk = 1 - avg_ndvi
-        
-        return RiskFactor(
-            name="vegetation",
-            value=float(vegetation_risk),
-            weight=0.3,
-            timestamp=datetime.now(),
-            source="satellite"
-        )
-    
-    def _calculate_historical_risk(self, area_name: str) -> RiskFactor:
+        return 1 - avg_ndvi
+
+    def _calculate_historical_risk(self, area_keys: List[str]) -> np.ndarray:
         """Calculate risk based on historical data"""
-        if area_name not in self.risk_history:
-            historical_risk = 0.0
-        else:
-            recent_assessments = [
-                assessment.total_risk_level 
-                for assessment in self.risk_history[area_name][-5:]  # Last 5 assessments
-            ]
-            historical_risk = np.mean(recent_assessments) if recent_assessments else 0.0
-        
-        return RiskFactor(
-            name="historical",
-            value=float(historical_risk),
-            weight=0.3,
-            timestamp=datetime.now(),
-            source="historical"
-        )
-    
-    def _calculate_total_risk(self, risk_factors: List[RiskFactor]) -> float:
-        """Calculate total risk level from all factors"""
-        weighted_risks = [
-            factor.value * factor.weight 
-            for factor in risk_factors
-        ]
-        return min(sum(weighted_risks), 1.0)
-    
-    def _determine_alert_level(self, risk_level: float) -> str:
-        """Determine alert level based on risk level"""
-        if risk_level >= self.risk_thresholds["CRITICAL"]:
-            return "CRITICAL"
-        elif risk_level >= self.risk_thresholds["HIGH"]:
-            return "HIGH"
-        elif risk_level >= self.risk_thresholds["MEDIUM"]:
-            return "MEDIUM"
-        else:
-            return "LOW"
-    
-    def _update_risk_history(self, area_name: str, assessment: RiskAssessment):
-        """Update risk history for an area"""
-        if area_name not in self.risk_history:
-            self.risk_history[area_name] = []
-            
-        self.risk_history[area_name].append(assessment)
-        
-        # Keep only last 7 days of assessments
-        cutoff_date = datetime.now() - timedelta(days=FLZConfig.ALERT_HISTORY_DAYS)
-        self.risk_history[area_name] = [
-            assessment for assessment in self.risk_history[area_name]
-            if assessment.timestamp > cutoff_date
-        ]
-    
+        return self.risk_history.recent_means(area_keys)
+
+    def _determine_alert_levels(self, risk_levels: np.ndarray) -> np.ndarray:
+        """Determine alert level indices (into ALERT_LEVELS) for risk levels"""
+        thresholds = [self.risk_thresholds[level] for level in ALERT_LEVELS[1:]]
+        return np.digitize(risk_levels, thresholds)
+
+    def snapshot(self):
+        """
+        Persist a snapshot of the risk history so restarts need not replay
+        every assessment, and prune stored records the history no longer keeps
+        """
+        if self.store is not None:
+            self.store.write_snapshot(self.risk_history.export())
+            self.store.prune(datetime.now() - timedelta(seconds=self.risk_history.retention_seconds))
+
+    def close(self):
+        """Shut down the worker pool, if any"""
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+
     def get_high_risk_areas(self) -> List[Tuple[str, float]]:
         """Get list of areas with risk level above HIGH threshold"""
-        high_risk_areas = []
-        for area_name in self.area_manager.areas.keys():
-            assessment = self.analyze_area(area_name)
-            if assessment.total_risk_level >= self.risk_thresholds["HIGH"]:
-                high_risk_areas.append((area_name, assessment.total_risk_level))
-        return sorted(high_risk_areas, key=lambda x: x[1], reverse=True)
\ No newline at end of file
+        self.refresh()
+        return sorted(self._high_risk.items(), key=lambda x: x[1], reverse=True)
@@ -0,0 +1,180 @@
+from datetime import datetime
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from .config import FLZConfig
+
+class RiskHistoryBuffer:
+    """
+    Fixed-capacity ring buffer of (timestamp, total_risk) samples for one area.
+    Samples older than the retention period are evicted on append, and the
+    sums behind the rolling means are maintained incrementally.
+    """
+    __slots__ = (
+        "capacity", "retention_seconds", "window",
+        "_timestamps", "_risks", "_head", "_size",
+        "_total_sum", "_window_sum"
+    )
+
+    def __init__(self, capacity: int, retention_seconds: float, window: int):
+        self.capacity = capacity
+        self.retention_seconds = retention_seconds
+        self.window = min(window, capacity)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._risks = np.zeros(capacity, dtype=np.float32)
+        self._head = 0  # Next write position
+        self._size = 0
+        self._total_sum = 0.0
+        self._window_sum = 0.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, total_risk: float):
+        """Add a sample, evicting expired samples and the oldest one when full"""
+        self.evict_before(timestamp - self.retention_seconds)
+        if self._size == self.capacity:
+            self._evict_oldest()
+
+        self._timestamps[self._head] = timestamp
+        self._risks[self._head] = total_risk
+        stored_risk = float(self._risks[self._head])
+        self._head = (self._head + 1) % self.capacity
+        self._size += 1
+
+        self._total_sum += stored_risk
+        self._window_sum += stored_risk
+        if self._size > self.window:
+            # The sample that just left the rolling window
+            self._window_sum -= float(self._risks[self._offset(self.window)])
+
+        if self._head == 0:
+            # Re-anchor the running sums once per lap to bound float drift
+            self._resync_sums()
+
+    def evict_before(self, cutoff: float):
+        """Drop samples with a timestamp at or before cutoff"""
+        while self._size and self._timestamps[self._offset(self._size - 1)] <= cutoff:
+            self._evict_oldest()
+
+    @property
+    def recent_mean(self) -> float:
+        """Mean total risk of the last `window` samples"""
+        count = min(self._size, self.window)
+        return self._window_sum / count if count else 0.0
+
+    @property
+    def mean(self) -> float:
+        """Mean total risk over all retained samples"""
+        return self._total_sum / self._size if self._size else 0.0
+
+    @property
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self._size:
+            return None
+        position = self._offset(0)
+        return float(self._timestamps[position]), float(self._risks[position])
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained (timestamps, total risks) in chronological order"""
+        positions = (self._head - self._size + np.arange(self._size)) % self.capacity
+        return self._timestamps[positions], self._risks[positions]
+
+    def load(self, timestamps: np.ndarray, risks: np.ndarray):
+        """Replace the contents with chronologically ordered samples, keeping the newest that fit"""
+        timestamps = timestamps[-self.capacity:]
+        risks = risks[-self.capacity:]
+        count = len(timestamps)
+        self._timestamps[:count] = timestamps
+        self._risks[:count] = risks
+        self._head = count % self.capacity
+        self._size = count
+        self._resync_sums()
+
+    def _offset(self, age: int) -> int:
+        """Buffer position of the sample `age` steps back from the newest"""
+        return (self._head - 1 - age) % self.capacity
+
+    def _evict_oldest(self):
+        risk = float(self._risks[self._offset(self._size - 1)])
+        self._total_sum -= risk
+        if self._size <= self.window:
+            self._window_sum -= risk
+        self._size -= 1
+
+    def _resync_sums(self):
+        _, risks = self.to_arrays()
+        self._total_sum = float(risks.sum(dtype=np.float64))
+        self._window_sum = float(risks[-self.window:].sum(dtype=np.float64))
+
+class RiskHistory:
+    """Per-area risk history store backed by RiskHistoryBuffer"""
+
+    def __init__(self, capacity: int = FLZConfig.RISK_HISTORY_CAPACITY,
+                 retention_days: float = FLZConfig.ALERT_HISTORY_DAYS,
+                 window: int = FLZConfig.RISK_HISTORY_WINDOW):
+        self.capacity = capacity
+        self.retention_seconds = retention_days * 24 * 3600
+        self.window = window
+        self._buffers: Dict[str, RiskHistoryBuffer] = {}
+
+    def __contains__(self, area_name: str) -> bool:
+        return area_name in self._buffers
+
+    def __getitem__(self, area_name: str) -> RiskHistoryBuffer:
+        return self._buffers[area_name]
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def get(self, area_name: str) -> Optional[RiskHistoryBuffer]:
+        return self._buffers.get(area_name)
+
+    def keys(self):
+        return self._buffers.keys()
+
+    def append(self, area_name: str, timestamp: datetime, total_risk: float):
+        """Record an assessment result for an area"""
+        self._buffer(area_name).append(timestamp.timestamp(), total_risk)
+
+    def append_many(self, area_names: Iterable[str], timestamp: datetime,
+                    total_risks: np.ndarray):
+        """Record one assessment result per area, all taken at the same time"""
+        epoch = timestamp.timestamp()
+        for area_name, total_risk in zip(area_names, total_risks.tolist()):
+            self._buffer(area_name).append(epoch, total_risk)
+
+    def export(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        All buffers as flat arrays: (area names, offsets, timestamps, risks),
+        where the samples of area i are [offsets[i], offsets[i + 1])
+        """
+        area_names = list(self._buffers)
+        columns = [self._buffers[area_name].to_arrays() for area_name in area_names]
+        sizes = [len(timestamps) for timestamps, _ in columns]
+        offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+        if not columns:
+            return area_names, offsets, np.zeros(0), np.zeros(0, dtype=np.float32)
+        return (area_names, offsets,
+                np.concatenate([timestamps for timestamps, _ in columns]),
+                np.concatenate([risks for _, risks in columns]))
+
+    def restore(self, area_names: List[str], offsets: np.ndarray,
+                timestamps: np.ndarray, risks: np.ndarray):
+        """Load buffers from the output of export()"""
+        for index, area_name in enumerate(area_names):
+            start, end = offsets[index], offsets[index + 1]
+            self._buffer(area_name).load(timestamps[start:end], risks[start:end])
+
+    def recent_means(self, area_names: Iterable[str]) -> np.ndarray:
+        """Rolling mean of the most recent samples for each area (0 if no history)"""
+        return np.array([
+            self._buffers[area_name].recent_mean if area_name in self._buffers else 0.0
+            for area_name in area_names
+        ], dtype=float)
+
+    def _buffer(self, area_name: str) -> RiskHistoryBuffer:
+        buffer = self._buffers.get(area_name)
+        if buffer is None:
+            buffer = RiskHistoryBuffer(self.capacity, self.retention_seconds, self.window)
+            self._buffers[area_name] = buffer
+        return buffer
@@ -0,0 +1,146 @@
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import time
+from .config import FLZConfig
+from .metrics import REGISTRY
+from .risk_analyzer import BatchRiskAssessment, RiskAnalyzer
+
+# Pending events: key -> (arrival time, latest payload)
+Pending = Dict[Hashable, Tuple[float, Any]]
+
+EVENT_LATENCY_SECONDS = REGISTRY.histogram(
+    "flz_event_latency_seconds", "Time from an event arriving to its batch having been handled", ["queue"]
+)
+EVENTS = REGISTRY.counter(
+    "flz_events_total", "Events by queue and outcome (received, coalesced, failed)", ["queue", "outcome"]
+)
+ALERT_LEVEL_CHANGES = REGISTRY.counter(
+    "flz_alert_level_changes_total", "Re-assessments that moved an area to a new alert level", ["alert_level"]
+)
+
+class CoalescingQueue:
+    """
+    Collects keyed events and hands them to `handler` in batches. An event
+    for a key that is already pending replaces its payload but keeps its
+    arrival time. A batch runs once no event has arrived for `debounce`
+    seconds, and no later than `max_delay` after its oldest event, so a
+    steady stream of events cannot postpone it indefinitely.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Pending], Awaitable[None]],
+                 debounce: float = FLZConfig.EVENT_DEBOUNCE_SECONDS,
+                 max_delay: float = FLZConfig.RISK_MAX_DELAY_SECONDS):
+        self.name = name
+        self.handler = handler
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.batches = 0
+        self._pending: Pending = {}
+        self._oldest = 0.0      # Arrival of the oldest pending event
+        self._last_event = 0.0  # When the newest pending event was put
+        self._wake = asyncio.Event()
+        self._latency = EVENT_LATENCY_SECONDS.labels(name)
+        self._received = EVENTS.labels(name, "received")
+        self._coalesced = EVENTS.labels(name, "coalesced")
+        self._failed = EVENTS.labels(name, "failed")
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, key: Hashable, payload: Any = None, arrived: Optional[float] = None):
+        """Queue an event; arrived is its wall-clock time at the edge, e.g. when a request came in"""
+        now = time.time()
+        arrived = now if arrived is None else arrived
+        self._received.inc()
+        previous = self._pending.get(key)
+        if previous is not None:
+            self._coalesced.inc()
+            arrived = min(arrived, previous[0])
+        elif not self._pending:
+            self._oldest = arrived
+        self._pending[key] = (arrived, payload)
+        self._oldest = min(self._oldest, arrived)
+        self._last_event = now
+        self._wake.set()
+
+    async def run(self):
+        """Handle batches as they become due, until cancelled"""
+        while True:
+            await self._wake.wait()
+            delay = self._due() - time.time()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._due() - time.time()
+            self._wake.clear()
+            pending, self._pending = self._pending, {}
+            try:
+                await self.handler(pending)
+            except Exception:
+                # A failed batch must not stop later events from being handled
+                self._failed.inc(len(pending))
+                continue
+            self.batches += 1
+            handled = time.time()
+            for arrived, _ in pending.values():
+                self._latency.observe(handled - arrived)
+
+    def _due(self) -> float:
+        return min(self._last_event + self.debounce, self._oldest + self.max_delay)
+
+class RiskPipeline:
+    """
+    Push-based re-assessment. New inputs for an area are queued, bursts are
+    coalesced so each area is scored once per batch with its latest inputs,
+    and each batch is published as soon as it is scored. Only the affected
+    areas are re-assessed; nothing runs while no inputs arrive.
+    """
+
+    def __init__(self, analyzer: Callable[[], RiskAnalyzer], executor: Executor,
+                 publish: Callable[[BatchRiskAssessment], Awaitable[None]],
+                 debounce: float = FLZConfig.EVENT_DEBOUNCE_SECONDS,
+                 max_delay: float = FLZConfig.RISK_MAX_DELAY_SECONDS):
+        self.analyzer = analyzer  # Called on the executor; RiskAnalyzer is built lazily and is not thread-safe
+        self.executor = executor
+        self.publish = publish
+        self.queue = CoalescingQueue("risk", self._process, debounce, max_delay)
+        self.rejected = 0  # Inputs for areas that are not monitored
+        self._alert_levels: Dict[str, str] = {}
+
+    def submit(self, area_key: str, satellite_data: Optional[Dict] = None,
+               fingerprint: Any = None, arrived: Optional[float] = None):
+        """
+        Queue new inputs for an area, in the form RiskAnalyzer.update_inputs
+        takes. Without satellite data the area is re-assessed with its
+        current inputs, e.g. after drone observations.
+        """
+        self.queue.put(area_key.lower(), (satellite_data, fingerprint), arrived)
+
+    async def run(self):
+        await self.queue.run()
+
+    async def _process(self, pending: Pending):
+        batch = await asyncio.get_running_loop().run_in_executor(
+            self.executor, self._assess, {key: payload for key, (_, payload) in pending.items()}
+        )
+        if batch is not None:
+            await self.publish(batch)
+
+    def _assess(self, inputs: Dict[str, Tuple[Optional[Dict], Any]]) -> Optional[BatchRiskAssessment]:
+        analyzer = self.analyzer()
+        changed = []
+        for area_key, (satellite_data, fingerprint) in inputs.items():
+            try:
+                if analyzer.update_inputs(area_key, satellite_data, fingerprint):
+                    changed.append(area_key)
+            except ValueError:
+                self.rejected += 1
+        if not changed:
+            return None  # Only re-delivered inputs
+        batch = analyzer.refresh(changed)
+        for area_key, alert_level in zip(batch.area_keys, batch.alert_levels):
+            previous = self._alert_levels.get(area_key)
+            if previous is not None and previous != alert_level:
+                ALERT_LEVEL_CHANGES.labels(alert_level).inc()
+            self._alert_levels[area_key] = alert_level
+        return batch
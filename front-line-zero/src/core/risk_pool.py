@@ -0,0 +1,105 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import List, Optional, Tuple
+import os
+import numpy as np
+from .config import FLZConfig
+
+def _segment_stats(values: np.ndarray, bounds: np.ndarray,
+                   with_max: bool) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """Max and mean of each segment [bounds[i], bounds[i + 1]) of values"""
+    segment = values[bounds[0]:bounds[-1]]
+    starts = bounds[:-1] - bounds[0]
+    means = np.add.reduceat(segment, starts, dtype=np.float64) / np.diff(bounds)
+    maxima = np.maximum.reduceat(segment, starts).astype(np.float64) if with_max else None
+    return maxima, means
+
+def _reduce_shard(shm_name: str, dtype: str, size: int, temp_bounds: np.ndarray,
+                  ndvi_bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Worker entry point: statistics of one contiguous shard of areas read from shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        values = np.ndarray((size,), dtype=dtype, buffer=shm.buf)
+        max_temp, avg_temp = _segment_stats(values, temp_bounds, with_max=True)
+        _, avg_ndvi = _segment_stats(values, ndvi_bounds, with_max=False)
+        del values  # Release the buffer before closing
+        return max_temp, avg_temp, avg_ndvi
+    finally:
+        shm.close()
+
+class RiskWorkerPool:
+    """
+    Reduces per-area satellite rasters in a process pool. Rasters are copied
+    once into a shared memory block; workers receive only segment offsets and
+    return three floats per area, so no raster is pickled. Areas are split into
+    contiguous shards and results are written back by position, so the output
+    does not depend on the number of workers or on completion order.
+    """
+
+    def __init__(self, workers: int = FLZConfig.RISK_WORKERS,
+                 shards_per_worker: int = 4):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.shards_per_worker = shards_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def satellite_statistics(self, temperatures: List[np.ndarray],
+                             ndvis: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Max/mean surface temperature and mean NDVI per area"""
+        count = len(temperatures)
+        temp_sizes = np.array([np.size(array) for array in temperatures], dtype=np.int64)
+        ndvi_sizes = np.array([np.size(array) for array in ndvis], dtype=np.int64)
+        if not (temp_sizes.all() and ndvi_sizes.all()):
+            raise ValueError("Satellite rasters must not be empty")
+
+        # Layout: all temperature rasters, then all NDVI rasters, flattened
+        temp_bounds = np.concatenate([[0], np.cumsum(temp_sizes)])
+        ndvi_bounds = temp_bounds[-1] + np.concatenate([[0], np.cumsum(ndvi_sizes)])
+        size = int(ndvi_bounds[-1])
+        dtype = np.result_type(*temperatures, *ndvis)
+
+        shm = shared_memory.SharedMemory(create=True, size=size * dtype.itemsize)
+        try:
+            values = np.ndarray((size,), dtype=dtype, buffer=shm.buf)
+            for array, start, end in zip(temperatures + ndvis,
+                                         np.concatenate([temp_bounds[:-1], ndvi_bounds[:-1]]),
+                                         np.concatenate([temp_bounds[1:], ndvi_bounds[1:]])):
+                values[start:end] = np.ravel(array)
+            del values
+
+            max_temp = np.empty(count)
+            avg_temp = np.empty(count)
+            avg_ndvi = np.empty(count)
+            shards = self._shards(temp_sizes + ndvi_sizes)
+            futures = [
+                self._pool().submit(
+                    _reduce_shard, shm.name, dtype.str, size,
+                    temp_bounds[begin:end + 1], ndvi_bounds[begin:end + 1]
+                )
+                for begin, end in shards
+            ]
+            for (begin, end), future in zip(shards, futures):
+                max_temp[begin:end], avg_temp[begin:end], avg_ndvi[begin:end] = future.result()
+            return max_temp, avg_temp, avg_ndvi
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the server's threads or event loop
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        return self._executor
+
+    def _shards(self, sizes: np.ndarray) -> List[Tuple[int, int]]:
+        """Contiguous (begin, end) area ranges of roughly equal pixel count"""
+        shard_count = min(len(sizes), self.workers * self.shards_per_worker)
+        cumulative = np.cumsum(sizes)
+        targets = cumulative[-1] * np.arange(1, shard_count) / shard_count
+        cuts = np.unique(np.searchsorted(cumulative, targets, side="right"))
+        edges = [0] + [int(cut) for cut in cuts if 0 < cut < len(sizes)] + [len(sizes)]
+        return list(zip(edges[:-1], edges[1:]))
@@ -0,0 +1,279 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+import numpy as np
+from .config import FLZConfig
+from .risk_history import RiskHistory
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    area TEXT NOT NULL,
+    ts REAL NOT NULL,
+    total_risk REAL NOT NULL,
+    temperature_risk REAL NOT NULL,
+    vegetation_risk REAL NOT NULL,
+    historical_risk REAL NOT NULL,
+    alert_index INTEGER NOT NULL,
+    PRIMARY KEY (area, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assessments_ts ON assessments (ts);
+
+CREATE TABLE IF NOT EXISTS mission_events (
+    ts REAL NOT NULL,
+    id TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mission_events_id ON mission_events (id, ts);
+
+CREATE TABLE IF NOT EXISTS missions (
+    id TEXT PRIMARY KEY,
+    start_time REAL NOT NULL,
+    completion_time REAL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS missions_start ON missions (start_time);
+CREATE INDEX IF NOT EXISTS missions_completion ON missions (completion_time);
+"""
+
+# Stops the writer thread once everything queued before it is written
+_STOP = object()
+
+class StateStore:
+    """
+    Embedded SQLite store for risk assessments and missions under
+    FLZConfig.STORE_DIR. Callers only enqueue records; a writer thread commits
+    them in batched transactions, so persisting adds no I/O to the scoring
+    path. Assessments are clustered by (area, time) for range queries.
+    Missions are kept both as an append-only event log and as a compacted
+    current-state table. Risk history is restored on startup from a periodic
+    snapshot plus the assessments written after it.
+    """
+
+    def __init__(self, root: Path = FLZConfig.STORE_DIR,
+                 flush_interval: float = FLZConfig.STORE_FLUSH_INTERVAL):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "flz.sqlite3"
+        self.snapshot_path = self.root / "history_snapshot.npz"
+        self.flush_interval = flush_interval
+        self.written = 0  # Rows committed by the writer
+        self.errors = 0   # Batches that failed to write
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._read_lock = threading.Lock()
+        self._reader = self._connect(check_same_thread=False)
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._wake = threading.Event()
+        self._writer = threading.Thread(target=self._run, name="flz-store-writer", daemon=True)
+        self._writer.start()
+
+    # Writes (non-blocking)
+
+    def record_batch(self, batch):
+        """Queue a BatchRiskAssessment for writing; its arrays are not modified afterwards"""
+        self._queue.put(("assessments", batch))
+
+    def record_mission(self, record: Dict[str, Any]):
+        """Queue the current state of a mission, as a JSON-serializable dict with id and start_time"""
+        self._queue.put(("mission", (time.time(), record)))
+
+    def write_snapshot(self, exported: Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]):
+        """Queue a risk history snapshot from RiskHistory.export()"""
+        self._queue.put(("snapshot", (time.time(), exported)))
+
+    def flush(self):
+        """Block until everything queued so far is written"""
+        self._wake.set()
+        self._queue.join()
+
+    def close(self):
+        self._queue.put((_STOP, None))
+        self._wake.set()
+        self._writer.join()
+        self._reader.close()
+
+    # Reads
+
+    def area_history(self, area_key: str, start: datetime,
+                     end: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Persisted assessments of an area in [start, end] as columns, oldest first"""
+        rows = self._query(
+            "SELECT ts, total_risk, temperature_risk, vegetation_risk, historical_risk, alert_index "
+            "FROM assessments WHERE area = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+            (area_key, start.timestamp(), (end or datetime.now()).timestamp())
+        )
+        table = np.array(rows, dtype=np.float64).reshape(-1, 6)
+        return {
+            "timestamp": table[:, 0],
+            "total_risk": table[:, 1],
+            "temperature_risk": table[:, 2],
+            "vegetation_risk": table[:, 3],
+            "historical_risk": table[:, 4],
+            "alert_index": table[:, 5].astype(int)
+        }
+
+    def missions(self, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Current state of missions started in [start, end] (default: all), oldest first"""
+        rows = self._query(
+            "SELECT record FROM missions WHERE start_time BETWEEN ? AND ? ORDER BY start_time",
+            (start.timestamp() if start else float("-inf"),
+             end.timestamp() if end else float("inf"))
+        )
+        return [json.loads(record) for record, in rows]
+
+    def recent_missions(self, completed: int = FLZConfig.MISSION_ARCHIVE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Current state of every active mission and of the newest `completed`
+        completed ones, completed first, each oldest first. This is what is
+        kept in memory on startup.
+        """
+        rows = self._query(
+            "SELECT record FROM (SELECT record, completion_time FROM missions "
+            "WHERE completion_time IS NOT NULL ORDER BY completion_time DESC LIMIT ?) "
+            "ORDER BY completion_time",
+            (completed,)
+        )
+        rows += self._query(
+            "SELECT record FROM missions WHERE completion_time IS NULL ORDER BY start_time", ()
+        )
+        return [json.loads(record) for record, in rows]
+
+    def mission_events(self, mission_id: str) -> List[Tuple[float, Dict[str, Any]]]:
+        """Every recorded state of a mission with the time it was recorded"""
+        rows = self._query(
+            "SELECT ts, record FROM mission_events WHERE id = ? ORDER BY ts", (mission_id,)
+        )
+        return [(ts, json.loads(record)) for ts, record in rows]
+
+    def restore_history(self, history: RiskHistory) -> int:
+        """Rebuild risk history from the latest snapshot and newer assessments. Returns samples replayed."""
+        snapshot_time = time.time() - history.retention_seconds
+        if self.snapshot_path.exists():
+            with np.load(self.snapshot_path) as snapshot:
+                history.restore(
+                    snapshot["areas"].tolist(), snapshot["offsets"],
+                    snapshot["timestamps"], snapshot["risks"]
+                )
+                snapshot_time = float(snapshot["taken_at"])
+
+        rows = self._query(
+            "SELECT area, ts, total_risk FROM assessments WHERE ts > ? ORDER BY ts",
+            (snapshot_time,)
+        )
+        for area_key, ts, total_risk in rows:
+            history.append(area_key, datetime.fromtimestamp(ts), total_risk)
+        return len(rows)
+
+    def prune(self, before: datetime):
+        """Queue deletion of assessments, mission events and missions completed before a time"""
+        self._queue.put(("prune", before.timestamp()))
+
+    # Writer thread
+
+    def _run(self):
+        conn = self._connect()
+        try:
+            while True:
+                items = [self._queue.get()]
+                while True:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    stop = self._write(conn, items)
+                except (sqlite3.Error, OSError):
+                    # Keep the writer alive; the failed batch is lost and counted
+                    self.errors += 1
+                    stop = any(kind is _STOP for kind, _ in items)
+                for _ in items:
+                    self._queue.task_done()
+                if stop:
+                    return
+                # Let records accumulate so each transaction covers many of them
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, items: List[Tuple[Any, Any]]) -> bool:
+        assessments, events, snapshots, prunes = [], [], [], []
+        stop = False
+        for kind, payload in items:
+            if kind is _STOP:
+                stop = True
+            elif kind == "assessments":
+                assessments.extend(self._assessment_rows(payload))
+            elif kind == "mission":
+                events.append(payload)
+            elif kind == "snapshot":
+                snapshots.append(payload)
+            elif kind == "prune":
+                prunes.append(payload)
+
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO assessments VALUES (?, ?, ?, ?, ?, ?, ?)", assessments)
+            conn.executemany(
+                "INSERT INTO mission_events VALUES (?, ?, ?)",
+                [(ts, record["id"], json.dumps(record)) for ts, record in events]
+            )
+            # Later states of a mission replace earlier ones in the compacted table
+            conn.executemany(
+                "INSERT OR REPLACE INTO missions VALUES (?, ?, ?, ?)",
+                [(record["id"], record["start_time"], record.get("completion_time"), json.dumps(record))
+                 for _, record in events]
+            )
+            for cutoff in prunes:
+                conn.execute("DELETE FROM assessments WHERE ts < ?", (cutoff,))
+                conn.execute("DELETE FROM mission_events WHERE ts < ?", (cutoff,))
+                conn.execute("DELETE FROM missions WHERE completion_time < ?", (cutoff,))
+        self.written += len(assessments) + len(events)
+
+        if snapshots:
+            # Only the newest snapshot matters
+            self._save_snapshot(*snapshots[-1])
+        return stop
+
+    @staticmethod
+    def _assessment_rows(batch) -> List[Tuple]:
+        count = len(batch.area_keys)
+        return list(zip(
+            batch.area_keys,
+            [batch.timestamp.timestamp()] * count,
+            batch.total_risk.tolist(),
+            batch.temperature_risk.tolist(),
+            batch.vegetation_risk.tolist(),
+            batch.historical_risk.tolist(),
+            batch.alert_index.tolist()
+        ))
+
+    def _save_snapshot(self, taken_at: float, exported):
+        area_names, offsets, timestamps, risks = exported
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f, areas=np.array(area_names, dtype=str), offsets=offsets,
+                timestamps=timestamps, risks=risks, taken_at=np.float64(taken_at)
+            )
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _query(self, sql: str, params: Tuple) -> List[Tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
+        # WAL lets readers query while the writer commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
@@ -1,4 +1,9 @@
 # front-line-zero/src/flz_drones/__init__.py
 from .eagle_nests_network import EagleNestsNetwork, DroneStatus, Mission, Drone
+from .fleet_manager import FleetStore, DroneView
+from .mission_planner import BatchMissionPlanner, MissionPlan, MissionAssignment
 
-__all__ = ['EagleNestsNetwork', 'DroneStatus', 'Mission', 'Drone']
\ No newline at end of file
+__all__ = [
+    'EagleNestsNetwork', 'DroneStatus', 'Mission', 'Drone', 'FleetStore', 'DroneView',
+    'BatchMissionPlanner', 'MissionPlan', 'MissionAssignment'
+]
\ No newline at end of file
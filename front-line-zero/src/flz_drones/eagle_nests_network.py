@@ -1,18 +1,17 @@
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-import numpy as np
-from .config import FLZConfig
-from .risk_analyzer import RiskAssessment
-
-class DroneStatus(Enum):
-    IDLE = "idle"
-    LAUNCHING = "launching"
-    ON_MISSION = "on_mission"
-    RETURNING = "returning"
-    CHARGING = "charging"
-    MAINTENANCE = "maintenance"
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from ..core.config import FLZConfig
+from ..core.metrics import REGISTRY
+from ..core.risk_analyzer import RiskAssessment
+from .fleet_manager import STATUS_CODES, Drone, DroneSpecs, DroneStatus, DroneView, FleetStore
+from ..core.geo import GridIndex, haversine_km
+from .mission_store import MissionStore
+
+if TYPE_CHECKING:
+    from ..core.store import StateStore
 
 class MissionPriority(Enum):
     LOW = 0
@@ -20,15 +19,6 @@ class MissionPriority(Enum):
     HIGH = 2
     CRITICAL = 3
 
-@dataclass
-class DroneSpecs:
-    model: str
-    max_flight_time: int  # minutes
-    max_range: float      # kilometers
-    cruise_speed: float   # meters/second
-    min_battery: int      # percentage
-    camera_types: List[str]
-    
 @dataclass
 class Mission:
     id: str
@@ -40,79 +30,94 @@ class Mission:
     status: str
     drone_id: Optional[str] = None
     completion_time: Optional[datetime] = None
+    required_cameras: List[str] = field(default_factory=list)
+    area_key: Optional[str] = None  # Registry key of target_area, for re-assessing it
     
-@dataclass
-class Drone:
-    id: str
-    name: str
-    specs: DroneSpecs
-    status: DroneStatus
-    battery_level: int
-    current_coords: Tuple[float, float]
-    home_nest: str
-    current_mission_id: Optional[str] = None
-    last_maintenance: datetime = datetime.now()
+FLEET_STATUS_SECONDS = REGISTRY.histogram(
+    "flz_fleet_status_seconds", "Time to build the fleet status of all drones and missions"
+)
+
+# Specs of the drone models in service
+DRONE_SPECS = {
+    "sentinel": DroneSpecs(
+        model="ENN-Sentinel-1",
+        max_flight_time=45,
+        max_range=10.0,
+        cruise_speed=15.0,
+        min_battery=20,
+        camera_types=["RGB", "Thermal", "Multispectral"]
+    ),
+    "scout": DroneSpecs(
+        model="ENN-Scout-1",
+        max_flight_time=30,
+        max_range=5.0,
+        cruise_speed=20.0,
+        min_battery=15,
+        camera_types=["RGB", "Thermal"]
+    )
+}
 
 class EagleNestsNetwork:
-    def __init__(self):
-        self.drones: Dict[str, Drone] = {}
-        self.missions: Dict[str, Mission] = {}
+    def __init__(self, store: Optional["StateStore"] = None, initialize_fleet: bool = True):
+        self.drones = FleetStore()
+        self.missions = MissionStore()
         self.nests: Dict[str, Tuple[float, float]] = {
             "fundao_nest": (40.1397, -7.5006),
             "castelo_novo_nest": (40.0789, -7.4947)
         }
-        self._initialize_fleet()
+        # Spatial index over current drone positions
+        self.drone_index = GridIndex(cell_size_km=FLZConfig.DRONE_INDEX_CELL_KM)
+        self._max_drone_range = 0.0
+        self.state_version = 0  # Increases whenever drones or missions change
+        self.store = store
+        if initialize_fleet:
+            self._initialize_fleet()
+        if store is not None:
+            self._restore_missions(store.recent_missions(self.missions.archive_size))
     
     def _initialize_fleet(self):
         """Initialize the drone fleet with predefined drones"""
-        drone_specs = {
-            "sentinel": DroneSpecs(
-                model="ENN-Sentinel-1",
-                max_flight_time=45,
-                max_range=10.0,
-                cruise_speed=15.0,
-                min_battery=20,
-                camera_types=["RGB", "Thermal", "Multispectral"]
-            ),
-            "scout": DroneSpecs(
-                model="ENN-Scout-1",
-                max_flight_time=30,
-                max_range=5.0,
-                cruise_speed=20.0,
-                min_battery=15,
-                camera_types=["RGB", "Thermal"]
-            )
-        }
-        
         # Initialize drones for each nest
         for nest_id, coords in self.nests.items():
             # Add a Sentinel drone
             sentinel_id = f"sentinel_{nest_id}"
-            self.drones[sentinel_id] = Drone(
+            self.add_drone(Drone(
                 id=sentinel_id,
                 name=f"Sentinel-{nest_id.split('_')[0].title()}",
-                specs=drone_specs["sentinel"],
+                specs=DRONE_SPECS["sentinel"],
                 status=DroneStatus.IDLE,
                 battery_level=100,
                 current_coords=coords,
                 home_nest=nest_id
-            )
+            ))
             
             # Add a Scout drone
             scout_id = f"scout_{nest_id}"
-            self.drones[scout_id] = Drone(
+            self.add_drone(Drone(
                 id=scout_id,
                 name=f"Scout-{nest_id.split('_')[0].title()}",
-                specs=drone_specs["scout"],
+                specs=DRONE_SPECS["scout"],
                 status=DroneStatus.IDLE,
                 battery_level=100,
                 current_coords=coords,
                 home_nest=nest_id
-            )
+            ))
     
-    def create_mission(self, risk_assessment: RiskAssessment) -> Optional[str]:
-        """Create a new mission based on risk assessment"""
-        mission_id = f"mission_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    def add_drone(self, drone: Drone) -> DroneView:
+        """Register a drone with the network and its spatial index"""
+        drone = self.drones.add(drone)
+        self.drone_index.insert(drone.id, drone.current_coords)
+        self._max_drone_range = max(self._max_drone_range, drone.specs.max_range)
+        self.state_version += 1
+        return drone
+
+    def create_mission(self, risk_assessment: RiskAssessment,
+                       assign_drone: bool = True) -> Optional[str]:
+        """
+        Create a new mission based on risk assessment. With assign_drone=False
+        the mission stays PENDING for a batch planner to assign.
+        """
+        mission_id = self.missions.new_id()
         
         # Determine mission priority based on risk level
         priority = MissionPriority.LOW
@@ -127,6 +132,7 @@ class EagleNestsNetwork:
         mission = Mission(
             id=mission_id,
             target_area=risk_assessment.area_name,
+            area_key=risk_assessment.area_key or risk_assessment.area_name.lower(),
             priority=priority,
             start_time=datetime.now(),
             estimated_duration=30,  # Default 30 minutes
@@ -134,47 +140,85 @@ class EagleNestsNetwork:
             status="PENDING"
         )
         
-        self.missions[mission_id] = mission
-        self._assign_drone_to_mission(mission)
+        self.missions.add(mission)
+        self.state_version += 1
+        if assign_drone:
+            self._assign_drone_to_mission(mission)
+        self._persist(mission)
         return mission_id
+
+    def get_pending_missions(self) -> List[Mission]:
+        return [
+            mission for mission in self.missions.query(statuses=["PENDING"])
+            if mission.drone_id is None
+        ]
+
+    def get_available_drones(self) -> List[DroneView]:
+        return self.drones.select(self.drones.available_mask())
+
+    def plan_pending_missions(self, planner):
+        """Assign all pending missions at once using a BatchMissionPlanner"""
+        plan = planner.plan(self.get_pending_missions(), self.get_available_drones())
+        self.apply_assignments(plan.assignments)
+        return plan
+
+    def apply_assignments(self, assignments: List):
+        """
+        Apply a batch of mission assignments atomically: every assignment is
+        validated first and nothing changes if any of them is no longer valid.
+        """
+        seen_drones = set()
+        seen_missions = set()
+        for assignment in assignments:
+            mission = self.missions.get(assignment.mission_id)
+            drone = self.drones.get(assignment.drone_id)
+            if mission is None or mission.status != "PENDING" or mission.drone_id is not None:
+                raise ValueError(f"Mission {assignment.mission_id} is not pending")
+            if drone is None or not self._is_drone_available(drone):
+                raise ValueError(f"Drone {assignment.drone_id} is not available")
+            if drone.id in seen_drones or mission.id in seen_missions:
+                raise ValueError("Assignments must use each drone and mission once")
+            seen_drones.add(drone.id)
+            seen_missions.add(mission.id)
+
+        for assignment in assignments:
+            mission = self.missions[assignment.mission_id]
+            self._launch(self.drones[assignment.drone_id], mission)
+            self._persist(mission)
     
     def _assign_drone_to_mission(self, mission: Mission):
-        """Assign the most suitable drone to a mission"""
-        best_drone = None
-        min_distance = float('inf')
-        
-        for drone in self.drones.values():
-            if self._is_drone_available(drone):
-                distance = self._calculate_distance(
-                    drone.current_coords, 
-                    mission.target_coords
-                )
-                if distance < min_distance:
-                    min_distance = distance
-                    best_drone = drone
-        
-        if best_drone:
-            best_drone.status = DroneStatus.LAUNCHING
-            best_drone.current_mission_id = mission.id
-            mission.drone_id = best_drone.id
-            mission.status = "LAUNCHING"
+        """Assign the closest available drone that has the mission in range"""
+        available = self.drones.available_mask()
+        max_range = self.drones.max_range
+
+        def can_fly(drone_id: str, distance: float) -> bool:
+            slot = self.drones.slot(drone_id)
+            return distance <= max_range[slot] and available[slot]
+
+        match = self.drone_index.nearest(
+            mission.target_coords,
+            max_distance_km=self._max_drone_range,
+            predicate=can_fly
+        )
+
+        if match:
+            self._launch(self.drones[match[0]], mission)
+
+    def _launch(self, drone: DroneView, mission: Mission):
+        drone.status = DroneStatus.LAUNCHING
+        drone.current_mission_id = mission.id
+        mission.drone_id = drone.id
+        self.missions.set_status(mission, "LAUNCHING")
+        self.state_version += 1
             
-    def _is_drone_available(self, drone: Drone) -> bool:
+    def _is_drone_available(self, drone: DroneView) -> bool:
         """Check if drone is available for mission"""
-        return (
-            drone.status == DroneStatus.IDLE and
-            drone.battery_level > drone.specs.min_battery and
-            (datetime.now() - drone.last_maintenance).days < 7
-        )
+        return self.drones.is_available(drone.id)
     
     def _calculate_distance(self, coord1: Tuple[float, float], 
                           coord2: Tuple[float, float]) -> float:
         """Calculate distance between two coordinates in kilometers"""
-        # Simple Euclidean distance for MVP
-        # TODO: Implement proper haversine formula
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
-        return np.sqrt((lat2-lat1)**2 + (lon2-lon1)**2) * 111  # rough km conversion
+        return float(haversine_km(coord1[0], coord1[1], coord2[0], coord2[1]))
     
     def update_drone_status(self, drone_id: str, 
                           new_status: DroneStatus, 
@@ -183,39 +227,100 @@ class EagleNestsNetwork:
         """Update drone status, battery, and position"""
         if drone_id in self.drones:
             drone = self.drones[drone_id]
+            if (drone.status, drone.battery_level, drone.current_coords) == \
+                    (new_status, battery_level, current_coords):
+                return  # Repeated telemetry; keep the state version
+            self.state_version += 1
             drone.status = new_status
             drone.battery_level = battery_level
             drone.current_coords = current_coords
+            self.drone_index.move(drone_id, current_coords)
             
             # Update mission status if applicable
             if drone.current_mission_id:
                 mission = self.missions[drone.current_mission_id]
                 if new_status == DroneStatus.RETURNING:
-                    mission.status = "COMPLETED"
-                    mission.completion_time = datetime.now()
+                    self.missions.complete(mission)
                     drone.current_mission_id = None
+                    self._persist(mission)
     
+    def _persist(self, mission: Mission):
+        """Queue the mission's current state for the store, if one is attached"""
+        if self.store is None:
+            return
+        self.store.record_mission({
+            "id": mission.id,
+            "target_area": mission.target_area,
+            "area_key": mission.area_key,
+            "priority": mission.priority.name,
+            "start_time": mission.start_time.timestamp(),
+            "estimated_duration": mission.estimated_duration,
+            "target_coords": list(mission.target_coords),
+            "status": mission.status,
+            "drone_id": mission.drone_id,
+            "completion_time": mission.completion_time.timestamp() if mission.completion_time else None,
+            "required_cameras": mission.required_cameras
+        })
+
+    def _restore_missions(self, records: List[Dict]):
+        """Reload persisted missions and re-link active ones to their drones"""
+        for record in records:
+            mission = Mission(
+                id=record["id"],
+                target_area=record["target_area"],
+                area_key=record.get("area_key") or record["target_area"].lower(),
+                priority=MissionPriority[record["priority"]],
+                start_time=datetime.fromtimestamp(record["start_time"]),
+                estimated_duration=record["estimated_duration"],
+                target_coords=tuple(record["target_coords"]),
+                status=record["status"],
+                drone_id=record["drone_id"],
+                completion_time=(datetime.fromtimestamp(record["completion_time"])
+                                 if record["completion_time"] is not None else None),
+                required_cameras=record["required_cameras"]
+            )
+            self.missions.add(mission)
+            drone = self.drones.get(mission.drone_id)
+            if mission.completion_time is None and drone is not None:
+                # The drone was out when the service stopped; telemetry corrects its state
+                drone.current_mission_id = mission.id
+                drone.status = DroneStatus.ON_MISSION
+        self.state_version += 1
+
     def get_fleet_status(self) -> Dict:
         """Get current status of all drones and missions"""
-        return {
-            "drones": {
-                drone_id: {
-                    "name": drone.name,
-                    "status": drone.status.value,
-                    "battery": drone.battery_level,
-                    "coords": drone.current_coords,
-                    "mission": drone.current_mission_id
-                }
-                for drone_id, drone in self.drones.items()
-            },
+        started = perf_counter()
+        status = {
+            "drones": self._drone_status(),
             "active_missions": {
                 mission_id: {
                     "area": mission.target_area,
                     "priority": mission.priority.value,
                     "status": mission.status,
-                    "drone": mission.drone_id
+                    "drone": mission.drone_id,
+                    "target_coords": mission.target_coords
                 }
-                for mission_id, mission in self.missions.items()
-                if mission.completion_time is None
+                for mission_id, mission in self.missions.active.items()
             }
-        }
\ No newline at end of file
+        }
+        FLEET_STATUS_SECONDS.observe(perf_counter() - started)
+        return status
+
+    def _drone_status(self) -> Dict:
+        """Per-drone status built from the fleet columns in one pass"""
+        fleet = self.drones
+        status_values = [status.value for status in STATUS_CODES]
+        return {
+            drone_id: {
+                "name": name,
+                "status": status_values[status],
+                "battery": battery,
+                "coords": (lat, lon),
+                "mission": mission,
+                "nest": fleet.nest_names[nest]
+            }
+            for drone_id, name, status, battery, lat, lon, mission, nest in zip(
+                fleet.ids, fleet.names, fleet.status.tolist(), fleet.battery.tolist(),
+                fleet.lat.tolist(), fleet.lon.tolist(), fleet.mission.tolist(), fleet.nest.tolist()
+            )
+        }
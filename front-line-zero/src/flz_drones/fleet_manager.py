@@ -0,0 +1,292 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import time
+import numpy as np
+from ..core.config import FLZConfig
+
+class DroneStatus(Enum):
+    IDLE = "idle"
+    LAUNCHING = "launching"
+    ON_MISSION = "on_mission"
+    RETURNING = "returning"
+    CHARGING = "charging"
+    MAINTENANCE = "maintenance"
+
+# Status column values: index into STATUS_CODES
+STATUS_CODES: List[DroneStatus] = list(DroneStatus)
+STATUS_INDEX = {status: index for index, status in enumerate(STATUS_CODES)}
+
+@dataclass
+class DroneSpecs:
+    model: str
+    max_flight_time: int  # minutes
+    max_range: float      # kilometers
+    cruise_speed: float   # meters/second
+    min_battery: int      # percentage
+    camera_types: List[str]
+
+@dataclass
+class Drone:
+    id: str
+    name: str
+    specs: DroneSpecs
+    status: DroneStatus
+    battery_level: int
+    current_coords: Tuple[float, float]
+    home_nest: str
+    current_mission_id: Optional[str] = None
+    last_maintenance: datetime = field(default_factory=datetime.now)
+
+class DroneView:
+    """
+    Attribute access to one drone in a FleetStore, with the same fields as
+    Drone. Reads and writes go straight to the store's columns.
+    """
+    __slots__ = ("_store", "_slot")
+
+    def __init__(self, store: "FleetStore", slot: int):
+        self._store = store
+        self._slot = slot
+
+    def __repr__(self) -> str:
+        return f"DroneView(id={self.id!r}, status={self.status}, battery_level={self.battery_level})"
+
+    @property
+    def id(self) -> str:
+        return self._store.ids[self._slot]
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._slot]
+
+    @property
+    def specs(self) -> DroneSpecs:
+        return self._store.specs[self._slot]
+
+    @property
+    def status(self) -> DroneStatus:
+        return STATUS_CODES[self._store._status[self._slot]]
+
+    @status.setter
+    def status(self, value: DroneStatus):
+        self._store._status[self._slot] = STATUS_INDEX[value]
+
+    @property
+    def battery_level(self) -> int:
+        return int(self._store._battery[self._slot])
+
+    @battery_level.setter
+    def battery_level(self, value: int):
+        self._store._battery[self._slot] = value
+
+    @property
+    def current_coords(self) -> Tuple[float, float]:
+        return float(self._store._lat[self._slot]), float(self._store._lon[self._slot])
+
+    @current_coords.setter
+    def current_coords(self, value: Tuple[float, float]):
+        self._store._lat[self._slot], self._store._lon[self._slot] = value
+
+    @property
+    def home_nest(self) -> str:
+        return self._store.nest_names[self._store._nest[self._slot]]
+
+    @home_nest.setter
+    def home_nest(self, value: str):
+        self._store._nest[self._slot] = self._store.nest_code(value)
+
+    @property
+    def current_mission_id(self) -> Optional[str]:
+        return self._store._mission[self._slot]
+
+    @current_mission_id.setter
+    def current_mission_id(self, value: Optional[str]):
+        self._store._mission[self._slot] = value
+
+    @property
+    def last_maintenance(self) -> datetime:
+        return datetime.fromtimestamp(self._store._last_maintenance[self._slot])
+
+    @last_maintenance.setter
+    def last_maintenance(self, value: datetime):
+        self._store._last_maintenance[self._slot] = value.timestamp()
+
+class FleetStore(Mapping):
+    """
+    Fleet state as parallel NumPy columns, one row (slot) per drone, so
+    fleet-wide checks are single array expressions. Behaves as a mapping of
+    drone ID to DroneView. Slots are dense: removing a drone moves the last
+    row into its place.
+    """
+
+    def __init__(self, capacity: int = 64,
+                 maintenance_interval_days: float = FLZConfig.DRONE_MAINTENANCE_INTERVAL_DAYS):
+        self.maintenance_interval = maintenance_interval_days * 24 * 3600
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.specs: List[DroneSpecs] = []
+        self.nest_names: List[str] = []
+        self._nest_codes: Dict[str, int] = {}
+        self._slots: Dict[str, int] = {}
+        self._views: List[DroneView] = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        size = len(self.ids)
+        columns = {
+            "status": np.uint8, "battery": np.int16, "lat": np.float64, "lon": np.float64,
+            "nest": np.int32, "mission": object, "last_maintenance": np.float64,
+            "min_battery": np.int16, "max_range": np.float64
+        }
+        for name, dtype in columns.items():
+            column = np.empty(capacity, dtype=dtype)
+            if size:
+                column[:size] = getattr(self, "_" + name)[:size]
+            setattr(self, "_" + name, column)
+        self._capacity = capacity
+
+    # Columns, trimmed to the drones in the store
+
+    @property
+    def status(self) -> np.ndarray:
+        return self._status[:len(self.ids)]
+
+    @property
+    def battery(self) -> np.ndarray:
+        return self._battery[:len(self.ids)]
+
+    @property
+    def lat(self) -> np.ndarray:
+        return self._lat[:len(self.ids)]
+
+    @property
+    def lon(self) -> np.ndarray:
+        return self._lon[:len(self.ids)]
+
+    @property
+    def nest(self) -> np.ndarray:
+        return self._nest[:len(self.ids)]
+
+    @property
+    def mission(self) -> np.ndarray:
+        return self._mission[:len(self.ids)]
+
+    @property
+    def last_maintenance(self) -> np.ndarray:
+        return self._last_maintenance[:len(self.ids)]
+
+    @property
+    def min_battery(self) -> np.ndarray:
+        return self._min_battery[:len(self.ids)]
+
+    @property
+    def max_range(self) -> np.ndarray:
+        return self._max_range[:len(self.ids)]
+
+    # Mapping interface
+
+    def __getitem__(self, drone_id: str) -> DroneView:
+        return self._views[self._slots[drone_id]]
+
+    def __contains__(self, drone_id) -> bool:
+        return drone_id in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def slot(self, drone_id: str) -> int:
+        return self._slots[drone_id]
+
+    def nest_code(self, nest: str) -> int:
+        code = self._nest_codes.get(nest)
+        if code is None:
+            code = len(self.nest_names)
+            self._nest_codes[nest] = code
+            self.nest_names.append(nest)
+        return code
+
+    def add(self, drone: Drone) -> DroneView:
+        """Store a drone's state; the returned view replaces the Drone object"""
+        if drone.id in self._slots:
+            raise ValueError(f"Drone {drone.id} already exists")
+        slot = len(self.ids)
+        if slot == self._capacity:
+            self._allocate(max(self._capacity * 2, 1))
+
+        self.ids.append(drone.id)
+        self.names.append(drone.name)
+        self.specs.append(drone.specs)
+        self._slots[drone.id] = slot
+        view = DroneView(self, slot)
+        self._views.append(view)
+
+        view.status = drone.status
+        view.battery_level = drone.battery_level
+        view.current_coords = drone.current_coords
+        view.home_nest = drone.home_nest
+        view.current_mission_id = drone.current_mission_id
+        view.last_maintenance = drone.last_maintenance
+        self._min_battery[slot] = drone.specs.min_battery
+        self._max_range[slot] = drone.specs.max_range
+        return view
+
+    def remove(self, drone_id: str):
+        slot = self._slots.pop(drone_id)
+        last = len(self.ids) - 1
+        if slot != last:
+            for name in ("status", "battery", "lat", "lon", "nest", "mission",
+                         "last_maintenance", "min_battery", "max_range"):
+                column = getattr(self, "_" + name)
+                column[slot] = column[last]
+            for values in (self.ids, self.names, self.specs, self._views):
+                values[slot] = values[last]
+            self._slots[self.ids[slot]] = slot
+            self._views[slot]._slot = slot
+        self._mission[last] = None
+        for values in (self.ids, self.names, self.specs, self._views):
+            values.pop()
+
+    # Vectorized checks
+
+    def available_mask(self, now: Optional[float] = None) -> np.ndarray:
+        """Idle drones with battery above their minimum and maintenance up to date"""
+        return (
+            (self.status == STATUS_INDEX[DroneStatus.IDLE]) &
+            ~self.low_battery_mask() &
+            ~self.overdue_maintenance_mask(now)
+        )
+
+    def low_battery_mask(self) -> np.ndarray:
+        return self.battery <= self.min_battery
+
+    def overdue_maintenance_mask(self, now: Optional[float] = None) -> np.ndarray:
+        now = time.time() if now is None else now
+        return now - self.last_maintenance >= self.maintenance_interval
+
+    def status_mask(self, statuses: Iterable[DroneStatus]) -> np.ndarray:
+        return np.isin(self.status, [STATUS_INDEX[status] for status in statuses])
+
+    def nest_mask(self, nests: Iterable[str]) -> np.ndarray:
+        return np.isin(self.nest, [self._nest_codes[nest] for nest in nests if nest in self._nest_codes])
+
+    def is_available(self, drone_id: str, now: Optional[float] = None) -> bool:
+        slot = self._slots[drone_id]
+        now = time.time() if now is None else now
+        return bool(
+            self._status[slot] == STATUS_INDEX[DroneStatus.IDLE] and
+            self._battery[slot] > self._min_battery[slot] and
+            now - self._last_maintenance[slot] < self.maintenance_interval
+        )
+
+    def select(self, mask: np.ndarray) -> List[DroneView]:
+        """Views of the drones where mask is True, in slot order"""
+        return [self._views[slot] for slot in np.flatnonzero(mask).tolist()]
+
+    def select_ids(self, mask: np.ndarray) -> List[str]:
+        return [self.ids[slot] for slot in np.flatnonzero(mask).tolist()]
@@ -0,0 +1,192 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import time
+import numpy as np
+from ..core.config import FLZConfig
+from .eagle_nests_network import Drone, Mission, MissionPriority
+from ..core.geo import haversine_matrix
+
+# Cost of an infeasible drone/mission pair; always worse than leaving a mission unassigned
+INFEASIBLE_COST = 1e9
+
+@dataclass
+class MissionAssignment:
+    mission_id: str
+    drone_id: str
+    distance_km: float
+    cost: float
+
+@dataclass
+class MissionPlan:
+    assignments: List[MissionAssignment] = field(default_factory=list)
+    unassigned: List[str] = field(default_factory=list)  # Mission IDs left without a drone
+    timed_out: bool = False  # Some missions were assigned greedily after the time budget ran out
+    solve_time: float = 0.0  # seconds
+
+class BatchMissionPlanner:
+    """
+    Assigns a batch of pending missions to available drones at once by solving
+    a priority-weighted min-cost assignment over distance, battery, range and
+    camera types, instead of greedily taking the nearest drone per mission.
+    """
+
+    PRIORITY_WEIGHTS = {
+        MissionPriority.LOW: 1.0,
+        MissionPriority.MEDIUM: 2.0,
+        MissionPriority.HIGH: 4.0,
+        MissionPriority.CRITICAL: 8.0
+    }
+    BATTERY_WEIGHT = 0.5     # Cost of an empty battery relative to using the full range
+    UNASSIGNED_PENALTY = 10.0  # Cost of leaving a mission without a drone, per priority weight
+
+    def __init__(self, time_budget: float = FLZConfig.MISSION_PLANNER_TIME_BUDGET):
+        self.time_budget = time_budget
+
+    def plan(self, missions: List[Mission], drones: List[Drone]) -> MissionPlan:
+        """Find the assignment of drones to missions with the lowest total cost"""
+        started = time.perf_counter()
+        if not missions:
+            return MissionPlan()
+        if not drones:
+            return MissionPlan(unassigned=[mission.id for mission in missions])
+
+        # Solve the most urgent missions first so they are optimal even on timeout
+        missions = sorted(missions, key=lambda mission: -mission.priority.value)
+        costs, distances = self.build_cost_matrix(missions, drones)
+
+        # One "no drone" column per mission lets the solver leave missions unassigned
+        weights = np.array([self.PRIORITY_WEIGHTS[mission.priority] for mission in missions])
+        unassigned_costs = np.repeat((weights * self.UNASSIGNED_PENALTY)[:, None], len(missions), axis=1)
+        columns, timed_out = solve_assignment(
+            np.hstack([costs, unassigned_costs]),
+            deadline=started + self.time_budget
+        )
+
+        plan = MissionPlan(timed_out=timed_out)
+        for row, mission in enumerate(missions):
+            column = columns[row]
+            if column < len(drones) and costs[row, column] < INFEASIBLE_COST:
+                plan.assignments.append(MissionAssignment(
+                    mission_id=mission.id,
+                    drone_id=drones[column].id,
+                    distance_km=float(distances[row, column]),
+                    cost=float(costs[row, column])
+                ))
+            else:
+                plan.unassigned.append(mission.id)
+        plan.solve_time = time.perf_counter() - started
+        return plan
+
+    def build_cost_matrix(self, missions: List[Mission],
+                          drones: List[Drone]) -> Tuple[np.ndarray, np.ndarray]:
+        """(missions x drones) assignment costs and distances in kilometers"""
+        distances = haversine_matrix(
+            [mission.target_coords for mission in missions],
+            [drone.current_coords for drone in drones]
+        )
+        max_range = np.array([drone.specs.max_range for drone in drones])
+        battery = np.array([drone.battery_level for drone in drones], dtype=float)
+        min_battery = np.array([drone.specs.min_battery for drone in drones], dtype=float)
+        weights = np.array([self.PRIORITY_WEIGHTS[mission.priority] for mission in missions])
+
+        costs = weights[:, None] * (
+            distances / max_range[None, :] +
+            self.BATTERY_WEIGHT * (1 - battery / 100)[None, :]
+        )
+
+        feasible = (distances <= max_range[None, :]) & (battery > min_battery)[None, :]
+        feasible &= self._camera_mask(missions, drones)
+        costs[~feasible] = INFEASIBLE_COST
+        return costs, distances
+
+    def _camera_mask(self, missions: List[Mission], drones: List[Drone]) -> np.ndarray:
+        """Which drones carry every camera type each mission requires"""
+        camera_types = sorted({
+            camera for mission in missions for camera in mission.required_cameras
+        })
+        if not camera_types:
+            return np.ones((len(missions), len(drones)), dtype=bool)
+
+        column = {camera: index for index, camera in enumerate(camera_types)}
+        required = np.zeros((len(missions), len(camera_types)), dtype=bool)
+        for row, mission in enumerate(missions):
+            required[row, [column[camera] for camera in mission.required_cameras]] = True
+        available = np.zeros((len(drones), len(camera_types)), dtype=bool)
+        for row, drone in enumerate(drones):
+            available[row, [column[c] for c in drone.specs.camera_types if c in column]] = True
+
+        # A pair is missing a camera if the mission needs it and the drone lacks it
+        missing = required.astype(int) @ (~available).T.astype(int)
+        return missing == 0
+
+def solve_assignment(costs: np.ndarray,
+                     deadline: Optional[float] = None) -> Tuple[np.ndarray, bool]:
+    """
+    Min-cost assignment of every row of an (n x m, n <= m) cost matrix to a
+    distinct column, using the shortest augmenting path (Hungarian) method with
+    the inner column scan vectorized. Rows are added one at a time in order; if
+    the deadline (a time.perf_counter() value) passes, the remaining rows take
+    the cheapest free column greedily. Returns (column per row, timed_out).
+    """
+    n, m = costs.shape
+    if n > m:
+        raise ValueError("Cost matrix needs at least as many columns as rows")
+
+    # Potentials and matching are 1-indexed; column 0 is the virtual start column
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    row_of_column = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+    timed_out = False
+
+    for row in range(1, n + 1):
+        if deadline is not None and time.perf_counter() > deadline:
+            timed_out = True
+            break
+
+        row_of_column[0] = row
+        current_column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+
+        while True:
+            used[current_column] = True
+            current_row = row_of_column[current_column]
+            free = ~used[1:]
+
+            slack = costs[current_row - 1] - u[current_row] - v[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = current_column
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            u[row_of_column[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+
+            current_column = next_column
+            if row_of_column[current_column] == 0:
+                break
+
+        # Flip the augmenting path
+        while current_column:
+            previous_column = way[current_column]
+            row_of_column[current_column] = row_of_column[previous_column]
+            current_column = previous_column
+
+    columns = np.full(n, -1, dtype=int)
+    assigned = np.flatnonzero(row_of_column[1:])
+    columns[row_of_column[1:][assigned] - 1] = assigned
+
+    if timed_out:
+        taken = np.zeros(m, dtype=bool)
+        taken[assigned] = True
+        for row in np.flatnonzero(columns < 0):
+            column = int(np.argmin(np.where(taken, np.inf, costs[row])))
+            columns[row] = column
+            taken[column] = True
+
+    return columns, timed_out
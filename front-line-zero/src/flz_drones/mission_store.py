@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set
+import itertools
+from ..core.config import FLZConfig
+
+if TYPE_CHECKING:
+    from .eagle_nests_network import Mission, MissionPriority
+
+class MissionStore(Mapping):
+    """
+    Missions by lifecycle stage. Active missions are indexed by status,
+    priority and area so status queries cost O(active missions); completed
+    missions move to an archive that keeps only the most recent ones in
+    memory. Reads by ID see both, like a dict of all missions.
+    """
+
+    def __init__(self, archive_size: int = FLZConfig.MISSION_ARCHIVE_SIZE):
+        self.archive_size = archive_size
+        self.active: Dict[str, "Mission"] = {}
+        self.archive: "OrderedDict[str, Mission]" = OrderedDict()  # Oldest completion first
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_priority: Dict["MissionPriority", Set[str]] = {}
+        self._by_area: Dict[str, Set[str]] = {}
+        self._sequence = itertools.count(1)
+
+    def __getitem__(self, mission_id: str) -> "Mission":
+        mission = self.active.get(mission_id)
+        if mission is None:
+            mission = self.archive[mission_id]
+        return mission
+
+    def __contains__(self, mission_id) -> bool:
+        return mission_id in self.active or mission_id in self.archive
+
+    def __iter__(self) -> Iterator[str]:
+        return itertools.chain(self.archive, self.active)
+
+    def __len__(self) -> int:
+        return len(self.active) + len(self.archive)
+
+    def new_id(self) -> str:
+        """Mission ID that is unique even for missions created in the same second"""
+        while True:
+            mission_id = f"mission_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._sequence):06d}"
+            if mission_id not in self:
+                return mission_id
+
+    def add(self, mission: "Mission"):
+        if mission.id in self:
+            raise ValueError(f"Mission {mission.id} already exists")
+        if mission.completion_time is not None:
+            self._archive(mission)
+            return
+        self.active[mission.id] = mission
+        self._index(mission)
+
+    def set_status(self, mission: "Mission", status: str):
+        """Change the status of an active mission, keeping the index in step"""
+        self._unindex(self._by_status, mission.status, mission.id)
+        mission.status = status
+        self._by_status.setdefault(status, set()).add(mission.id)
+
+    def complete(self, mission: "Mission", status: str = "COMPLETED",
+                 completion_time: Optional[datetime] = None):
+        """Mark an active mission finished and move it to the archive"""
+        del self.active[mission.id]
+        self._unindex(self._by_status, mission.status, mission.id)
+        self._unindex(self._by_priority, mission.priority, mission.id)
+        self._unindex(self._by_area, mission.target_area, mission.id)
+        mission.status = status
+        mission.completion_time = completion_time or datetime.now()
+        self._archive(mission)
+
+    def query(self, statuses: Optional[Iterable[str]] = None,
+              priorities: Optional[Iterable["MissionPriority"]] = None,
+              areas: Optional[Iterable[str]] = None) -> List["Mission"]:
+        """Active missions matching any of the values given for each filter, oldest first"""
+        selected: Optional[Set[str]] = None
+        for index, values in ((self._by_status, statuses),
+                              (self._by_priority, priorities),
+                              (self._by_area, areas)):
+            if values is None:
+                continue
+            matches = set().union(*(index.get(value, ()) for value in values))
+            selected = matches if selected is None else selected & matches
+        if selected is None:
+            return list(self.active.values())
+        # IDs sort by creation, which keeps results independent of set ordering
+        return [self.active[mission_id] for mission_id in sorted(selected)]
+
+    def status_counts(self) -> Dict[str, int]:
+        """Number of active missions per status"""
+        return {status: len(ids) for status, ids in self._by_status.items()}
+
+    def _index(self, mission: "Mission"):
+        self._by_status.setdefault(mission.status, set()).add(mission.id)
+        self._by_priority.setdefault(mission.priority, set()).add(mission.id)
+        self._by_area.setdefault(mission.target_area, set()).add(mission.id)
+
+    @staticmethod
+    def _unindex(index: Dict, value, mission_id: str):
+        ids = index.get(value)
+        if ids is not None:
+            ids.discard(mission_id)
+            if not ids:
+                del index[value]
+
+    def _archive(self, mission: "Mission"):
+        self.archive[mission.id] = mission
+        while len(self.archive) > self.archive_size:
+            # Older missions remain in the persistent store until they pass the history retention
+            self.archive.popitem(last=False)
@@ -0,0 +1,376 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import argparse
+import heapq
+import json
+import resource
+import time
+import tracemalloc
+import numpy as np
+from ..core.area_manager import AreaManager
+from ..core.config import AreaConfig, FLZConfig
+from ..core.risk_analyzer import ALERT_LEVELS, RiskAssessment
+from .eagle_nests_network import DRONE_SPECS, Drone, DroneStatus, EagleNestsNetwork
+from ..core.geo import haversine_km
+from .mission_planner import BatchMissionPlanner
+
+@dataclass
+class SimulationConfig:
+    nests: int = 20
+    drones_per_nest: int = 10
+    areas: int = 200
+    duration: float = 4 * 3600        # simulated seconds
+    region: Tuple[float, float, float, float] = (39.8, -7.9, 40.4, -7.1)  # south, west, north, east
+    risk_interval: float = 300        # seconds between risk assessments of every area
+    telemetry_interval: float = 10    # seconds between telemetry frames of each drone
+    status_interval: float = 30       # seconds between fleet status reads
+    plan_interval: float = 120        # seconds between batch assignments of pending missions
+    launch_seconds: float = 30
+    survey_seconds: float = 600       # time over the target area
+    charge_seconds: float = 1800      # from empty to full
+    ignition_probability: float = 0.002  # per area and risk assessment
+    seed: int = 0
+    trace_memory: bool = False        # tracemalloc peak; slows the run down
+
+@dataclass
+class LatencyStats:
+    count: int = 0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> "LatencyStats":
+        if not samples:
+            return cls()
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+        return cls(len(samples), float(p50), float(p95), float(p99), max(samples) * 1000)
+
+@dataclass
+class SimulationReport:
+    drones: int
+    areas: int
+    simulated_seconds: float
+    wall_seconds: float
+    events: int
+    events_per_second: float
+    speedup: float                   # simulated seconds per wall-clock second
+    missions_created: int
+    missions_dispatched: int
+    missions_completed: int
+    missions_pending: int            # still waiting for a drone at the end
+    dispatch: LatencyStats           # create_mission, including drone selection
+    planning: LatencyStats           # plan_pending_missions
+    telemetry: LatencyStats          # update_drone_status
+    fleet_status: LatencyStats       # get_fleet_status
+    max_rss_mb: float
+    traced_peak_mb: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class _Sortie:
+    """A drone's flight for one mission, as offsets in seconds from launch"""
+    mission_id: str
+    launched_at: float
+    target: Tuple[float, float]
+    battery_at_launch: float
+    outbound: float = 0.0
+    surveyed: float = 0.0
+    landed: float = 0.0
+
+@dataclass
+class _SimDrone:
+    id: str
+    nest: Tuple[float, float]
+    speed_ms: float
+    drain_per_second: float          # battery percent per second of flight
+    battery: float = 100.0
+    charging_since: Optional[float] = None
+    sortie: Optional[_Sortie] = None
+
+class FleetSimulator:
+    """
+    Deterministic discrete-event simulation of the Eagle Nests network.
+    Simulated time advances from event to event, so hours of operation run
+    in seconds. Area risk follows a seeded random walk with occasional
+    ignitions; areas over their threshold get a mission through
+    create_mission, drones fly it and report progress through
+    update_drone_status, and the fleet status is read periodically.
+    Wall-clock latency of every network call is recorded.
+    """
+
+    def __init__(self, config: Optional[SimulationConfig] = None):
+        config = config or SimulationConfig()
+        self.config = config
+        self.rng = np.random.default_rng(config.seed)
+        self.network = EagleNestsNetwork(initialize_fleet=False)
+        self.area_manager = AreaManager(areas=self._generate_areas())
+        self.planner = BatchMissionPlanner()
+        self.sim_drones: Dict[str, _SimDrone] = {}
+        self._generate_fleet()
+
+        count = len(self.area_manager.keys)
+        self._risk_mean = self.rng.uniform(0.2, 0.6, count)
+        self._risk = self._risk_mean.copy()
+        self._alert_thresholds = [FLZConfig.RISK_LEVELS[level] for level in ALERT_LEVELS[1:]]
+
+        self.now = 0.0
+        self._events: List[Tuple[float, int, str, Optional[str]]] = []
+        self._sequence = 0
+        self._samples: Dict[str, List[float]] = {
+            "dispatch": [], "planning": [], "telemetry": [], "fleet_status": []
+        }
+        self.missions_created = 0
+        self.missions_dispatched = 0
+        self.missions_completed = 0
+
+    def _generate_areas(self) -> Dict[str, AreaConfig]:
+        south, west, north, east = self.config.region
+        latitudes = self.rng.uniform(south, north, self.config.areas)
+        longitudes = self.rng.uniform(west, east, self.config.areas)
+        return {
+            f"sim_area_{index:05d}": AreaConfig(
+                name=f"Sim Area {index}",
+                latitude=float(latitudes[index]),
+                longitude=float(longitudes[index]),
+                radius_km=FLZConfig.DEFAULT_AREA_RADIUS_KM,
+                risk_threshold=FLZConfig.DEFAULT_AREA_RISK_THRESHOLD
+            )
+            for index in range(self.config.areas)
+        }
+
+    def _generate_fleet(self):
+        south, west, north, east = self.config.region
+        self.network.nests = {
+            f"sim_nest_{index:04d}": (float(self.rng.uniform(south, north)),
+                                      float(self.rng.uniform(west, east)))
+            for index in range(self.config.nests)
+        }
+        models = list(DRONE_SPECS)
+        for nest_id, coords in self.network.nests.items():
+            for number in range(self.config.drones_per_nest):
+                model = models[number % len(models)]
+                specs = DRONE_SPECS[model]
+                drone = self.network.add_drone(Drone(
+                    id=f"{model}_{nest_id}_{number:03d}",
+                    name=f"{model.title()}-{nest_id}-{number}",
+                    specs=specs,
+                    status=DroneStatus.IDLE,
+                    battery_level=100,
+                    current_coords=coords,
+                    home_nest=nest_id
+                ))
+                self.sim_drones[drone.id] = _SimDrone(
+                    id=drone.id,
+                    nest=coords,
+                    speed_ms=specs.cruise_speed,
+                    drain_per_second=100 / (specs.max_flight_time * 60)
+                )
+
+    # Event loop
+
+    def run(self) -> SimulationReport:
+        config = self.config
+        self._schedule(0.0, "risk")
+        self._schedule(config.plan_interval, "plan")
+        self._schedule(config.status_interval, "status")
+        # Spread telemetry frames evenly instead of sending them in bursts
+        offsets = self.rng.uniform(0, config.telemetry_interval, len(self.sim_drones))
+        for offset, drone_id in zip(offsets.tolist(), self.sim_drones):
+            self._schedule(offset, "telemetry", drone_id)
+
+        if config.trace_memory:
+            tracemalloc.start()
+        handlers = {
+            "risk": self._on_risk, "plan": self._on_plan,
+            "status": self._on_status, "telemetry": self._on_telemetry
+        }
+        events = 0
+        started = time.perf_counter()
+        while self._events and self._events[0][0] <= config.duration:
+            self.now, _, kind, drone_id = heapq.heappop(self._events)
+            handlers[kind](drone_id)
+            events += 1
+        wall_seconds = time.perf_counter() - started
+
+        traced_peak = None
+        if config.trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+        return SimulationReport(
+            drones=len(self.sim_drones),
+            areas=len(self.area_manager.keys),
+            simulated_seconds=config.duration,
+            wall_seconds=wall_seconds,
+            events=events,
+            events_per_second=events / wall_seconds if wall_seconds else 0.0,
+            speedup=config.duration / wall_seconds if wall_seconds else 0.0,
+            missions_created=self.missions_created,
+            missions_dispatched=self.missions_dispatched,
+            missions_completed=self.missions_completed,
+            missions_pending=len(self.network.get_pending_missions()),
+            dispatch=LatencyStats.from_samples(self._samples["dispatch"]),
+            planning=LatencyStats.from_samples(self._samples["planning"]),
+            telemetry=LatencyStats.from_samples(self._samples["telemetry"]),
+            fleet_status=LatencyStats.from_samples(self._samples["fleet_status"]),
+            # ru_maxrss is in kilobytes on Linux
+            max_rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            traced_peak_mb=traced_peak
+        )
+
+    def _schedule(self, at: float, kind: str, drone_id: Optional[str] = None):
+        # The sequence number keeps ordering deterministic for simultaneous events
+        self._sequence += 1
+        heapq.heappush(self._events, (at, self._sequence, kind, drone_id))
+
+    def _timed(self, kind: str, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        self._samples[kind].append(time.perf_counter() - started)
+        return result
+
+    # Event handlers
+
+    def _on_risk(self, _):
+        """Advance every area's risk and open missions for areas over their threshold"""
+        noise = self.rng.normal(0.0, 0.03, len(self._risk))
+        ignitions = self.rng.random(len(self._risk)) < self.config.ignition_probability
+        self._risk += 0.1 * (self._risk_mean - self._risk) + noise + 0.5 * ignitions
+        np.clip(self._risk, 0.0, 1.0, out=self._risk)
+
+        over = np.flatnonzero(self._risk >= self.area_manager.risk_thresholds)
+        if len(over):
+            alert_index = np.digitize(self._risk[over], self._alert_thresholds)
+            timestamp = datetime.now()
+            for position, alert in zip(over.tolist(), alert_index.tolist()):
+                area_key = self.area_manager.keys[position]
+                if self.network.missions.query(areas=[area_key]):
+                    continue  # Already being handled
+                assessment = RiskAssessment(
+                    area_name=area_key,
+                    total_risk_level=float(self._risk[position]),
+                    risk_factors=[],
+                    timestamp=timestamp,
+                    alert_level=ALERT_LEVELS[alert],
+                    requires_drone_inspection=True,
+                    coordinates=(float(self.area_manager.latitudes[position]),
+                                 float(self.area_manager.longitudes[position]))
+                )
+                mission_id = self._timed("dispatch", self.network.create_mission, assessment)
+                self.missions_created += 1
+                self._start_sortie(mission_id)
+        self._schedule(self.now + self.config.risk_interval, "risk")
+
+    def _on_plan(self, _):
+        plan = self._timed("planning", self.network.plan_pending_missions, self.planner)
+        for assignment in plan.assignments:
+            self._start_sortie(assignment.mission_id)
+        self._schedule(self.now + self.config.plan_interval, "plan")
+
+    def _on_status(self, _):
+        self._timed("fleet_status", self.network.get_fleet_status)
+        self._schedule(self.now + self.config.status_interval, "status")
+
+    def _on_telemetry(self, drone_id: str):
+        """Report where the drone is in its sortie or charge cycle"""
+        sim = self.sim_drones[drone_id]
+        status, coords = self._advance(sim)
+        drone = self.network.drones[drone_id]
+        mission_id = drone.current_mission_id
+        self._timed(
+            "telemetry", self.network.update_drone_status,
+            drone_id, status, int(sim.battery), coords
+        )
+        if mission_id is not None and drone.current_mission_id is None:
+            self.missions_completed += 1
+        self._schedule(self.now + self.config.telemetry_interval, "telemetry", drone_id)
+
+    # Drone behaviour
+
+    def _start_sortie(self, mission_id: str):
+        mission = self.network.missions[mission_id]
+        if mission.drone_id is None:
+            return  # No drone free yet; the planner retries
+        self.missions_dispatched += 1
+        sim = self.sim_drones[mission.drone_id]
+        self._advance(sim)
+        sortie = _Sortie(mission_id, self.now, mission.target_coords, sim.battery)
+        leg = float(haversine_km(*sim.nest, *mission.target_coords)) * 1000 / sim.speed_ms
+        sortie.outbound = self.config.launch_seconds + leg
+        sortie.surveyed = sortie.outbound + self.config.survey_seconds
+        sortie.landed = sortie.surveyed + leg
+        sim.sortie = sortie
+        sim.charging_since = None
+
+    def _advance(self, sim: _SimDrone) -> Tuple[DroneStatus, Tuple[float, float]]:
+        """Bring a simulated drone's battery and phase up to the current time"""
+        sortie = sim.sortie
+        if sortie is None:
+            if sim.charging_since is None:
+                return DroneStatus.IDLE, sim.nest
+            sim.battery = min(
+                100.0, sim.battery + (self.now - sim.charging_since) * 100 / self.config.charge_seconds
+            )
+            sim.charging_since = self.now
+            if sim.battery >= 100.0:
+                sim.charging_since = None
+                return DroneStatus.IDLE, sim.nest
+            return DroneStatus.CHARGING, sim.nest
+
+        elapsed = self.now - sortie.launched_at
+        flying = min(max(elapsed - self.config.launch_seconds, 0.0), sortie.landed - self.config.launch_seconds)
+        sim.battery = max(0.0, sortie.battery_at_launch - flying * sim.drain_per_second)
+        if elapsed < self.config.launch_seconds:
+            return DroneStatus.LAUNCHING, sim.nest
+        if elapsed < sortie.outbound:
+            fraction = flying / (sortie.outbound - self.config.launch_seconds)
+            return DroneStatus.ON_MISSION, self._between(sim.nest, sortie.target, fraction)
+        if elapsed < sortie.surveyed:
+            return DroneStatus.ON_MISSION, sortie.target
+        if elapsed < sortie.landed:
+            fraction = (elapsed - sortie.surveyed) / (sortie.landed - sortie.surveyed)
+            return DroneStatus.RETURNING, self._between(sortie.target, sim.nest, fraction)
+
+        if self.network.drones[sim.id].current_mission_id == sortie.mission_id:
+            # Landed between frames; the RETURNING frame still has to complete the mission
+            return DroneStatus.RETURNING, sim.nest
+        sim.sortie = None
+        sim.charging_since = sortie.launched_at + sortie.landed
+        return self._advance(sim)
+
+    @staticmethod
+    def _between(start: Tuple[float, float], end: Tuple[float, float],
+                 fraction: float) -> Tuple[float, float]:
+        return (start[0] + (end[0] - start[0]) * fraction,
+                start[1] + (end[1] - start[1]) * fraction)
+
+def main():
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Discrete-event load test of the Eagle Nests network")
+    parser.add_argument("--nests", type=int, default=defaults.nests)
+    parser.add_argument("--drones-per-nest", type=int, default=defaults.drones_per_nest)
+    parser.add_argument("--areas", type=int, default=defaults.areas)
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="simulated seconds")
+    parser.add_argument("--telemetry-interval", type=float, default=defaults.telemetry_interval)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    config = SimulationConfig(
+        nests=args.nests,
+        drones_per_nest=args.drones_per_nest,
+        areas=args.areas,
+        duration=args.duration,
+        telemetry_interval=args.telemetry_interval,
+        seed=args.seed,
+        trace_memory=args.trace_memory
+    )
+    print(json.dumps(FleetSimulator(config).run().to_dict(), indent=2))
+
+if __name__ == "__main__":
+    main()
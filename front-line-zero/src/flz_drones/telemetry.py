@@ -0,0 +1,243 @@
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, List, Tuple, Union
+import json
+import weakref
+import numpy as np
+from ..core.config import FLZConfig
+from ..core.metrics import REGISTRY
+from .eagle_nests_network import EagleNestsNetwork
+from .fleet_manager import STATUS_CODES, STATUS_INDEX, DroneStatus
+
+# Binary frame layout (58 bytes, little-endian). Frames can be concatenated.
+TELEMETRY_FRAME_DTYPE = np.dtype([
+    ("drone_id", "S32"),   # ASCII, NUL padded
+    ("timestamp", "<f8"),  # seconds since epoch
+    ("lat", "<f8"),
+    ("lon", "<f8"),
+    ("battery", "u1"),     # percentage
+    ("status", "u1")       # index into STATUS_CODES
+])
+
+def encode_frames(frames: Iterable[Tuple[str, float, float, float, int, DroneStatus]]) -> bytes:
+    """Encode (drone_id, timestamp, lat, lon, battery, status) tuples as binary frames"""
+    id_size = TELEMETRY_FRAME_DTYPE["drone_id"].itemsize
+    records = [
+        (drone_id.encode("ascii"), timestamp, lat, lon, battery, STATUS_INDEX[status])
+        for drone_id, timestamp, lat, lon, battery, status in frames
+    ]
+    if any(len(record[0]) > id_size for record in records):
+        raise ValueError(f"Drone IDs in binary frames are limited to {id_size} bytes")
+    return np.array(records, dtype=TELEMETRY_FRAME_DTYPE).tobytes()
+
+@dataclass
+class TelemetryStats:
+    received: int = 0   # Frames decoded from input
+    accepted: int = 0   # Frames written to the buffer
+    dropped: int = 0    # Frames overwritten before being applied (backpressure)
+    rejected: int = 0   # Malformed frames or unknown drones
+    stale: int = 0      # Frames older than the last applied state of their drone
+    applied: int = 0    # Drone state updates applied to the fleet
+    flushes: int = 0
+
+# Live ingestors, summed into the frame counters when metrics are scraped
+_ingestors: "weakref.WeakSet[TelemetryIngestor]" = weakref.WeakSet()
+
+def _frame_totals() -> Dict[Tuple[str, ...], float]:
+    return {
+        (outcome.name,): sum(getattr(ingestor.stats, outcome.name) for ingestor in list(_ingestors))
+        for outcome in fields(TelemetryStats) if outcome.name != "flushes"
+    }
+
+REGISTRY.counter(
+    "flz_telemetry_frames_total", "Telemetry frames by outcome (received, accepted, dropped, ...)",
+    ["outcome"], function=_frame_totals
+)
+
+class TelemetryBuffer:
+    """
+    Columnar ring buffer of telemetry frames. When full, new frames overwrite
+    the oldest ones; the number overwritten is reported to the caller.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.slot = np.zeros(capacity, dtype=np.int32)
+        self.timestamp = np.zeros(capacity, dtype=np.float64)
+        self.lat = np.zeros(capacity, dtype=np.float64)
+        self.lon = np.zeros(capacity, dtype=np.float64)
+        self.battery = np.zeros(capacity, dtype=np.uint8)
+        self.status = np.zeros(capacity, dtype=np.uint8)
+        self._head = 0  # Next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, slot: np.ndarray, timestamp: np.ndarray, lat: np.ndarray,
+             lon: np.ndarray, battery: np.ndarray, status: np.ndarray) -> int:
+        """Append frames column-wise. Returns the number of older frames overwritten."""
+        count = len(slot)
+        if count > self.capacity:
+            # Only the newest frames can fit
+            skipped = count - self.capacity
+            overwritten = self.push(slot[skipped:], timestamp[skipped:], lat[skipped:],
+                                    lon[skipped:], battery[skipped:], status[skipped:])
+            return overwritten + skipped
+
+        positions = (self._head + np.arange(count)) % self.capacity
+        self.slot[positions] = slot
+        self.timestamp[positions] = timestamp
+        self.lat[positions] = lat
+        self.lon[positions] = lon
+        self.battery[positions] = battery
+        self.status[positions] = status
+
+        self._head = (self._head + count) % self.capacity
+        overwritten = max(0, self._size + count - self.capacity)
+        self._size = min(self._size + count, self.capacity)
+        return overwritten
+
+    def drain(self) -> Dict[str, np.ndarray]:
+        """Remove and return all buffered frames in arrival order"""
+        positions = (self._head - self._size + np.arange(self._size)) % self.capacity
+        frames = {
+            "slot": self.slot[positions],
+            "timestamp": self.timestamp[positions],
+            "lat": self.lat[positions],
+            "lon": self.lon[positions],
+            "battery": self.battery[positions],
+            "status": self.status[positions]
+        }
+        self._size = 0
+        return frames
+
+class TelemetryIngestor:
+    """
+    Accepts high-rate drone telemetry (binary or JSON frames) into a columnar
+    buffer and applies only the newest frame per drone to the fleet on each
+    flush. Callers flush when frames arrive, batched by their event queue.
+    """
+
+    def __init__(self, network: EagleNestsNetwork,
+                 capacity: int = FLZConfig.TELEMETRY_BUFFER_CAPACITY):
+        self.network = network
+        self.buffer = TelemetryBuffer(capacity)
+        self.stats = TelemetryStats()
+        self._slots: Dict[str, int] = {}
+        self._drone_ids: List[str] = []
+        self._last_applied = np.zeros(0, dtype=np.float64)
+        _ingestors.add(self)
+
+    def ingest_binary(self, data: bytes) -> int:
+        """Ingest concatenated binary frames. Returns the number of frames accepted."""
+        if len(data) % TELEMETRY_FRAME_DTYPE.itemsize:
+            self.stats.rejected += 1
+            return 0
+        frames = np.frombuffer(data, dtype=TELEMETRY_FRAME_DTYPE)
+        self.stats.received += len(frames)
+        if not len(frames):
+            return 0
+
+        # Resolve each distinct drone ID once per batch
+        drone_ids, inverse = np.unique(frames["drone_id"], return_inverse=True)
+        slot_of_id = np.array([
+            self._slot(drone_id.decode("ascii", errors="replace")) for drone_id in drone_ids
+        ], dtype=np.int32)
+        slots = slot_of_id[inverse]
+
+        return self._accept(
+            slots, frames["timestamp"], frames["lat"], frames["lon"],
+            frames["battery"], frames["status"]
+        )
+
+    def ingest_json(self, data: Union[str, bytes]) -> int:
+        """
+        Ingest a JSON frame or list of frames with keys drone_id, timestamp,
+        lat, lon, battery and status (a DroneStatus value such as "idle").
+        """
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            self.stats.rejected += 1
+            return 0
+        records = payload if isinstance(payload, list) else [payload]
+        self.stats.received += len(records)
+
+        columns = []
+        for record in records:
+            try:
+                columns.append((
+                    self._slot(record["drone_id"]),
+                    float(record["timestamp"]),
+                    float(record["lat"]),
+                    float(record["lon"]),
+                    int(record["battery"]),
+                    STATUS_INDEX[DroneStatus(record["status"])]
+                ))
+            except (KeyError, TypeError, ValueError):
+                self.stats.rejected += 1
+        if not columns:
+            return 0
+
+        slots, timestamps, lats, lons, batteries, statuses = (np.array(column) for column in zip(*columns))
+        return self._accept(slots, timestamps, lats, lons, batteries, statuses)
+
+    def flush(self) -> List[str]:
+        """Apply the newest buffered frame of each drone to the fleet. Returns the drones updated."""
+        frames = self.buffer.drain()
+        self.stats.flushes += 1
+        if not len(frames["slot"]):
+            return []
+
+        # Newest frame per drone by timestamp, not arrival order
+        order = np.lexsort((frames["timestamp"], frames["slot"]))
+        slots = frames["slot"][order]
+        newest = order[np.append(slots[1:] != slots[:-1], True)]
+
+        fresh = frames["timestamp"][newest] > self._last_applied[frames["slot"][newest]]
+        self.stats.stale += int(len(newest) - fresh.sum())
+        newest = newest[fresh]
+
+        updated = []
+        for index in newest:
+            slot = int(frames["slot"][index])
+            updated.append(self._drone_ids[slot])
+            self.network.update_drone_status(
+                self._drone_ids[slot],
+                STATUS_CODES[frames["status"][index]],
+                int(frames["battery"][index]),
+                (float(frames["lat"][index]), float(frames["lon"][index]))
+            )
+            self._last_applied[slot] = frames["timestamp"][index]
+
+        self.stats.applied += len(newest)
+        return updated
+
+    def _slot(self, drone_id: str) -> int:
+        """Numeric slot of a known drone, or -1 for unknown drones"""
+        slot = self._slots.get(drone_id)
+        if slot is None:
+            if drone_id not in self.network.drones:
+                return -1
+            slot = len(self._drone_ids)
+            self._slots[drone_id] = slot
+            self._drone_ids.append(drone_id)
+            self._last_applied = np.append(self._last_applied, 0.0)
+        return slot
+
+    def _accept(self, slots: np.ndarray, timestamps: np.ndarray, lats: np.ndarray,
+                lons: np.ndarray, batteries: np.ndarray, statuses: np.ndarray) -> int:
+        valid = (
+            (slots >= 0) & (statuses < len(STATUS_CODES)) &
+            (batteries >= 0) & (batteries <= 100) & np.isfinite(timestamps) &
+            np.isfinite(lats) & np.isfinite(lons) & (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+        )
+        self.stats.rejected += int(len(valid) - valid.sum())
+        if not valid.all():
+            slots, timestamps, lats, lons, batteries, statuses = (
+                column[valid] for column in (slots, timestamps, lats, lons, batteries, statuses)
+            )
+
+        self.stats.dropped += self.buffer.push(slots, timestamps, lats, lons, batteries, statuses)
+        self.stats.accepted += len(slots)
+        return len(slots)
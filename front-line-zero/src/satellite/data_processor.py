@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+from ..core.config import FLZConfig, AreaConfig
+from .grid import RasterGrid
+from .zonal import ZonalMaskCache, zonal_reduce
+
+@dataclass
+class SentinelTile:
+    """
+    A tile stored as one .npy file per band plus grid.json. Bands are opened
+    as memory maps, so only the pixels actually sliced are read from disk.
+    """
+    tile_id: str
+    path: Path
+    grid: RasterGrid
+    _bands: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def open(cls, path: Path) -> "SentinelTile":
+        path = Path(path)
+        return cls(tile_id=path.name, path=path, grid=RasterGrid.from_file(path / "grid.json"))
+
+    def band(self, name: str) -> np.ndarray:
+        band = self._bands.get(name)
+        if band is None:
+            band = np.load(self.path / f"{name}.npy", mmap_mode="r")
+            if band.shape != (self.grid.rows, self.grid.cols):
+                raise ValueError(f"Band {name} of tile {self.tile_id} does not match its grid")
+            self._bands[name] = band
+        return band
+
+@dataclass
+class AreaStatistics:
+    """Surface temperature and NDVI statistics over the pixels of one area"""
+    pixel_count: int = 0
+    max_temp: float = -np.inf
+    temp_sum: float = 0.0
+    ndvi_sum: float = 0.0
+
+    @property
+    def mean_temp(self) -> float:
+        return self.temp_sum / self.pixel_count if self.pixel_count else float("nan")
+
+    @property
+    def mean_ndvi(self) -> float:
+        return self.ndvi_sum / self.pixel_count if self.pixel_count else float("nan")
+
+    def as_satellite_data(self) -> Dict[str, float]:
+        """Precomputed inputs in the form RiskAnalyzer.update_inputs accepts"""
+        return {
+            "surface_temp_max": float(self.max_temp),
+            "surface_temp_mean": self.mean_temp,
+            "ndvi_mean": self.mean_ndvi
+        }
+
+class SentinelRasterProcessor:
+    """
+    Computes per-area NDVI and surface-temperature statistics from memory-mapped
+    band rasters in fixed-size windows. Only windows that intersect a monitored
+    area are read, each window is read once for all areas in it, and the
+    statistics of every area are reduced together from cached zonal masks.
+    """
+
+    def __init__(self, window_size: int = FLZConfig.RASTER_WINDOW_SIZE,
+                 red_band: str = "B04", nir_band: str = "B08",
+                 temperature_band: str = FLZConfig.SURFACE_TEMP_BAND,
+                 mask_cache: Optional[ZonalMaskCache] = None):
+        self.window_size = window_size
+        self.red_band = red_band
+        self.nir_band = nir_band
+        self.temperature_band = temperature_band
+        self.mask_cache = mask_cache or ZonalMaskCache(window_size)
+
+    def area_statistics(self, tile: SentinelTile,
+                        areas: Dict[str, AreaConfig]) -> Dict[str, AreaStatistics]:
+        """Statistics for every area that overlaps the tile, keyed like `areas`"""
+        masks = self.mask_cache.masks_for(tile.grid, areas)
+        area_count = len(masks.area_keys)
+        pixel_counts = np.zeros(area_count)
+        temp_sums = np.zeros(area_count)
+        ndvi_sums = np.zeros(area_count)
+        max_temps = np.full(area_count, -np.inf)
+
+        red = tile.band(self.red_band)
+        nir = tile.band(self.nir_band)
+        temperature = tile.band(self.temperature_band)
+
+        for window in sorted(masks.windows):
+            spans = masks.windows[window]
+            row0, row1, col0, col1 = spans.bounds
+            red_window = np.asarray(red[row0:row1, col0:col1], dtype=np.float32)
+            nir_window = np.asarray(nir[row0:row1, col0:col1], dtype=np.float32)
+            temp_window = np.asarray(temperature[row0:row1, col0:col1], dtype=np.float32)
+
+            reflectance = nir_window + red_window
+            valid = reflectance > 0  # No-data pixels have zero reflectance
+            ndvi_window = np.divide(nir_window - red_window, reflectance,
+                                    out=np.zeros_like(reflectance), where=valid)
+
+            counts, (temp_sum, ndvi_sum), (max_temp,) = zonal_reduce(
+                spans, area_count, valid, [temp_window, ndvi_window], [temp_window]
+            )
+            pixel_counts += counts
+            temp_sums += temp_sum
+            ndvi_sums += ndvi_sum
+            np.maximum(max_temps, max_temp, out=max_temps)
+
+        return {
+            area_key: AreaStatistics(
+                pixel_count=int(pixel_counts[index]),
+                max_temp=float(max_temps[index]),
+                temp_sum=float(temp_sums[index]),
+                ndvi_sum=float(ndvi_sums[index])
+            )
+            for index, area_key in enumerate(masks.area_keys)
+            if pixel_counts[index]
+        }
@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+import json
+import math
+import numpy as np
+from ..core.geo import KM_PER_DEGREE_LAT
+
+@dataclass
+class RasterGrid:
+    """Georeferencing of a north-up raster in geographic coordinates"""
+    origin_lat: float      # latitude of the top edge
+    origin_lon: float      # longitude of the left edge
+    pixel_size_lat: float  # degrees per row (rows run south)
+    pixel_size_lon: float  # degrees per column
+    rows: int
+    cols: int
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """(south, west, north, east) edges of the raster"""
+        return (self.origin_lat - self.rows * self.pixel_size_lat, self.origin_lon,
+                self.origin_lat, self.origin_lon + self.cols * self.pixel_size_lon)
+
+    def area_bounds(self, lat: float, lon: float,
+                    radius_km: float) -> Optional[Tuple[int, int, int, int]]:
+        """Pixel bounds (row0, row1, col0, col1) of a circle's bounding box, or None if outside"""
+        radius_lat = radius_km / KM_PER_DEGREE_LAT
+        radius_lon = radius_km / (KM_PER_DEGREE_LAT * math.cos(math.radians(lat)))
+        row0 = max(int(math.floor((self.origin_lat - (lat + radius_lat)) / self.pixel_size_lat)), 0)
+        row1 = min(int(math.ceil((self.origin_lat - (lat - radius_lat)) / self.pixel_size_lat)), self.rows)
+        col0 = max(int(math.floor((lon - radius_lon - self.origin_lon) / self.pixel_size_lon)), 0)
+        col1 = min(int(math.ceil((lon + radius_lon - self.origin_lon) / self.pixel_size_lon)), self.cols)
+        if row0 >= row1 or col0 >= col1:
+            return None
+        return row0, row1, col0, col1
+
+    def row_latitudes(self, row0: int, row1: int) -> np.ndarray:
+        """Latitudes of pixel centers for rows [row0, row1)"""
+        return self.origin_lat - (np.arange(row0, row1) + 0.5) * self.pixel_size_lat
+
+    def col_longitudes(self, col0: int, col1: int) -> np.ndarray:
+        """Longitudes of pixel centers for columns [col0, col1)"""
+        return self.origin_lon + (np.arange(col0, col1) + 0.5) * self.pixel_size_lon
+
+    def circle_mask(self, lat: float, lon: float, radius_km: float,
+                    row0: int, row1: int, col0: int, col1: int) -> np.ndarray:
+        """Pixels of the window whose centers fall within radius_km of (lat, lon)"""
+        dy = (self.row_latitudes(row0, row1) - lat) * KM_PER_DEGREE_LAT
+        dx = (self.col_longitudes(col0, col1) - lon) * KM_PER_DEGREE_LAT * math.cos(math.radians(lat))
+        return dy[:, None] ** 2 + dx[None, :] ** 2 <= radius_km ** 2
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RasterGrid":
+        with open(path) as f:
+            return cls(**json.load(f))
@@ -0,0 +1,233 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+from ..core.config import FLZConfig
+
+@dataclass(frozen=True)
+class TileKey:
+    tile_id: str          # e.g. "29TNE"
+    band: str             # e.g. "B04"
+    date: str             # acquisition date, YYYY-MM-DD
+    level: str = "L2A"    # processing level
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(
+            f"{self.tile_id}|{self.band}|{self.date}|{self.level}".encode()
+        ).hexdigest()
+
+class TileBackend(ABC):
+    """Source of band rasters for the client"""
+
+    @abstractmethod
+    def fetch(self, key: TileKey) -> np.ndarray:
+        """Band raster for key; FileNotFoundError if the source has none"""
+
+class LocalSampleBackend(TileBackend):
+    """
+    Stand-in backend reading band rasters from
+    <root>/<tile_id>/<date>/<level>/<band>.npy
+    """
+
+    def __init__(self, root: Path = FLZConfig.MOCK_DATA_DIR / "sentinel_samples"):
+        self.root = Path(root)
+
+    def fetch(self, key: TileKey) -> np.ndarray:
+        path = self.root / key.tile_id / key.date / key.level / f"{key.band}.npy"
+        if not path.exists():
+            raise FileNotFoundError(f"No sample for {key}")
+        return np.load(path)
+
+@dataclass
+class _CacheEntry:
+    content_hash: str
+    size: int
+
+class TileCache:
+    """
+    Size-bounded on-disk cache of band rasters. Arrays are stored once per
+    content hash (identical rasters under different keys share a file), keys
+    are evicted least-recently-used first, and hits are served as read-only
+    memory maps.
+    """
+
+    def __init__(self, root: Path = FLZConfig.TILE_CACHE_DIR,
+                 max_bytes: int = FLZConfig.TILE_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()  # key digest -> entry, LRU first
+        self._refcounts: Dict[str, int] = {}  # content hash -> number of keys
+        self._blob_sizes: Dict[str, int] = {}
+        self.size_bytes = 0
+        self._load_index()
+
+    def get(self, key: TileKey, record: bool = True) -> Optional[np.ndarray]:
+        """
+        Memory-mapped cached array for key, or None on a miss. record=False
+        leaves the hit and miss counts alone, e.g. for a repeated lookup.
+        """
+        with self._lock:
+            entry = self._entries.get(key.digest)
+            if entry is None:
+                self.misses += record
+                return None
+            self._entries.move_to_end(key.digest)
+            self.hits += record
+            path = self._blob_path(entry.content_hash)
+        try:
+            return np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            # Blob evicted by another thread or removed behind our back; forget
+            # the entry unless it has been replaced meanwhile
+            with self._lock:
+                if self._entries.get(key.digest) is entry:
+                    self._drop(key.digest)
+                    self._save_index()
+            return None
+
+    def put(self, key: TileKey, array: np.ndarray) -> np.ndarray:
+        """Store an array under key and return it memory-mapped from the cache"""
+        array = np.ascontiguousarray(array)
+        hasher = hashlib.sha256(f"{array.dtype.str}|{array.shape}".encode())
+        hasher.update(memoryview(array).cast("B"))
+        content_hash = hasher.hexdigest()
+        path = self._blob_path(content_hash)
+
+        # Large bands are written outside the lock so cache hits are not held up
+        tmp_path = None if path.exists() else self._write_temp(path, array)
+        with self._lock:
+            if not path.exists():
+                if tmp_path is None:
+                    # Evicted since the check above
+                    tmp_path = self._write_temp(path, array)
+                os.replace(tmp_path, path)
+            elif tmp_path is not None:
+                os.remove(tmp_path)  # Another thread stored the same content meanwhile
+
+            if key.digest in self._entries:
+                self._drop(key.digest)
+            self._add(key.digest, content_hash, path.stat().st_size)
+            self._evict()
+            self._save_index()
+            # Mapped before releasing the lock, so the blob cannot be evicted first
+            return np.load(path, mmap_mode="r")
+
+    @staticmethod
+    def _write_temp(path: Path, array: np.ndarray) -> str:
+        """Save array to a temporary file next to path, so readers never see partial blobs"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        return tmp_path
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.root / "objects" / content_hash[:2] / f"{content_hash}.npy"
+
+    def _add(self, key_digest: str, content_hash: str, size: int):
+        self._entries[key_digest] = _CacheEntry(content_hash, size)
+        self._refcounts[content_hash] = self._refcounts.get(content_hash, 0) + 1
+        if content_hash not in self._blob_sizes:
+            self._blob_sizes[content_hash] = size
+            self.size_bytes += size
+
+    def _drop(self, key_digest: str):
+        entry = self._entries.pop(key_digest, None)
+        if entry is None:
+            return
+        self._refcounts[entry.content_hash] -= 1
+        if not self._refcounts[entry.content_hash]:
+            del self._refcounts[entry.content_hash]
+            self.size_bytes -= self._blob_sizes.pop(entry.content_hash)
+            try:
+                # Open memory maps keep working after the file is unlinked
+                self._blob_path(entry.content_hash).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _evict(self):
+        """Drop least-recently-used keys until the cache fits, always keeping the newest"""
+        while len(self._entries) > 1 and self.size_bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _load_index(self):
+        index_path = self.root / "index.json"
+        if not index_path.exists():
+            return
+        with open(index_path) as f:
+            for key_digest, content_hash, size in json.load(f):
+                if self._blob_path(content_hash).exists():
+                    self._add(key_digest, content_hash, size)
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump([
+                [key_digest, entry.content_hash, entry.size]
+                for key_digest, entry in self._entries.items()
+            ], f)
+        os.replace(tmp_path, self.root / "index.json")
+
+class SentinelClient:
+    """
+    Fetches Sentinel band rasters through a TileCache. Concurrent requests for
+    the same band share a single backend fetch.
+    """
+
+    def __init__(self, backend: Optional[TileBackend] = None,
+                 cache: Optional[TileCache] = None):
+        self.backend = backend or LocalSampleBackend()
+        self.cache = cache or TileCache()
+        self._lock = threading.Lock()
+        self._inflight: Dict[TileKey, Future] = {}
+
+    def get_band(self, tile_id: str, band: str, date: str, level: str = "L2A") -> np.ndarray:
+        """Band raster as a read-only memory map, fetched on a cache miss"""
+        key = TileKey(tile_id, band, date, level)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            # Another thread may have completed the fetch since our cache check
+            result = self.cache.get(key, record=False)
+            if result is None:
+                result = self.cache.put(key, self.backend.fetch(key))
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def get_bands(self, tile_id: str, date: str,
+                  bands: Optional[List[str]] = None, level: str = "L2A") -> Dict[str, np.ndarray]:
+        return {
+            band: self.get_band(tile_id, band, date, level)
+            for band in (bands or FLZConfig.SENTINEL_BANDS)
+        }
@@ -0,0 +1,190 @@
+from dataclasses import dataclass, astuple
+from typing import Dict, List, Tuple
+import hashlib
+import math
+import numpy as np
+from ..core.config import AreaConfig
+from ..core.geo import KM_PER_DEGREE_LAT
+from .grid import RasterGrid
+
+@dataclass
+class AreaSpans:
+    """Pixels of one area on one grid as row spans: columns [col0, col1) of each row"""
+    rows: np.ndarray
+    col0: np.ndarray
+    col1: np.ndarray
+
+    @property
+    def pixel_count(self) -> int:
+        return int((self.col1 - self.col0).sum())
+
+@dataclass
+class WindowSpans:
+    """Spans of all areas falling in one processing window, in window-local coordinates"""
+    bounds: Tuple[int, int, int, int]  # (row0, row1, col0, col1) of the region to read
+    area_index: np.ndarray             # area position in ZonalMasks.area_keys, per span
+    rows: np.ndarray
+    col0: np.ndarray
+    col1: np.ndarray
+
+@dataclass
+class ZonalMasks:
+    """Precomputed pixel membership of a set of areas on a raster grid, grouped by window"""
+    area_keys: List[str]
+    windows: Dict[Tuple[int, int], WindowSpans]
+
+def grid_fingerprint(grid: RasterGrid) -> str:
+    return hashlib.sha256(repr(astuple(grid)).encode()).hexdigest()
+
+def area_fingerprint(area: AreaConfig) -> Tuple[float, float, float]:
+    """The fields of an area config that decide which pixels it covers"""
+    return (area.latitude, area.longitude, area.radius_km)
+
+def build_area_spans(grid: RasterGrid, area: AreaConfig) -> AreaSpans:
+    """
+    Row spans of the pixels whose centers fall within the area's circle. Matches
+    RasterGrid.circle_mask without materializing a mask.
+    """
+    empty = np.zeros(0, dtype=np.int32)
+    bounds = grid.area_bounds(area.latitude, area.longitude, area.radius_km)
+    if bounds is None:
+        return AreaSpans(empty, empty, empty)
+
+    row0, row1, _, _ = bounds
+    rows = np.arange(row0, row1, dtype=np.int32)
+    dy = (grid.row_latitudes(row0, row1) - area.latitude) * KM_PER_DEGREE_LAT
+    half_width_sq = area.radius_km ** 2 - dy ** 2
+    inside = half_width_sq >= 0
+    rows, half_width_sq = rows[inside], half_width_sq[inside]
+
+    # Columns whose center longitude lies within the half width of the chord
+    km_per_degree_lon = KM_PER_DEGREE_LAT * math.cos(math.radians(area.latitude))
+    half_width_deg = np.sqrt(half_width_sq) / km_per_degree_lon
+    first = (area.longitude - half_width_deg - grid.origin_lon) / grid.pixel_size_lon - 0.5
+    last = (area.longitude + half_width_deg - grid.origin_lon) / grid.pixel_size_lon - 0.5
+    col0 = np.clip(np.ceil(first), 0, grid.cols).astype(np.int32)
+    col1 = np.clip(np.floor(last) + 1, 0, grid.cols).astype(np.int32)
+
+    # Trim columns where rounding disagrees with the exact mask test
+    def covered(cols: np.ndarray) -> np.ndarray:
+        lon = grid.origin_lon + (cols + 0.5) * grid.pixel_size_lon
+        dx = (lon - area.longitude) * km_per_degree_lon
+        return dx ** 2 + (area.radius_km ** 2 - half_width_sq) <= area.radius_km ** 2
+
+    col0 += ~covered(col0) & (col0 < col1)
+    col1 -= ~covered(col1 - 1) & (col0 < col1)
+
+    nonempty = col1 > col0
+    return AreaSpans(rows[nonempty], col0[nonempty], col1[nonempty])
+
+class ZonalMaskCache:
+    """
+    Caches each area's pixel spans per raster grid. Entries are keyed by the
+    area's geometry, so changing an area config rebuilds only that area and
+    stale entries are dropped when masks are next assembled.
+    """
+
+    def __init__(self, window_size: int):
+        self.window_size = window_size
+        self._spans: Dict[Tuple[str, str], Tuple[Tuple[float, float, float], AreaSpans]] = {}
+        self._masks: Dict[str, Tuple[Tuple, ZonalMasks]] = {}
+
+    def masks_for(self, grid: RasterGrid, areas: Dict[str, AreaConfig]) -> ZonalMasks:
+        grid_key = grid_fingerprint(grid)
+        areas_key = tuple(sorted(
+            (area_key, area_fingerprint(area)) for area_key, area in areas.items()
+        ))
+        cached = self._masks.get(grid_key)
+        if cached is not None and cached[0] == areas_key:
+            return cached[1]
+
+        area_keys = sorted(areas)
+        spans = [self._area_spans(grid, grid_key, area_key, areas[area_key]) for area_key in area_keys]
+        # Forget spans of areas on this grid that are gone or have changed
+        for cache_key in [key for key in self._spans if key[0] == grid_key and key[1] not in areas]:
+            del self._spans[cache_key]
+
+        masks = ZonalMasks(area_keys, self._group_by_window(spans))
+        self._masks[grid_key] = (areas_key, masks)
+        return masks
+
+    def invalidate(self):
+        self._spans.clear()
+        self._masks.clear()
+
+    def _area_spans(self, grid: RasterGrid, grid_key: str, area_key: str,
+                    area: AreaConfig) -> AreaSpans:
+        fingerprint = area_fingerprint(area)
+        cached = self._spans.get((grid_key, area_key))
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, build_area_spans(grid, area))
+            self._spans[(grid_key, area_key)] = cached
+        return cached[1]
+
+    def _group_by_window(self, spans: List[AreaSpans]) -> Dict[Tuple[int, int], WindowSpans]:
+        size = self.window_size
+        pieces: Dict[Tuple[int, int], List[np.ndarray]] = {}
+        for area_index, area_spans in enumerate(spans):
+            if not len(area_spans.rows):
+                continue
+            window_rows = area_spans.rows // size
+            # Split spans at window column boundaries
+            for window_col in range(int(area_spans.col0.min()) // size,
+                                    (int(area_spans.col1.max()) - 1) // size + 1):
+                col0 = np.maximum(area_spans.col0, window_col * size)
+                col1 = np.minimum(area_spans.col1, (window_col + 1) * size)
+                part = col1 > col0
+                for window_row in np.unique(window_rows[part]):
+                    selected = part & (window_rows == window_row)
+                    pieces.setdefault((int(window_row), window_col), []).append(np.stack([
+                        np.full(selected.sum(), area_index, dtype=np.int32),
+                        area_spans.rows[selected], col0[selected], col1[selected]
+                    ]))
+
+        windows = {}
+        for window, parts in pieces.items():
+            area_index, rows, col0, col1 = np.concatenate(parts, axis=1)
+            bounds = (int(rows.min()), int(rows.max()) + 1, int(col0.min()), int(col1.max()))
+            windows[window] = WindowSpans(
+                bounds=bounds,
+                area_index=area_index,
+                rows=rows - bounds[0],
+                col0=col0 - bounds[2],
+                col1=col1 - bounds[2]
+            )
+        return windows
+
+def zonal_reduce(window: WindowSpans, area_count: int, weights: np.ndarray,
+                 sum_values: List[np.ndarray],
+                 max_values: List[np.ndarray]) -> Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]]:
+    """
+    Reduce a window region for all of its areas at once. Returns per-area
+    weight totals, weighted sums of each array in sum_values, and maxima of
+    each array in max_values over pixels with non-zero weight. All arrays
+    cover window.bounds.
+    """
+    lengths = window.col1 - window.col0
+    width = weights.shape[1]
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    # Flat index of every covered pixel, span after span
+    pixels = np.repeat(window.rows * width + window.col0 - offsets, lengths) + np.arange(lengths.sum())
+    pixel_areas = np.repeat(window.area_index, lengths)
+    pixel_weights = weights.ravel()[pixels].astype(np.float64)
+
+    counts = np.bincount(pixel_areas, weights=pixel_weights, minlength=area_count)
+    sums = [
+        np.bincount(pixel_areas, weights=values.ravel()[pixels] * pixel_weights, minlength=area_count)
+        for values in sum_values
+    ]
+
+    maxima = []
+    for values in max_values:
+        # Max per span in one pass over contiguous segments, then per area
+        span_max = np.maximum.reduceat(
+            np.where(pixel_weights > 0, values.ravel()[pixels], -np.inf), offsets
+        )
+        area_max = np.full(area_count, -np.inf)
+        np.maximum.at(area_max, window.area_index, span_max)
+        maxima.append(area_max)
+
+    return counts, sums, maxima
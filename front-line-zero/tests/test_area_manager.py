@@ -0,0 +1,118 @@
+import json
+import numpy as np
+import pytest
+from src.core.area_manager import AreaManager, area_key
+from src.core.config import AreaConfig
+
+def area(name: str, latitude: float, longitude: float, radius_km: float = 2.0) -> AreaConfig:
+    return AreaConfig(name=name, latitude=latitude, longitude=longitude,
+                      radius_km=radius_km, risk_threshold=0.7)
+
+@pytest.fixture
+def manager():
+    return AreaManager(areas={
+        "a": area("A", 40.0, -7.5),
+        "b": area("B", 40.5, -7.5),
+        "c": area("C", 41.0, -8.0)
+    })
+
+def test_area_key_normalizes_names():
+    assert area_key("Castelo Novo") == "castelo_novo"
+    assert area_key("Fundão") == "fundao"
+
+def test_load_csv(tmp_path):
+    path = tmp_path / "areas.csv"
+    path.write_text(
+        "key,name,latitude,longitude,radius_km,risk_threshold\n"
+        "Zone_A,Zone A,40.1,-7.5,3,0.8\n"
+        ",Castelo Novo,40.0,-7.4,,\n",
+        encoding="utf-8"
+    )
+    manager = AreaManager(areas={})
+    assert manager.load_csv(path) == 2
+    assert manager.keys == ["zone_a", "castelo_novo"]
+    zone = manager.get_area("zone_a")
+    assert zone.name == "Zone A"
+    assert zone.radius_km == 3.0
+    assert zone.risk_threshold == 0.8
+
+def test_load_csv_rejects_duplicate_keys(tmp_path):
+    path = tmp_path / "areas.csv"
+    path.write_text("key,name,latitude,longitude\nZone_A,A,40,-7\nzone_a,B,41,-7\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Duplicate area keys"):
+        AreaManager(areas={}).load_csv(path)
+
+def test_load_csv_rejects_missing_columns(tmp_path):
+    path = tmp_path / "areas.csv"
+    path.write_text("name,latitude\nA,40\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        AreaManager(areas={}).load_csv(path)
+
+def test_load_geojson(tmp_path):
+    path = tmp_path / "areas.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        {"type": "Feature", "id": "Point_1",
+         "properties": {"name": "Point", "radius_km": 5},
+         "geometry": {"type": "Point", "coordinates": [-7.5, 40.0]}},
+        {"type": "Feature",
+         "properties": {"name": "Square"},
+         "geometry": {"type": "Polygon", "coordinates": [[
+             [-7.6, 40.4], [-7.4, 40.4], [-7.4, 40.6], [-7.6, 40.6], [-7.6, 40.4]
+         ]]}}
+    ]}), encoding="utf-8")
+    manager = AreaManager(areas={})
+    assert manager.load_geojson(path) == 2
+    assert manager.keys == ["point_1", "square"]
+    assert manager.get_area("point_1").radius_km == 5
+    square = manager.get_area("square")
+    assert square.center_coords == pytest.approx((40.5, -7.5))
+    # The circle encloses the corners, about 14 km from the center
+    assert 13 < square.radius_km < 15
+
+def test_add_replaces_existing_keys(manager):
+    manager.add_areas({"a": area("A2", 40.2, -7.5)})
+    assert len(manager.keys) == 3
+    assert manager.get_area("a").name == "A2"
+
+def test_remove_keeps_other_areas_addressable(manager):
+    manager.remove_area("a")
+    assert sorted(manager.keys) == ["b", "c"]
+    assert manager.get_area("c").center_coords == (41.0, -8.0)
+    with pytest.raises(ValueError):
+        manager.get_area("a")
+
+def test_areas_in_bounds(manager):
+    assert sorted(manager.areas_in_bounds(39.9, -7.6, 40.6, -7.4)) == ["a", "b"]
+    assert manager.areas_in_bounds(39.0, -9.0, 39.5, -8.5) == []
+    # Areas are matched by their circle's bounding box, not only the center
+    assert manager.areas_in_bounds(40.01, -7.49, 40.02, -7.48) == ["a"]
+
+def test_areas_in_bounds_after_changes(manager):
+    manager.areas_in_bounds(0, 0, 1, 1)  # Build the index
+    manager.add_areas({"d": area("D", 40.05, -7.45)})
+    manager.remove_area("b")
+    assert sorted(manager.areas_in_bounds(39.9, -7.6, 40.6, -7.4)) == ["a", "d"]
+
+def test_areas_in_bounds_matches_brute_force():
+    rng = np.random.default_rng(1)
+    count = 500
+    manager = AreaManager(areas={
+        f"area_{i}": area(f"Area {i}", lat, lon, radius)
+        for i, (lat, lon, radius) in enumerate(zip(
+            rng.uniform(39, 42, count), rng.uniform(-9, -6, count), rng.uniform(0.5, 10, count)
+        ))
+    })
+    south, west, north, east = 40.0, -8.0, 40.7, -7.2
+    lat_pad = manager.radii_km / 111.195
+    lon_pad = manager.radii_km / (111.195 * np.cos(np.radians(manager.latitudes)))
+    expected = {
+        key for key, lat, lon, dlat, dlon in zip(
+            manager.keys, manager.latitudes, manager.longitudes, lat_pad, lon_pad
+        )
+        if lat - dlat <= north and lat + dlat >= south and lon - dlon <= east and lon + dlon >= west
+    }
+    assert set(manager.areas_in_bounds(south, west, north, east)) == expected
+
+def test_areas_near_orders_by_distance(manager):
+    assert manager.areas_near((40.0, -7.5), 60) == ["a", "b"]
+    assert manager.areas_near((40.0, -7.5), 1) == ["a"]
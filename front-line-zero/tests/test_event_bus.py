@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from src.core.event_bus import BusBroker, EventBus, InProcessEventBus, LeaderElection, SocketEventBus
+
+def collecting_handler(received):
+    async def handler(message):
+        if message.get("fail"):
+            raise KeyError("bad message")
+        received.append(message)
+    return handler
+
+def test_in_process_delivery_survives_a_failing_handler():
+    received = []
+
+    async def scenario():
+        bus = InProcessEventBus()
+        bus.subscribe("state", collecting_handler(received))
+        await bus.start()
+        await bus.publish("state", {"fail": True})
+        await bus.publish("state", {"n": 1})
+
+    asyncio.run(scenario())
+    assert received == [{"n": 1}]
+
+def test_socket_bus_keeps_reading_after_a_failing_handler():
+    received = []
+
+    async def scenario():
+        broker = BusBroker("127.0.0.1", 0)
+        await broker.start()
+        bus = SocketEventBus("127.0.0.1", broker.port, reconnect_delay=0.05)
+        bus.subscribe("state", collecting_handler(received))
+        await bus.start()
+        try:
+            for message in ({"fail": True}, {"n": 1}, {"n": 2}):
+                await bus.publish("state", message)
+            await asyncio.sleep(0.2)
+            assert bus.connected
+            assert not bus._reader_task.done()
+        finally:
+            await bus.close()
+            await broker.close()
+
+    asyncio.run(scenario())
+    assert received == [{"n": 1}, {"n": 2}]
+
+def test_one_leader_at_a_time():
+    async def scenario():
+        bus = InProcessEventBus()
+        await bus.start()
+        first, second = LeaderElection(bus, ttl=0.3), LeaderElection(bus, ttl=0.3)
+        tasks = [asyncio.create_task(first.run()), asyncio.create_task(second.run())]
+        await asyncio.sleep(0.05)
+        leaders = [first.is_leader, second.is_leader]
+        # Both know a leader exists, so both accept inputs for it
+        assert first.has_leader and second.has_leader
+        # The leader resigns; the other takes over on its next renewal
+        leader, follower = (first, second) if first.is_leader else (second, first)
+        tasks[0 if leader is first else 1].cancel()
+        await leader.resign()
+        await asyncio.sleep(0.2)
+        took_over = follower.is_leader
+        for task in tasks:
+            task.cancel()
+        return leaders, took_over
+
+    leaders, took_over = asyncio.run(scenario())
+    assert sorted(leaders) == [False, True]
+    assert took_over
+
+def test_incomplete_bus_cannot_be_created():
+    class Incomplete(EventBus):
+        async def start(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
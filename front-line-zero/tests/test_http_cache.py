@@ -0,0 +1,81 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from src.api.http_cache import Payload, ResponseCache
+
+def request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_body_is_built_once_per_version():
+    cache = ResponseCache(max_entries=4)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return Payload({"value": len(builds)}, {"X-Next-Cursor": "c"})
+
+    first = cache.respond(request(), "resource", 1, build)
+    second = cache.respond(request(), "resource", 1, build)
+    assert first.body == second.body == b'{"value":1}'
+    assert second.headers["X-Next-Cursor"] == "c"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    third = cache.respond(request(), "resource", 2, build)
+    assert third.body == b'{"value":2}'
+    assert third.headers["ETag"] != first.headers["ETag"]
+
+def test_matching_etag_gets_304():
+    cache = ResponseCache(max_entries=4)
+    etag = cache.respond(request(), "resource", (3, 1), lambda: [1]).headers["ETag"]
+    assert cache.respond(request(etag), "resource", (3, 1), lambda: [1]).status_code == 304
+    assert cache.respond(request(f'W/{etag}, "other"'), "resource", (3, 1), lambda: [1]).status_code == 304
+    assert cache.respond(request(etag), "resource", (4, 1), lambda: [1]).status_code == 200
+
+def test_etags_differ_between_instances():
+    # Versions restart with the process, ETags must not
+    assert ResponseCache(1).etag(1) != ResponseCache(1).etag(1)
+
+def test_cache_is_bounded():
+    cache = ResponseCache(max_entries=2)
+    for version in range(5):
+        cache.respond(request(), "resource", version, lambda: [version])
+    assert len(cache._bodies) == 2
+
+@pytest.fixture(scope="module")
+def client():
+    from src.api import routes
+    from src.core.config import FLZConfig
+    persistence = FLZConfig.PERSISTENCE_ENABLED
+    FLZConfig.PERSISTENCE_ENABLED = False  # Components are built at startup; keep data/ untouched
+    try:
+        with TestClient(routes.app) as client:
+            routes.components.warm_up()
+            yield client, routes
+    finally:
+        FLZConfig.PERSISTENCE_ENABLED = persistence
+
+HEADERS = {"X-API-Key": "YOUR_API_KEY"}
+
+def test_unchanged_area_risk_gets_304(client):
+    client, _ = client
+    response = client.get("/areas/risk", headers=HEADERS)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    # Reads that find nothing to re-assess must not change the version
+    client.get("/areas/fundao/risk", headers=HEADERS)
+    again = client.get("/areas/risk", headers={**HEADERS, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+
+def test_changed_fleet_gets_new_etag(client):
+    client, routes = client
+    response = client.get("/drones", headers=HEADERS)
+    etag = response.headers["ETag"]
+    assert client.get("/drones", headers={**HEADERS, "If-None-Match": etag}).status_code == 304
+
+    drone_id = response.json()[0]["id"]
+    assert client.post(f"/drones/{drone_id}/recall", headers=HEADERS).status_code == 200
+    changed = client.get("/drones", headers={**HEADERS, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()[0]["status"] == "returning"
@@ -0,0 +1,20 @@
+import pytest
+from src.core.metrics import MetricsRegistry, _Metric
+
+def test_labeled_counter_renders_each_series():
+    registry = MetricsRegistry()
+    counter = registry.counter("flz_test_total", "Test counter", ["outcome"])
+    counter.labels("ok").inc()
+    counter.labels("ok").inc(2)
+    counter.labels("failed").inc()
+
+    lines = registry.render().splitlines()
+    assert 'flz_test_total{outcome="ok"} 3.0' in lines
+    assert 'flz_test_total{outcome="failed"} 1.0' in lines
+
+def test_metric_without_series_cannot_be_created():
+    class Incomplete(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Incomplete("flz_incomplete", "No series type")
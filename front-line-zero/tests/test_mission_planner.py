@@ -0,0 +1,64 @@
+from datetime import datetime
+import itertools
+import time
+import numpy as np
+import pytest
+from src.flz_drones.eagle_nests_network import DRONE_SPECS, Mission, MissionPriority
+from src.flz_drones.fleet_manager import Drone, DroneStatus
+from src.flz_drones.mission_planner import BatchMissionPlanner, solve_assignment
+
+def brute_force_cost(costs: np.ndarray) -> float:
+    rows = range(costs.shape[0])
+    return min(
+        costs[rows, list(columns)].sum()
+        for columns in itertools.permutations(range(costs.shape[1]), costs.shape[0])
+    )
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (4, 6), (6, 6)])
+def test_solve_assignment_is_optimal(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(5):
+        costs = rng.uniform(0, 10, shape)
+        columns, timed_out = solve_assignment(costs)
+        assert not timed_out
+        assert len(set(columns.tolist())) == shape[0]
+        assert costs[range(shape[0]), columns].sum() == pytest.approx(brute_force_cost(costs))
+
+def test_solve_assignment_falls_back_to_greedy_after_deadline():
+    costs = np.random.default_rng(0).uniform(0, 10, (5, 7))
+    columns, timed_out = solve_assignment(costs, deadline=time.perf_counter() - 1)
+    assert timed_out
+    # Every row still gets a distinct column
+    assert sorted(set(columns.tolist())) == sorted(columns.tolist())
+    assert (columns >= 0).all()
+
+def test_solve_assignment_needs_enough_columns():
+    with pytest.raises(ValueError):
+        solve_assignment(np.zeros((3, 2)))
+
+def drone(drone_id: str, coords, battery: int = 100, model: str = "sentinel") -> Drone:
+    return Drone(id=drone_id, name=drone_id, specs=DRONE_SPECS[model], status=DroneStatus.IDLE,
+                 battery_level=battery, current_coords=coords, home_nest="nest")
+
+def mission(mission_id: str, coords, priority: MissionPriority = MissionPriority.HIGH,
+            cameras=()) -> Mission:
+    return Mission(id=mission_id, target_area="area", priority=priority, start_time=datetime.now(),
+                   estimated_duration=30, target_coords=coords, status="PENDING",
+                   required_cameras=list(cameras))
+
+def test_plan_assigns_nearest_drones_overall():
+    drones = [drone("d1", (40.00, -7.50)), drone("d2", (40.05, -7.50))]
+    missions = [mission("m1", (40.04, -7.50)), mission("m2", (40.01, -7.50))]
+    plan = BatchMissionPlanner().plan(missions, drones)
+    assert {(a.mission_id, a.drone_id) for a in plan.assignments} == {("m1", "d2"), ("m2", "d1")}
+    assert plan.unassigned == []
+
+def test_plan_leaves_infeasible_missions_unassigned():
+    drones = [
+        drone("far", (41.0, -7.5)),                    # Out of range
+        drone("flat", (40.0, -7.5), battery=10),       # Below minimum battery
+        drone("scout", (40.0, -7.5), model="scout")    # No multispectral camera
+    ]
+    plan = BatchMissionPlanner().plan([mission("m1", (40.0, -7.5), cameras=["Multispectral"])], drones)
+    assert plan.assignments == []
+    assert plan.unassigned == ["m1"]
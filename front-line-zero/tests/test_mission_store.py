@@ -0,0 +1,73 @@
+from datetime import datetime
+import pytest
+from src.flz_drones.eagle_nests_network import Mission, MissionPriority
+from src.flz_drones.mission_store import MissionStore
+
+def mission(store: MissionStore, area: str, priority: MissionPriority = MissionPriority.HIGH,
+            status: str = "PENDING") -> Mission:
+    return Mission(id=store.new_id(), target_area=area, priority=priority, start_time=datetime.now(),
+                   estimated_duration=30, target_coords=(40.0, -7.5), status=status)
+
+@pytest.fixture
+def store():
+    return MissionStore(archive_size=2)
+
+def test_new_ids_are_unique_and_sorted(store):
+    ids = [store.new_id() for _ in range(100)]
+    assert len(set(ids)) == 100
+    assert ids == sorted(ids)
+
+def test_query_by_status_priority_and_area(store):
+    first = mission(store, "a", MissionPriority.HIGH)
+    second = mission(store, "b", MissionPriority.LOW, status="ASSIGNED")
+    third = mission(store, "a", MissionPriority.LOW, status="ASSIGNED")
+    for item in (first, second, third):
+        store.add(item)
+
+    assert store.query() == [first, second, third]
+    assert store.query(statuses=["ASSIGNED"]) == [second, third]
+    assert store.query(areas=["a"]) == [first, third]
+    assert store.query(statuses=["ASSIGNED"], priorities=[MissionPriority.LOW], areas=["a"]) == [third]
+    assert store.query(areas=["missing"]) == []
+    assert store.status_counts() == {"PENDING": 1, "ASSIGNED": 2}
+
+def test_set_status_moves_the_index(store):
+    item = mission(store, "a")
+    store.add(item)
+    store.set_status(item, "ASSIGNED")
+    assert item.status == "ASSIGNED"
+    assert store.query(statuses=["PENDING"]) == []
+    assert store.query(statuses=["ASSIGNED"]) == [item]
+
+def test_complete_moves_to_archive(store):
+    item = mission(store, "a")
+    store.add(item)
+    store.complete(item)
+    assert item.id not in store.active
+    assert store[item.id] is item
+    assert item.status == "COMPLETED"
+    assert item.completion_time is not None
+    assert store.query(areas=["a"]) == []
+    assert store.status_counts() == {}
+
+def test_archive_keeps_most_recent(store):
+    items = [mission(store, "a") for _ in range(3)]
+    for item in items:
+        store.add(item)
+        store.complete(item)
+    assert items[0].id not in store
+    assert list(store.archive) == [items[1].id, items[2].id]
+    assert len(store) == 2
+
+def test_completed_missions_are_added_to_the_archive(store):
+    item = mission(store, "a", status="COMPLETED")
+    item.completion_time = datetime.now()
+    store.add(item)
+    assert item.id in store.archive
+    assert store.active == {}
+
+def test_duplicate_ids_are_rejected(store):
+    item = mission(store, "a")
+    store.add(item)
+    with pytest.raises(ValueError):
+        store.add(item)
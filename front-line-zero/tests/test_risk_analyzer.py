@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from src.core.config import AreaConfig
+from src.core.risk_analyzer import RiskAnalyzer
+
+AREAS = {
+    "north": AreaConfig(name="North", latitude=40.3, longitude=-7.5, radius_km=4.0, risk_threshold=0.6),
+    "south": AreaConfig(name="South", latitude=40.0, longitude=-7.5, radius_km=4.0, risk_threshold=0.6),
+    "east": AreaConfig(name="East", latitude=40.1, longitude=-7.2, radius_km=4.0, risk_threshold=0.9),
+}
+
+INPUTS = {
+    "north": {"surface_temp_max": 47.0, "surface_temp_mean": 38.0, "ndvi_mean": 0.1},
+    "south": {"surface_temp_max": 22.0, "surface_temp_mean": 18.0, "ndvi_mean": 0.7},
+}
+
+def make_analyzer() -> RiskAnalyzer:
+    analyzer = RiskAnalyzer(workers=1)
+    for area_key in list(analyzer.area_manager.areas):
+        analyzer.area_manager.remove_area(area_key)
+    analyzer.area_manager.add_areas(AREAS)
+    for area_key, statistics in INPUTS.items():
+        analyzer.update_inputs(area_key, statistics)
+    # Raw rasters go through the reduction path instead of precomputed statistics
+    rng = np.random.default_rng(0)
+    analyzer.update_inputs("east", {
+        "surface_temp": rng.uniform(15, 45, (50, 50)),
+        "ndvi": rng.uniform(0.1, 0.8, (50, 50))
+    })
+    return analyzer
+
+@pytest.fixture
+def analyzer():
+    analyzer = make_analyzer()
+    yield analyzer
+    analyzer.close()
+
+def test_batch_matches_single_area_assessments(analyzer):
+    batch = analyzer.analyze_areas()
+    single = make_analyzer()
+    try:
+        for area_key in batch.area_keys:
+            expected = single.analyze_area(area_key)
+            assessment = batch.get(area_key)
+            assert assessment.area_name == expected.area_name
+            assert assessment.area_key == area_key
+            assert assessment.total_risk_level == pytest.approx(expected.total_risk_level)
+            assert assessment.alert_level == expected.alert_level
+            assert assessment.requires_drone_inspection == expected.requires_drone_inspection
+            assert [factor.value for factor in assessment.risk_factors] == pytest.approx(
+                [factor.value for factor in expected.risk_factors]
+            )
+    finally:
+        single.close()
+
+def test_hot_dry_area_scores_above_cool_green_area(analyzer):
+    batch = analyzer.analyze_areas(["north", "south"])
+    assert batch.get("north").total_risk_level > batch.get("south").total_risk_level
+
+def test_refresh_assesses_only_dirty_areas(analyzer):
+    assert analyzer.get_dirty_areas() == set(AREAS)
+    assert sorted(analyzer.refresh().area_keys) == sorted(AREAS)
+    assert analyzer.get_dirty_areas() == set()
+
+    analyzer.update_inputs("north", {**INPUTS["north"], "ndvi_mean": 0.5})
+    assert analyzer.get_dirty_areas() == {"north"}
+    assert analyzer.refresh().area_keys == ["north"]
+
+def test_refresh_with_nothing_dirty_keeps_state_version(analyzer):
+    analyzer.refresh()
+    version = analyzer.state_version
+    assert len(analyzer.refresh()) == 0
+    analyzer.get_high_risk_areas()
+    assert analyzer.state_version == version
+
+def test_unchanged_fingerprint_does_not_mark_dirty(analyzer):
+    analyzer.update_inputs("north", INPUTS["north"], fingerprint="product-1")
+    analyzer.refresh()
+    assert not analyzer.update_inputs("north", INPUTS["north"], fingerprint="product-1")
+    assert analyzer.get_dirty_areas() == set()
+
+def test_clean_areas_are_served_from_cache(analyzer):
+    analyzer.refresh()
+    version = analyzer.get_state_version("south")
+    table = analyzer.get_risk_table(["south", "north"])
+    assert table["area"] == ["south", "north"]
+    assert analyzer.get_state_version("south") == version
+
+def test_unknown_area_is_rejected(analyzer):
+    with pytest.raises(ValueError):
+        analyzer.update_inputs("nowhere", INPUTS["north"])
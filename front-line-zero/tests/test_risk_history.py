@@ -0,0 +1,53 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from src.core.risk_history import RiskHistory, RiskHistoryBuffer
+
+def test_buffer_keeps_newest_samples_when_full():
+    buffer = RiskHistoryBuffer(capacity=4, retention_seconds=1e9, window=2)
+    for step in range(10):
+        buffer.append(float(step), step / 10)
+    timestamps, risks = buffer.to_arrays()
+    assert timestamps.tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert risks == pytest.approx([0.6, 0.7, 0.8, 0.9])
+    assert buffer.latest == pytest.approx((9.0, 0.9))
+
+def test_buffer_means_track_a_reference():
+    rng = np.random.default_rng(0)
+    capacity, window = 8, 3
+    buffer = RiskHistoryBuffer(capacity, retention_seconds=1e9, window=window)
+    samples = []
+    for step, risk in enumerate(rng.uniform(0, 1, 50)):
+        buffer.append(float(step), float(risk))
+        samples.append(float(np.float32(risk)))
+        kept = samples[-capacity:]
+        assert buffer.mean == pytest.approx(np.mean(kept))
+        assert buffer.recent_mean == pytest.approx(np.mean(kept[-window:]))
+
+def test_buffer_evicts_expired_samples():
+    buffer = RiskHistoryBuffer(capacity=10, retention_seconds=5, window=3)
+    for step in range(4):
+        buffer.append(float(step), 0.5)
+    buffer.append(7.0, 1.0)
+    # Samples at or before 7 - 5 are gone
+    assert buffer.to_arrays()[0].tolist() == [3.0, 7.0]
+    assert buffer.mean == pytest.approx(0.75)
+
+def test_empty_buffer():
+    buffer = RiskHistoryBuffer(capacity=4, retention_seconds=10, window=2)
+    assert len(buffer) == 0
+    assert buffer.mean == 0.0
+    assert buffer.recent_mean == 0.0
+    assert buffer.latest is None
+
+def test_history_export_restore_round_trip():
+    history = RiskHistory(capacity=3, retention_days=1, window=2)
+    now = datetime.now()
+    history.append_many(["a", "b"], now, np.array([0.2, 0.4]))
+    history.append("a", now, 0.6)
+    names, offsets, timestamps, risks = history.export()
+
+    restored = RiskHistory(capacity=3, retention_days=1, window=2)
+    restored.restore(names, offsets, timestamps, risks)
+    assert restored.recent_means(["a", "b", "c"]) == pytest.approx([0.4, 0.4, 0.0])
+    assert restored["a"].to_arrays()[1] == pytest.approx([0.2, 0.6])
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+from src.core.risk_pipeline import CoalescingQueue, RiskPipeline
+from src.core.risk_analyzer import RiskAnalyzer
+
+DEBOUNCE = 0.05
+MAX_DELAY = 0.25
+
+async def run_queue(events, wait: float):
+    """Put (delay, key, payload) events, then wait; returns (handled at, pending) per batch"""
+    batches = []
+
+    async def handler(pending):
+        batches.append((time.time(), dict(pending)))
+
+    queue = CoalescingQueue("test", handler, debounce=DEBOUNCE, max_delay=MAX_DELAY)
+    runner = asyncio.create_task(queue.run())
+    started = time.time()
+    for delay, key, payload in events:
+        await asyncio.sleep(delay)
+        queue.put(key, payload)
+    await asyncio.sleep(wait)
+    runner.cancel()
+    return started, batches
+
+def test_burst_is_coalesced_into_one_batch():
+    started, batches = asyncio.run(run_queue(
+        [(0, "a", 1), (0.01, "b", 1), (0.01, "a", 2)], wait=0.2
+    ))
+    assert len(batches) == 1
+    handled, pending = batches[0]
+    # Latest payload per key, earliest arrival kept
+    assert {key: payload for key, (_, payload) in pending.items()} == {"a": 2, "b": 1}
+    assert pending["a"][0] - started < 0.01
+    # Handled once the burst went quiet for the debounce period
+    assert DEBOUNCE <= handled - started - 0.02 < DEBOUNCE + 0.1
+
+def test_steady_stream_is_handled_within_max_delay():
+    events = [(DEBOUNCE / 2, f"key{i}", i) for i in range(30)]  # Never quiet for DEBOUNCE
+    started, batches = asyncio.run(run_queue(events, wait=0.4))
+    assert len(batches) >= 2
+    first_handled, first = batches[0]
+    oldest = min(arrived for arrived, _ in first.values())
+    assert first_handled - oldest < MAX_DELAY + 0.1
+    assert sum(len(pending) for _, pending in batches) == 30
+
+def test_queue_is_idle_without_events():
+    _, batches = asyncio.run(run_queue([], wait=0.1))
+    assert batches == []
+
+def test_failed_batch_does_not_stop_the_queue():
+    handled = []
+
+    async def handler(pending):
+        if "bad" in pending:
+            raise RuntimeError("boom")
+        handled.extend(pending)
+
+    async def scenario():
+        queue = CoalescingQueue("failing", handler, debounce=DEBOUNCE, max_delay=MAX_DELAY)
+        runner = asyncio.create_task(queue.run())
+        queue.put("bad")
+        await asyncio.sleep(0.15)
+        queue.put("good")
+        await asyncio.sleep(0.15)
+        runner.cancel()
+
+    asyncio.run(scenario())
+    assert handled == ["good"]
+
+def test_pipeline_rescores_submitted_areas_once_per_batch():
+    analyzer = RiskAnalyzer(workers=1)
+    analyzer.refresh()
+    executor = ThreadPoolExecutor(max_workers=1)
+    published = []
+
+    async def publish(batch):
+        published.append(list(batch.area_keys))
+
+    async def scenario():
+        pipeline = RiskPipeline(lambda: analyzer, executor, publish, debounce=DEBOUNCE, max_delay=MAX_DELAY)
+        runner = asyncio.create_task(pipeline.run())
+        statistics = {"surface_temp_max": 45.0, "surface_temp_mean": 35.0, "ndvi_mean": 0.2}
+        pipeline.submit("Fundao", statistics, fingerprint="p1")
+        pipeline.submit("fundao", {**statistics, "ndvi_mean": 0.1}, fingerprint="p2")
+        pipeline.submit("nowhere", statistics)
+        await asyncio.sleep(0.3)
+        runner.cancel()
+        return pipeline
+
+    try:
+        pipeline = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+        analyzer.close()
+    assert published == [["fundao"]]
+    assert pipeline.rejected == 1
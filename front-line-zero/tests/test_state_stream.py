@@ -0,0 +1,24 @@
+import pytest
+from src.api.state_stream import TOPICS, Subscription
+
+def test_subscription_from_lists():
+    subscription = Subscription.from_message({
+        "action": "subscribe", "topics": ["areas", "unknown"], "alert_levels": ["HIGH", "CRITICAL"]
+    })
+    assert subscription.topics == frozenset({"areas"})
+    assert subscription.alert_levels == frozenset({"HIGH", "CRITICAL"})
+    assert subscription.areas is None
+
+def test_single_string_is_one_value():
+    subscription = Subscription.from_message({"topics": "areas", "areas": "fundao"})
+    assert subscription.topics == frozenset({"areas"})
+    assert subscription.areas == frozenset({"fundao"})
+
+def test_missing_topics_means_all():
+    assert Subscription.from_message({}).topics == frozenset(TOPICS)
+    assert Subscription.from_message({"topics": []}).topics == frozenset(TOPICS)
+
+@pytest.mark.parametrize("message", [{"areas": {"fundao": 1}}, {"drones": 3}, {"topics": ["areas", 1]}])
+def test_invalid_filters_are_rejected(message):
+    with pytest.raises(ValueError):
+        Subscription.from_message(message)
@@ -0,0 +1,36 @@
+from datetime import datetime
+import pytest
+from src.core.store import StateStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(root=tmp_path, flush_interval=0)
+    yield store
+    store.close()
+
+def record(mission_id: str, start_time: float, completion_time: float = None) -> dict:
+    return {"id": mission_id, "start_time": start_time, "completion_time": completion_time}
+
+def test_recent_missions_are_active_and_newest_completed(store):
+    for mission in (
+        record("done_1", 1.0, 10.0), record("active_1", 2.0), record("done_2", 3.0, 30.0),
+        record("done_3", 4.0, 20.0), record("active_2", 5.0)
+    ):
+        store.record_mission(mission)
+    # A later state replaces the earlier one; this mission completed last
+    store.record_mission(record("active_1", 2.0, 40.0))
+    store.flush()
+
+    assert [mission["id"] for mission in store.recent_missions(completed=2)] == [
+        "done_2", "active_1", "active_2"
+    ]
+    assert len(store.missions()) == 5
+
+def test_prune_drops_completed_missions_only(store):
+    for mission in (record("old", 1.0, 2.0), record("new", 1.0, 50.0), record("active", 1.0)):
+        store.record_mission(mission)
+    store.flush()
+    store.prune(datetime.fromtimestamp(10.0))
+    store.flush()
+
+    assert sorted(mission["id"] for mission in store.missions()) == ["active", "new"]
@@ -0,0 +1,117 @@
+import json
+import numpy as np
+import pytest
+from src.flz_drones.eagle_nests_network import DroneStatus, EagleNestsNetwork
+from src.flz_drones.telemetry import TELEMETRY_FRAME_DTYPE, TelemetryBuffer, TelemetryIngestor, encode_frames
+
+@pytest.fixture
+def network():
+    return EagleNestsNetwork()
+
+@pytest.fixture
+def drone_id(network):
+    return next(iter(network.drones))
+
+def frame(drone_id: str, timestamp: float, battery: int = 80, **changes) -> dict:
+    return {"drone_id": drone_id, "timestamp": timestamp, "lat": 40.2, "lon": -7.4,
+            "battery": battery, "status": "idle", **changes}
+
+def push(buffer: TelemetryBuffer, timestamps) -> int:
+    count = len(timestamps)
+    return buffer.push(np.zeros(count, dtype=np.int32), np.array(timestamps, dtype=float),
+                       np.zeros(count), np.zeros(count), np.zeros(count, dtype=np.uint8),
+                       np.zeros(count, dtype=np.uint8))
+
+def test_binary_frames_are_applied(network, drone_id):
+    ingestor = TelemetryIngestor(network)
+    data = encode_frames([(drone_id, 100.0, 40.2, -7.4, 80, DroneStatus.ON_MISSION)])
+    assert len(data) == TELEMETRY_FRAME_DTYPE.itemsize
+    assert ingestor.ingest_binary(data) == 1
+    ingestor.flush()
+    drone = network.drones[drone_id]
+    assert drone.status == DroneStatus.ON_MISSION
+    assert drone.battery_level == 80
+    assert drone.current_coords == (40.2, -7.4)
+    assert (ingestor.stats.received, ingestor.stats.accepted, ingestor.stats.applied) == (1, 1, 1)
+
+def test_json_frames_are_applied(network, drone_id):
+    ingestor = TelemetryIngestor(network)
+    assert ingestor.ingest_json(json.dumps(frame(drone_id, 100.0, status="charging"))) == 1
+    ingestor.flush()
+    assert network.drones[drone_id].status == DroneStatus.CHARGING
+
+def test_malformed_frames_and_unknown_drones_are_rejected(network, drone_id):
+    ingestor = TelemetryIngestor(network)
+    records = [
+        frame(drone_id, 1.0),
+        frame("nowhere", 1.0),
+        frame(drone_id, 1.0, battery=150),
+        frame(drone_id, 1.0, status="flying"),
+        {"drone_id": drone_id}
+    ]
+    assert ingestor.ingest_json(json.dumps(records)) == 1
+    assert ingestor.stats.rejected == 4
+    assert ingestor.ingest_json("not json") == 0
+    assert ingestor.ingest_binary(b"short") == 0
+    assert ingestor.stats.rejected == 6
+
+def test_buffer_overwrites_oldest_frames():
+    buffer = TelemetryBuffer(capacity=3)
+    assert push(buffer, [1, 2]) == 0
+    assert push(buffer, [3, 4]) == 1
+    assert buffer.drain()["timestamp"].tolist() == [2.0, 3.0, 4.0]
+    # A batch larger than the buffer keeps only its newest frames
+    assert push(buffer, [5, 6]) == 0
+    assert push(buffer, [7, 8, 9, 10]) == 3
+    assert buffer.drain()["timestamp"].tolist() == [8.0, 9.0, 10.0]
+    assert len(buffer) == 0
+
+def test_backpressure_is_counted_as_dropped(network, drone_id):
+    ingestor = TelemetryIngestor(network, capacity=4)
+    frames = [(drone_id, float(step), 40.2, -7.4, 90 - step, DroneStatus.IDLE) for step in range(1, 7)]
+    assert ingestor.ingest_binary(encode_frames(frames[:3])) == 3
+    assert ingestor.ingest_binary(encode_frames(frames[3:])) == 3
+    assert (ingestor.stats.accepted, ingestor.stats.dropped) == (6, 2)
+    ingestor.flush()
+    assert network.drones[drone_id].battery_level == 84
+
+def test_flush_applies_newest_frame_per_drone(network):
+    first, second = list(network.drones)[:2]
+    ingestor = TelemetryIngestor(network)
+    ingestor.ingest_binary(encode_frames([
+        (first, 20.0, 40.2, -7.4, 70, DroneStatus.IDLE),
+        (first, 10.0, 40.2, -7.4, 60, DroneStatus.IDLE),  # Arrived last, but older
+        (second, 15.0, 40.2, -7.4, 50, DroneStatus.CHARGING)
+    ]))
+    ingestor.flush()
+    assert network.drones[first].battery_level == 70
+    assert network.drones[second].status == DroneStatus.CHARGING
+    assert ingestor.stats.applied == 2
+
+def test_frames_older_than_the_applied_state_are_stale(network, drone_id):
+    ingestor = TelemetryIngestor(network)
+    ingestor.ingest_json(json.dumps(frame(drone_id, 20.0, battery=70)))
+    ingestor.flush()
+    ingestor.ingest_json(json.dumps(frame(drone_id, 10.0, battery=30)))
+    ingestor.flush()
+    assert network.drones[drone_id].battery_level == 70
+    assert (ingestor.stats.stale, ingestor.stats.applied) == (1, 1)
+
+def test_frames_with_invalid_coordinates_or_time_are_rejected(network, drone_id):
+    ingestor = TelemetryIngestor(network)
+    records = [
+        frame(drone_id, 1.0),
+        frame(drone_id, 2.0, lat="nan"),
+        frame(drone_id, 2.0, lon=181.0),
+        frame(drone_id, 2.0, lat=-90.5),
+        frame(drone_id, "inf")
+    ]
+    assert ingestor.ingest_json(json.dumps(records)) == 1
+    assert ingestor.ingest_binary(encode_frames([
+        (drone_id, 3.0, float("nan"), -7.4, 80, DroneStatus.IDLE),
+        (drone_id, 3.0, 40.2, float("inf"), 80, DroneStatus.IDLE)
+    ])) == 0
+    assert (ingestor.stats.accepted, ingestor.stats.rejected) == (1, 6)
+    ingestor.flush()
+    assert network.drones[drone_id].current_coords == (40.2, -7.4)
+    assert ingestor.stats.applied == 1
@@ -0,0 +1,57 @@
+import asyncio
+from typing import List, Optional
+from src.api.websocket import ConnectionManager, SlowConsumerPolicy
+
+class FakeSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent: List[str] = []
+        self.close_code: Optional[int] = None
+        self._unblocked = asyncio.Event()
+        if not blocked:
+            self._unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self._unblocked.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        await asyncio.sleep(0.01)  # A close handshake takes a round trip
+        self.close_code = code
+
+def test_disconnect_waits_for_the_socket_to_close():
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeSocket()
+        await manager.connect(websocket)
+        await manager.broadcast({"n": 1})
+        await asyncio.sleep(0)
+        await manager.disconnect(websocket)
+        return websocket, manager.active_connections
+
+    websocket, active = asyncio.run(scenario())
+    assert websocket.sent == ['{"n":1}']
+    assert websocket.close_code == 1013
+    assert active == []
+
+def test_slow_client_dropped_by_broadcast_can_still_be_awaited():
+    async def scenario():
+        manager = ConnectionManager(max_queue_size=1, policy=SlowConsumerPolicy.DISCONNECT)
+        slow, fast = FakeSocket(blocked=True), FakeSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+        for n in range(3):
+            await manager.broadcast({"n": n})
+            await asyncio.sleep(0)
+        # The broadcast dropped the slow client without waiting for its close
+        dropped = slow not in manager.active_connections and slow.close_code is None
+        await manager.disconnect(slow)
+        await manager.disconnect(fast)
+        return dropped, slow.close_code, len(fast.sent)
+
+    dropped, close_code, fast_received = asyncio.run(scenario())
+    assert dropped
+    assert close_code == 1013
+    assert fast_received == 3